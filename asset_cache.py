@@ -0,0 +1,86 @@
+# lru cache of loaded asset handles keyed by object path, shared by every script in a run.
+# repeated references to the same parent material or shared texture resolve without another load.
+#   import asset_cache
+#   asset_cache.new_run()                      # start of a script,  drops handles from earlier runs
+#   mat = asset_cache.load_asset('/Game/materials/pbr_mat.pbr_mat')
+#   print(asset_cache.stats())
+import collections
+import unreal
+
+import run_stats
+from asset_naming import normalize_object_path
+
+DEFAULT_MAX_SIZE = 512
+
+
+# cache key for any form of asset path
+object_path_key = normalize_object_path
+
+
+class AssetCache(object):
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        self.max_size = max(1, int(max_size))
+        self.assets = collections.OrderedDict() # object path -> asset,  least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def load(self, asset_path):
+        key = object_path_key(asset_path)
+        asset = self.assets.get(key)
+        if asset != None:
+            self.hits += 1
+            run_stats.count('cache_hits')
+            self.assets.move_to_end(key)
+            return asset
+        self.misses += 1
+        run_stats.count('loads')
+        with run_stats.timer('load_asset'):
+            asset = unreal.load_asset(key)
+        if asset != None: # failed loads are not cached,  asset might get created later in the run
+            self.add(asset, key)
+        return asset
+
+    # put an asset that is already loaded (selected, just created...) into the cache
+    def add(self, asset, key=None):
+        if key == None:
+            key = object_path_key(asset.get_path_name())
+        self.assets[key] = asset
+        self.assets.move_to_end(key)
+        while len(self.assets) > self.max_size:
+            self.assets.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.assets.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        return ('asset cache:  ' + str(self.hits) + ' hits,  ' + str(self.misses) + ' misses,  '
+                + str(self.evictions) + ' evictions,  ' + str(len(self.assets)) + '/' + str(self.max_size) + ' held')
+
+
+# cache shared by every script and module in the editor session
+shared_cache = AssetCache()
+
+
+# start of a script run: drop handles from an earlier run (assets may have been deleted or reloaded since)
+def new_run(max_size=None):
+    shared_cache.clear()
+    if max_size != None:
+        shared_cache.max_size = max(1, int(max_size))
+
+
+def load_asset(asset_path):
+    return shared_cache.load(asset_path)
+
+
+def add(asset):
+    shared_cache.add(asset)
+
+
+def stats():
+    return shared_cache.stats()
@@ -0,0 +1,54 @@
+# asset listing records and their json form.
+# a listing is what the asset registry knows about a set of assets (path, class, tags),
+# exported from the editor once so planning and audits can run without it.  no unreal import here.
+import collections
+import json
+
+from asset_naming import split_object_path
+
+# lightweight stand in for an asset,  no uobject is held
+AssetRecord = collections.namedtuple('AssetRecord', ['object_path', 'package_path', 'asset_name', 'class_name'])
+
+
+def make_record(object_path, class_name):
+    folder, asset_name = split_object_path(object_path)
+    return AssetRecord(object_path, folder.rstrip('/'), asset_name, class_name)
+
+
+# {'object_path': ..., 'class_name': ...}  (package_path and asset_name are filled in when missing)
+def record_from_dict(data):
+    record = make_record(data['object_path'], data.get('class_name', ''))
+    if data.get('package_path'):
+        record = record._replace(package_path=data['package_path'].rstrip('/'))
+    return record
+
+
+def _load_entries(file_path):
+    with open(file_path, 'r') as f:
+        data = json.load(f)
+    if isinstance(data, dict): # {'assets': [...]} as written by save_listing
+        data = data.get('assets', [])
+    return data
+
+
+def load_listing(file_path):
+    return [record_from_dict(entry) for entry in _load_entries(file_path)]
+
+
+# {object path: {'tags': {...}, 'dependencies': [package names]}} for listings exported with tags/dependencies
+def load_listing_extras(file_path):
+    extras = {}
+    for entry in _load_entries(file_path):
+        extras[entry['object_path']] = {'tags': entry.get('tags', {}), 'dependencies': entry.get('dependencies', [])}
+    return extras
+
+
+# extras: {object path: dict of more keys for that asset's entry (tags, dependencies)}
+def save_listing(records, file_path, extras=None):
+    entries = []
+    for record in records:
+        entry = record._asdict()
+        entry.update((extras or {}).get(record.object_path, {}))
+        entries.append(entry)
+    with open(file_path, 'w') as f:
+        json.dump({'assets': entries}, f, indent=1)
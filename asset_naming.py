@@ -0,0 +1,80 @@
+# naming rules shared by the connector, the planner and the other tools.
+# plain python, no unreal import,  so it runs outside the editor too.
+import re
+
+_SUFFIX_PATTERNS = {}
+
+
+# one compiled regex for a list of suffixes:  base name in group 1, suffix in group 2.
+# the lazy base makes the longest suffix win ('_NormalDetail' over '_Detail'),  whatever order they come in
+def suffix_pattern(suffixes):
+    key = tuple(suffixes)
+    if key not in _SUFFIX_PATTERNS:
+        alternatives = '|'.join(re.escape(suffix) for suffix in sorted(set(suffixes), key=len, reverse=True))
+        _SUFFIX_PATTERNS[key] = re.compile('^(.+?)(' + alternatives + ')$')
+    return _SUFFIX_PATTERNS[key]
+
+# 'rock_Normal' -> ('rock', '_Normal'),  None if name has none of the suffixes
+def split_texture_name(asset_name, suffixes):
+    match = suffix_pattern(suffixes).match(asset_name)
+    if match == None:
+        return None
+    return match.group(1), match.group(2)
+
+
+# '/Game/a/rock.rock' -> ('/Game/a/', 'rock')   (folder keeps its trailing slash, like i_folder_path_str did)
+def split_object_path(object_path):
+    package_name = object_path.split('.', 1)[0]
+    folder, asset_name = package_name.rsplit('/', 1)
+    return folder + '/', asset_name
+
+
+def folder_of(object_path):
+    return split_object_path(object_path)[0]
+
+
+# '/Game/a/b',  '/Game/a/b.b' and "Texture2D'/Game/a/b.b'" all become '/Game/a/b.b'
+def normalize_object_path(asset_path):
+    asset_path = str(asset_path).strip()
+    if asset_path.endswith("'") and "'" in asset_path[:-1]:
+        asset_path = asset_path[asset_path.index("'") + 1:-1]
+    asset_name = asset_path.rsplit('/', 1)[-1]
+    if '.' not in asset_name:
+        asset_path = asset_path + '.' + asset_name
+    return asset_path
+
+
+# ('/Game/a/', 'rock') -> '/Game/a/rock.rock'
+def make_object_path(folder, asset_name):
+    return folder.rstrip('/') + '/' + asset_name + '.' + asset_name
+
+
+def strip_prefix(name, prefix):
+    if prefix and name.startswith(prefix):
+        return name[len(prefix):]
+    return name
+
+
+# '/Game/Cave/Meshes' -> '/Game/Cave/Materials/'   (instead of cutting a fixed number of characters off the path)
+# None if the folder does not end in leaf_name
+def sibling_folder(folder, leaf_name, new_leaf):
+    folder = folder.rstrip('/')
+    parent_folder, leaf = folder.rsplit('/', 1)
+    if leaf.lower() != leaf_name.lower():
+        return None
+    return parent_folder + '/' + new_leaf + '/'
+
+
+# group texture records by folder and base name:  {folder: {base_name: {suffix: object_path}}}
+# records need object_path, package_path, asset_name and class_name (asset_listing.AssetRecord)
+def group_texture_sets(records, suffixes):
+    pattern = suffix_pattern(suffixes)
+    folders = {}
+    for record in records:
+        if not record.class_name.startswith('Texture'):
+            continue
+        match = pattern.match(record.asset_name)
+        if match == None:
+            continue
+        folders.setdefault(record.package_path.rstrip('/') + '/', {}).setdefault(match.group(1), {})[match.group(2)] = record.object_path
+    return folders
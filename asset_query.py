@@ -0,0 +1,130 @@
+# select asset batches from asset registry metadata instead of the content browser selection.
+# filtering only looks at registry data (folder, class, name, tags),  nothing gets loaded until
+# load_records() is called on the records that passed.
+#   records = asset_query.query_assets(['/Game/dawnOfWar/**/textures'], class_names=['Texture2D'], name_suffixes=['_BaseColor'])
+#   for tex in asset_query.load_records(records): ...
+#   asset_query.export_listing(['/Game'], 'C:/temp/listing.json')   # for planning/audits outside the editor
+import fnmatch
+
+import unreal
+
+import asset_cache
+import run_stats
+from asset_listing import AssetRecord, save_listing
+from texture_set_index import asset_class_name, object_path
+
+WILDCARDS = '*?['
+
+
+# '/Game/a/*/tex' -> '/Game/a'  (folder to list recursively before globbing)
+def glob_root(path_glob):
+    path_glob = path_glob.rstrip('/')
+    for n, char in enumerate(path_glob):
+        if char in WILDCARDS:
+            return path_glob[:n].rsplit('/', 1)[0]
+    return path_glob
+
+
+def has_wildcard(path_glob):
+    return any(char in path_glob for char in WILDCARDS)
+
+
+def _tags_match(asset_data, tags):
+    for tag, wanted in tags.items():
+        value = asset_data.get_tag_value(tag)
+        if value == None:
+            return False
+        if wanted != None and str(value) != str(wanted):
+            return False
+    return True
+
+
+# path_globs:    folders, or folder globs ('*' and '**' both match across '/').  plain folders list subfolders if recursive
+# class_names:   e.g. ['Texture2D'],  None for any class
+# name_suffixes/name_prefixes:  asset name must end/start with one of them
+# tags:          {registry tag: value},  value None only requires the tag to exist
+# exclude_globs: folder globs to leave out (e.g. '*/old')
+@run_stats.timed('query_assets')
+def query_assets(path_globs, class_names=None, name_suffixes=None, name_prefixes=None, tags=None,
+                 exclude_globs=None, recursive=True):
+    registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    class_names = set(class_names) if class_names else None
+    name_suffixes = tuple(name_suffixes) if name_suffixes else None
+    name_prefixes = tuple(name_prefixes) if name_prefixes else None
+    exclude_globs = list(exclude_globs or [])
+
+    records = []
+    seen = set()
+    for path_glob in path_globs:
+        path_glob = path_glob.rstrip('/')
+        wildcard = has_wildcard(path_glob)
+        for asset_data in registry.get_assets_by_path(glob_root(path_glob), recursive=(recursive or wildcard)):
+            folder = str(asset_data.package_path)
+            if wildcard and not fnmatch.fnmatchcase(folder, path_glob.replace('**', '*')):
+                continue
+            if any(fnmatch.fnmatchcase(folder, exclude.rstrip('/')) for exclude in exclude_globs):
+                continue
+            asset_name = str(asset_data.asset_name)
+            if name_suffixes and not asset_name.endswith(name_suffixes):
+                continue
+            if name_prefixes and not asset_name.startswith(name_prefixes):
+                continue
+            class_name = asset_class_name(asset_data)
+            if class_names and class_name not in class_names:
+                continue
+            if tags and not _tags_match(asset_data, tags):
+                continue
+            asset_path = object_path(asset_data)
+            if asset_path in seen: # overlapping globs
+                continue
+            seen.add(asset_path)
+            records.append(AssetRecord(asset_path, folder, asset_name, class_name))
+    return records
+
+
+# records for assets that are already loaded (content browser selection),  they also go into the asset cache
+def records_from_assets(assets):
+    records = []
+    for asset in assets:
+        asset_path = asset.get_path_name()
+        asset_cache.add(asset)
+        records.append(AssetRecord(asset_path, asset_path.rsplit('/', 1)[0], str(asset.get_fname()), asset.get_class().get_name()))
+    return records
+
+
+# load only the records that passed the filters
+def load_records(records):
+    for record in records:
+        asset = asset_cache.load_asset(record.object_path)
+        if asset == None:
+            unreal.log_warning('asset_query: could not load ' + record.object_path)
+            continue
+        yield asset
+
+
+def dependency_options():
+    return unreal.AssetRegistryDependencyOptions(include_soft_package_references=True, include_hard_package_references=True,
+                                                 include_searchable_names=False, include_soft_management_references=False,
+                                                 include_hard_management_references=False)
+
+
+# write every asset under the folders to a json listing (asset_listing format),  nothing is loaded.
+# tag_names adds those registry tags to every entry,  dependencies its package dependencies (for audits, texture_budget.py)
+def export_listing(path_globs, file_path, tag_names=None, dependencies=False, **filters):
+    records = query_assets(path_globs, **filters)
+    extras = {}
+    if tag_names or dependencies:
+        registry = unreal.AssetRegistryHelpers.get_asset_registry()
+        options = dependency_options()
+        for record in records:
+            extra = {}
+            if tag_names:
+                asset_data = registry.get_asset_by_object_path(record.object_path)
+                values = dict((tag, asset_data.get_tag_value(tag)) for tag in tag_names) if asset_data != None else {}
+                extra['tags'] = dict((tag, str(value)) for tag, value in values.items() if value != None)
+            if dependencies:
+                deps = registry.get_dependencies(record.object_path.split('.', 1)[0], options) or []
+                extra['dependencies'] = sorted(str(dep) for dep in deps)
+            extras[record.object_path] = extra
+    save_listing(records, file_path, extras)
+    return len(records)
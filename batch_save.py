@@ -0,0 +1,25 @@
+# save many assets with grouped package flushes instead of one disk write per asset.
+# call once at the end of a batch, after every asset has been created and edited,
+# so nothing gets dirtied again after it was saved.
+import unreal
+
+import run_stats
+
+DEFAULT_CHUNK_SIZE = 200
+
+
+def save_assets_chunked(assets, chunk_size=DEFAULT_CHUNK_SIZE):
+    # returns number of assets in chunks that saved without error
+    assets = [a for a in assets if a != None]
+    chunk_size = max(1, int(chunk_size))
+    saved = 0
+    for start in range(0, len(assets), chunk_size):
+        chunk = assets[start:start + chunk_size]
+        with run_stats.timer('save'):
+            ok = unreal.EditorAssetLibrary.save_loaded_assets(chunk, only_if_is_dirty=True)
+        run_stats.count('saves', len(chunk))
+        if ok:
+            saved += len(chunk)
+        else:
+            unreal.log_warning('batch_save: could not save all assets in chunk starting at ' + str(start))
+    return saved
@@ -0,0 +1,768 @@
+# in process stand in for the unreal module,  enough of it to run the automation scripts on a plain linux box.
+# models the asset registry, loading, create_asset, saving and material updates with configurable
+# synthetic costs.  costs go on a simulated clock (COSTS, SIM_SECONDS) instead of sleeping,  set
+# SLEEP = True to really wait.  every call is counted in CALLS.
+#   import fake_unreal
+#   fake_unreal.install()                        # 'import unreal' now gets this module
+#   fake_unreal.reset(project_dir='/tmp/proj')
+#   fake_unreal.add_asset('/Game/t/rock_BaseColor.rock_BaseColor', 'Texture2D', srgb=True)
+import collections
+import os
+import sys
+import time
+
+# synthetic cost of each operation in seconds
+DEFAULT_COSTS = {
+    'load_asset': 0.002,           # per asset not loaded yet
+    'load_asset_failed': 0.0005,   # lookup of an asset that does not exist
+    'list_folder': 0.0005,         # per asset registry listing call
+    'list_asset': 0.000002,        # per asset data returned
+    'does_asset_exist': 0.0001,
+    'create_asset': 0.004,
+    'save_call': 0.01,             # per save call (package flush)
+    'save_asset': 0.003,           # per asset written
+    'update_material_instance': 0.006,
+    'post_edit_change': 0.003,     # property change with notifications (recompile, recompress...)
+    'set_parameter': 0.0001,
+    'set_material': 0.001,
+    'get_dependencies': 0.0002,
+    'consolidate': 0.05,
+    'import_call': 0.02,           # per import_asset_tasks call
+    'import_asset': 0.03,          # per file imported
+}
+
+COSTS = dict(DEFAULT_COSTS)
+SLEEP = False
+CALLS = collections.Counter()
+SIM_SECONDS = [0.0]
+ASSETS = {}       # object path -> Object
+FOLDERS = collections.defaultdict(set) # folder -> object paths,  so listings do not scan every asset
+LOADED = set()    # object paths loaded so far
+SELECTED = []
+DIRECTORIES = set()
+PROJECT_DIR = ['/tmp/fake_unreal_project/']
+LOG = []
+SAVED_ASSETS = collections.Counter()  # object path -> times written
+
+
+def install():
+    sys.modules['unreal'] = sys.modules[__name__]
+
+
+def reset(project_dir=None, costs=None, sleep=False):
+    global SLEEP
+    CALLS.clear()
+    SIM_SECONDS[0] = 0.0
+    ASSETS.clear()
+    FOLDERS.clear()
+    LOADED.clear()
+    del SELECTED[:]
+    DIRECTORIES.clear()
+    del LOG[:]
+    SAVED_ASSETS.clear()
+    TICK_CALLBACKS.clear()
+    del ACTORS[:]
+    COSTS.clear()
+    COSTS.update(DEFAULT_COSTS)
+    COSTS.update(costs or {})
+    SLEEP = sleep
+    if project_dir:
+        PROJECT_DIR[0] = project_dir.rstrip('/') + '/'
+
+
+# forget what is loaded (new editor session),  assets stay
+def unload_all():
+    LOADED.clear()
+
+
+def _spend(operation, amount=1):
+    CALLS[operation] += amount
+    seconds = COSTS.get(operation, 0.0) * amount
+    SIM_SECONDS[0] += seconds
+    if SLEEP and seconds:
+        time.sleep(seconds)
+
+
+def _key(asset_path):
+    asset_path = str(asset_path)
+    if asset_path.endswith("'") and "'" in asset_path[:-1]:
+        asset_path = asset_path[asset_path.index("'") + 1:-1]
+    asset_name = asset_path.rsplit('/', 1)[-1]
+    if '.' not in asset_name:
+        asset_path = asset_path + '.' + asset_name
+    return asset_path
+
+
+# ---- objects ----
+
+class Name(str):
+    pass
+
+
+class _Class(object):
+    def __init__(self, name):
+        self.name = name
+
+    def get_name(self):
+        return self.name
+
+
+class Object(object):
+
+    def __init__(self, object_path, class_name='Object', tags=None, **props):
+        self._path = object_path
+        self._class_name = class_name
+        self._tags = dict(tags or {})
+        self._props = dict(props)
+        self.dirty = False
+        self.extra_dependencies = [] # package names a level/blueprint references beyond its properties
+
+    def get_fname(self):
+        return Name(self._path.rsplit('.', 1)[-1])
+
+    def get_name(self):
+        return str(self.get_fname())
+
+    def get_path_name(self):
+        return self._path
+
+    def get_full_name(self):
+        return self._class_name + ' ' + self._path
+
+    def get_class(self):
+        return _Class(self._class_name)
+
+    def get_outermost(self):
+        return self
+
+    def get_editor_property(self, name):
+        CALLS['get_editor_property'] += 1
+        if name not in self._props:
+            raise Exception(self._class_name + ' has no property ' + name)
+        return self._props[name]
+
+    def set_editor_property(self, name, value, notify_mode=None):
+        CALLS['set_editor_property'] += 1
+        if name not in self._props and not isinstance(self, Factory):
+            raise Exception(self._class_name + ' has no property ' + name)
+        self._props[name] = value
+        self.dirty = True
+        if notify_mode != PropertyAccessChangeNotifyMode.NEVER and not isinstance(self, (Factory, AssetImportTask)):
+            _spend('post_edit_change')
+
+    def set_editor_properties(self, properties):
+        CALLS['set_editor_properties'] += 1
+        for name in properties:
+            if name not in self._props:
+                raise Exception(self._class_name + ' has no property ' + name)
+        self._props.update(properties)
+        self.dirty = True
+        _spend('post_edit_change')
+
+    # like the editor, every call is a separate mesh modification (post edit change + rebuild)
+    def set_material(self, slot, material):
+        _spend('set_material')
+        materials = self._props.setdefault('static_materials', [])
+        if slot >= len(materials):
+            log_warning('set_material: no slot ' + str(slot) + ' on ' + self._path)
+            return
+        materials[slot].material_interface = material
+        self.dirty = True
+        _spend('post_edit_change')
+
+    def get_material(self, slot):
+        materials = self._props.get('static_materials', [])
+        return materials[slot].material_interface if slot < len(materials) else None
+
+
+class StaticMaterial(object):
+
+    def __init__(self, material_interface=None, material_slot_name=''):
+        self.material_interface = material_interface
+        self.material_slot_name = Name(material_slot_name)
+        self.imported_material_slot_name = Name(material_slot_name)
+
+    def get_editor_property(self, name):
+        return getattr(self, name)
+
+    def set_editor_property(self, name, value):
+        setattr(self, name, value)
+
+
+def add_asset(object_path, class_name='Texture2D', tags=None, **props):
+    object_path = _key(object_path)
+    if class_name.startswith('Texture'):
+        props.setdefault('srgb', True)
+        props.setdefault('compression_settings', TextureCompressionSettings.TC_DEFAULT)
+    elif class_name == 'MaterialInstanceConstant':
+        props.setdefault('parent', None)
+    elif class_name in ('StaticMesh', 'SkeletalMesh'):
+        props.setdefault('static_materials', [])
+    asset = Object(object_path, class_name, tags, **props)
+    ASSETS[object_path] = asset
+    FOLDERS[object_path.rsplit('/', 1)[0]].add(object_path)
+    DIRECTORIES.add(object_path.rsplit('/', 1)[0])
+    return asset
+
+
+def remove_asset(object_path):
+    object_path = _key(object_path)
+    if ASSETS.pop(object_path, None) != None:
+        FOLDERS[object_path.rsplit('/', 1)[0]].discard(object_path)
+        LOADED.discard(object_path)
+
+
+def get_asset(object_path):
+    return ASSETS.get(_key(object_path))
+
+
+# ---- enums and small types ----
+
+class PropertyAccessChangeNotifyMode(object):
+    DEFAULT = 'DEFAULT'
+    NEVER = 'NEVER'
+    ALWAYS = 'ALWAYS'
+
+
+class TextureCompressionSettings(object):
+    TC_DEFAULT = 'TC_DEFAULT'
+    TC_NORMALMAP = 'TC_NORMALMAP'
+    TC_MASKS = 'TC_MASKS'
+    TC_GRAYSCALE = 'TC_GRAYSCALE'
+    TC_HDR = 'TC_HDR'
+    TC_BC7 = 'TC_BC7'
+
+
+class AssetImportData(object):
+
+    def __init__(self, filename=''):
+        self.filename = filename
+
+    def get_first_filename(self):
+        return self.filename
+
+
+class ComparisonTolerance(object):
+    LOW = 'LOW'
+
+
+class TopLevelAssetPath(object):
+    def __init__(self, package_name, asset_name):
+        self.package_name = Name(package_name)
+        self.asset_name = Name(asset_name)
+
+
+class AssetData(object):
+
+    def __init__(self, asset):
+        package_name, asset_name = asset._path.rsplit('.', 1)
+        self.package_name = Name(package_name)
+        self.package_path = Name(package_name.rsplit('/', 1)[0])
+        self.asset_name = Name(asset_name)
+        self.asset_class_path = TopLevelAssetPath('/Script/Engine', asset._class_name)
+        self._asset = asset
+
+    def get_asset(self):
+        return load_asset(self._asset._path)
+
+    def get_tag_value(self, tag):
+        value = self._asset._tags.get(tag)
+        return None if value == None else str(value)
+
+    def is_valid(self):
+        return True
+
+    def is_asset_loaded(self):
+        return self._asset._path in LOADED
+
+
+# ---- logging ----
+
+def log(message):
+    LOG.append(('log', str(message)))
+
+
+def log_warning(message):
+    LOG.append(('warning', str(message)))
+
+
+def log_error(message):
+    LOG.append(('error', str(message)))
+
+
+# ---- loading ----
+
+def load_asset(asset_path):
+    key = _key(asset_path)
+    asset = ASSETS.get(key)
+    if asset == None:
+        _spend('load_asset_failed')
+        return None
+    if key not in LOADED:
+        _spend('load_asset')
+        LOADED.add(key)
+    else:
+        CALLS['load_asset_loaded'] += 1
+    return asset
+
+
+class Paths(object):
+
+    @staticmethod
+    def project_dir():
+        return PROJECT_DIR[0]
+
+    @staticmethod
+    def project_saved_dir():
+        return PROJECT_DIR[0] + 'Saved/'
+
+    @staticmethod
+    def project_content_dir():
+        return PROJECT_DIR[0] + 'Content/'
+
+    @staticmethod
+    def screen_shot_dir():
+        return PROJECT_DIR[0] + 'Saved/Screenshots/'
+
+    @staticmethod
+    def get_path(path):
+        return path.rsplit('/', 1)[0]
+
+
+class SystemLibrary(object):
+
+    @staticmethod
+    def collect_garbage():
+        CALLS['collect_garbage'] += 1
+
+    @staticmethod
+    def get_project_directory():
+        return PROJECT_DIR[0]
+
+    @staticmethod
+    def get_project_content_directory():
+        return PROJECT_DIR[0] + 'Content/'
+
+
+class ScopedSlowTask(object):
+
+    def __init__(self, amount_of_work, desc=''):
+        self.amount_of_work = amount_of_work
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def make_dialog(self, can_cancel=False, allow_in_pie=False):
+        pass
+
+    def should_cancel(self):
+        return False
+
+    def enter_progress_frame(self, work=1.0, desc=''):
+        pass
+
+
+# ---- asset registry ----
+
+class AssetRegistry(object):
+
+    def get_assets_by_path(self, package_path, recursive=False, include_only_on_disk_assets=False):
+        _spend('list_folder')
+        folder = str(package_path).rstrip('/')
+        folders = [folder]
+        if recursive:
+            folders += [other for other in FOLDERS if other.startswith(folder + '/')]
+        found = []
+        for asset_folder in folders:
+            for object_path in sorted(FOLDERS.get(asset_folder, ())):
+                found.append(AssetData(ASSETS[object_path]))
+        _spend('list_asset', len(found))
+        return found
+
+    # hard references from properties (materials on meshes, parents of instances, texture parameters) plus extra ones
+    def get_dependencies(self, package_name, dependency_options=None):
+        _spend('get_dependencies')
+        asset = ASSETS.get(_key(package_name))
+        if asset == None:
+            return None
+        found = list(asset.extra_dependencies)
+        values = [static_material.material_interface for static_material in asset._props.get('static_materials', [])]
+        values.append(asset._props.get('parent'))
+        values += list(asset._props.get('texture_parameter_values', {}).values())
+        for value in values:
+            if isinstance(value, Object):
+                found.append(Name(value._path.split('.', 1)[0]))
+        return sorted(set(found))
+
+    def get_asset_by_object_path(self, object_path):
+        asset = ASSETS.get(_key(object_path))
+        return AssetData(asset) if asset != None else None
+
+
+class AssetRegistryDependencyOptions(object):
+
+    def __init__(self, **options):
+        self.options = options
+
+
+class AssetRegistryHelpers(object):
+
+    @staticmethod
+    def get_asset_registry():
+        return AssetRegistry()
+
+
+# ---- asset tools, factories, editor libraries ----
+
+class Factory(Object):
+
+    def __init__(self):
+        Object.__init__(self, '/Script/UnrealEd.' + type(self).__name__, type(self).__name__,
+                        create_new=True, edit_after_new=True)
+
+
+class MaterialInstanceConstantFactoryNew(Factory):
+    created_class = 'MaterialInstanceConstant'
+
+
+class BlueprintFactory(Factory):
+    created_class = 'Blueprint'
+
+
+class DataAssetFactory(Factory):
+    created_class = 'DataAsset'
+
+
+class MaterialInstanceConstant(object):
+    pass
+
+
+class PlayerController(object):
+    pass
+
+
+class Character(object):
+    pass
+
+
+class AssetTools(object):
+
+    def create_asset(self, asset_name, package_path, asset_class, factory):
+        _spend('create_asset')
+        object_path = str(package_path).rstrip('/') + '/' + asset_name + '.' + asset_name
+        if object_path in ASSETS:
+            log_error('create_asset: asset already exists ' + object_path)
+            return None
+        class_name = getattr(factory, 'created_class', 'Object')
+        asset = add_asset(object_path, class_name)
+        asset.dirty = True
+        LOADED.add(object_path)
+        if factory._props.get('edit_after_new'):
+            _spend('open_editor')
+        return asset
+
+    # a texture per task,  with import data pointing at the file.  existing assets are only replaced with replace_existing
+    def import_asset_tasks(self, import_tasks):
+        _spend('import_call')
+        for task in import_tasks:
+            props = task._props
+            if not os.path.isfile(props['filename']):
+                log_error('import: no file ' + props['filename'])
+                continue
+            name = props['destination_name'] or os.path.splitext(os.path.basename(props['filename']))[0]
+            object_path = str(props['destination_path']).rstrip('/') + '/' + name + '.' + name
+            if object_path in ASSETS and not props['replace_existing']:
+                continue
+            _spend('import_asset')
+            asset = add_asset(object_path, 'Texture2D', asset_import_data=AssetImportData(props['filename']))
+            asset.dirty = True
+            LOADED.add(object_path)
+            if props['save']:
+                EditorAssetLibrary.save_loaded_assets([asset])
+            props['imported_object_paths'] = [object_path]
+
+
+class AssetImportTask(Object):
+
+    def __init__(self):
+        Object.__init__(self, '/Engine/Transient.AssetImportTask', 'AssetImportTask', filename='', destination_path='',
+                        destination_name='', replace_existing=False, automated=False, save=False)
+        self._props['imported_object_paths'] = list() # each task its own list,  import_asset_tasks fills it in
+
+
+class AssetToolsHelpers(object):
+
+    @staticmethod
+    def get_asset_tools():
+        return AssetTools()
+
+
+class EditorAssetLibrary(object):
+
+    @staticmethod
+    def does_asset_exist(asset_path):
+        _spend('does_asset_exist')
+        return _key(asset_path) in ASSETS
+
+    @staticmethod
+    def does_directory_exist(directory_path):
+        return str(directory_path).rstrip('/') in DIRECTORIES
+
+    @staticmethod
+    def make_directory(directory_path):
+        DIRECTORIES.add(str(directory_path).rstrip('/'))
+        return True
+
+    @staticmethod
+    def find_asset_data(asset_path):
+        asset = ASSETS.get(_key(asset_path))
+        return AssetData(asset) if asset != None else None
+
+    @staticmethod
+    def load_asset(asset_path):
+        return load_asset(asset_path)
+
+    @staticmethod
+    def save_loaded_asset(asset, only_if_is_dirty=True):
+        return EditorAssetLibrary.save_loaded_assets([asset], only_if_is_dirty)
+
+    @staticmethod
+    def save_loaded_assets(assets, only_if_is_dirty=True):
+        _spend('save_call')
+        for asset in assets:
+            if asset.dirty or not only_if_is_dirty:
+                _spend('save_asset')
+                SAVED_ASSETS[asset._path] += 1
+                asset.dirty = False
+        return True
+
+    # every reference to the old assets now points at asset_to_consolidate_to,  the old ones are deleted
+    @staticmethod
+    def consolidate_assets(asset_to_consolidate_to, assets_to_consolidate):
+        _spend('consolidate')
+        old_packages = set(Name(old._path.split('.', 1)[0]) for old in assets_to_consolidate)
+        new_package = Name(asset_to_consolidate_to._path.split('.', 1)[0])
+        for asset in ASSETS.values():
+            if old_packages.intersection(asset.extra_dependencies):
+                asset.extra_dependencies = [new_package if dep in old_packages else dep for dep in asset.extra_dependencies]
+                asset.dirty = True
+        for old in assets_to_consolidate:
+            remove_asset(old._path)
+        return True
+
+    @staticmethod
+    def save_asset(asset_path, only_if_is_dirty=True):
+        asset = load_asset(asset_path)
+        return asset != None and EditorAssetLibrary.save_loaded_assets([asset], only_if_is_dirty)
+
+
+class EditorUtilityLibrary(object):
+
+    @staticmethod
+    def get_selected_assets():
+        return list(SELECTED)
+
+
+class MaterialEditingLibrary(object):
+
+    @staticmethod
+    def set_material_instance_parent(instance, parent):
+        _spend('post_edit_change')
+        instance._props['parent'] = parent
+        instance.dirty = True
+
+    @staticmethod
+    def set_material_instance_texture_parameter_value(instance, parameter_name, value, association=None):
+        _spend('set_parameter')
+        instance._props.setdefault('texture_parameter_values', {})[str(parameter_name)] = value
+        instance.dirty = True
+        return True
+
+    @staticmethod
+    def set_material_instance_scalar_parameter_value(instance, parameter_name, value, association=None):
+        _spend('set_parameter')
+        instance._props.setdefault('scalar_parameter_values', {})[str(parameter_name)] = value
+        instance.dirty = True
+        return True
+
+    @staticmethod
+    def set_material_instance_vector_parameter_value(instance, parameter_name, value, association=None):
+        _spend('set_parameter')
+        instance._props.setdefault('vector_parameter_values', {})[str(parameter_name)] = value
+        instance.dirty = True
+        return True
+
+    @staticmethod
+    def get_material_instance_texture_parameter_value(instance, parameter_name, association=None):
+        return instance._props.get('texture_parameter_values', {}).get(str(parameter_name))
+
+    @staticmethod
+    def get_material_instance_scalar_parameter_value(instance, parameter_name, association=None):
+        return instance._props.get('scalar_parameter_values', {}).get(str(parameter_name), 0.0)
+
+    @staticmethod
+    def get_material_instance_vector_parameter_value(instance, parameter_name, association=None):
+        return instance._props.get('vector_parameter_values', {}).get(str(parameter_name))
+
+    # names set on the instance or anything up its parent chain
+    @staticmethod
+    def _parameter_names(material, kind):
+        names = set()
+        while material != None:
+            names.update(material._props.get(kind + '_parameter_values', {}))
+            material = material._props.get('parent')
+        return [Name(name) for name in sorted(names)]
+
+    @staticmethod
+    def get_texture_parameter_names(material):
+        return MaterialEditingLibrary._parameter_names(material, 'texture')
+
+    @staticmethod
+    def get_scalar_parameter_names(material):
+        return MaterialEditingLibrary._parameter_names(material, 'scalar')
+
+    @staticmethod
+    def get_vector_parameter_names(material):
+        return MaterialEditingLibrary._parameter_names(material, 'vector')
+
+    @staticmethod
+    def clear_all_material_instance_parameters(instance):
+        for name in ['texture_parameter_values', 'scalar_parameter_values', 'vector_parameter_values']:
+            instance._props.pop(name, None)
+        instance.dirty = True
+
+    @staticmethod
+    def update_material_instance(instance):
+        _spend('update_material_instance')
+
+
+class AutomationLibrary(object):
+
+    @staticmethod
+    def take_high_res_screenshot(res_x, res_y, filename, camera=None, mask_enabled=False, capture_hdr=False,
+                                 comparison_tolerance=None, comparison_notes='', delay=0.0, force_game_view=True):
+        _spend('take_high_res_screenshot')
+        return AutomationEditorTask(os.path.join(Paths.screen_shot_dir(), filename))
+
+
+class AutomationEditorTask(object):
+    # done after a couple of polls,  then an empty placeholder image is on disk
+
+    def __init__(self, file_path=None, ticks=2):
+        self.file_path = file_path
+        self.ticks = ticks
+
+    def is_task_done(self):
+        self.ticks -= 1
+        if self.ticks == 0 and self.file_path != None:
+            if not os.path.isdir(os.path.dirname(self.file_path)):
+                os.makedirs(os.path.dirname(self.file_path))
+            open(self.file_path, 'wb').close()
+        return self.ticks <= 0
+
+    def is_valid_task(self):
+        return True
+
+
+# ---- level actors ----
+
+ACTORS = []
+
+
+class StaticMeshComponent(object):
+
+    def __init__(self):
+        self.materials = {}
+
+    def set_material(self, element_index, material):
+        _spend('set_component_material')
+        self.materials[element_index] = material
+
+    def get_material(self, element_index):
+        return self.materials.get(element_index)
+
+
+class Actor(Object):
+
+    def __init__(self, label, class_name='Actor'):
+        Object.__init__(self, '/Game/Level.Level:PersistentLevel.' + label, class_name)
+        self.label = label
+        self.components = {StaticMeshComponent: StaticMeshComponent()}
+
+    def get_actor_label(self):
+        return self.label
+
+    def get_component_by_class(self, component_class):
+        return self.components.get(component_class)
+
+
+class CameraActor(Actor):
+
+    def __init__(self, label):
+        Actor.__init__(self, label, 'CameraActor')
+
+
+class StaticMeshActor(Actor):
+
+    def __init__(self, label):
+        Actor.__init__(self, label, 'StaticMeshActor')
+
+
+class EditorActorSubsystem(object):
+
+    def get_all_level_actors(self):
+        return list(ACTORS)
+
+
+def get_editor_subsystem(subsystem_class):
+    return subsystem_class()
+
+
+# ---- editor ticks ----
+
+TICK_CALLBACKS = {}
+
+
+def register_slate_post_tick_callback(callback):
+    handle = len(TICK_CALLBACKS) + 1
+    while handle in TICK_CALLBACKS:
+        handle += 1
+    TICK_CALLBACKS[handle] = callback
+    return handle
+
+
+def unregister_slate_post_tick_callback(handle):
+    TICK_CALLBACKS.pop(handle, None)
+
+
+# run the registered tick callbacks until none are left (or max_ticks),  returns ticks run
+def pump_ticks(max_ticks=100000, delta_seconds=1.0 / 60):
+    ticks = 0
+    while TICK_CALLBACKS and ticks < max_ticks:
+        for callback in list(TICK_CALLBACKS.values()):
+            callback(delta_seconds)
+        ticks += 1
+    return ticks
+
+
+def uclass():
+    def decorator(cls):
+        return cls
+    return decorator
+
+
+def ustruct():
+    return uclass()
+
+
+# ---- reporting ----
+
+def sim_seconds():
+    return SIM_SECONDS[0]
+
+
+def counts():
+    return dict(CALLS)
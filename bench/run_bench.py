@@ -0,0 +1,177 @@
+# benchmarks for the automation scripts against the fake unreal module,  no editor needed.
+# each scenario seeds synthetic content, runs the real scripts and reports wall time, simulated editor
+# time (fake_unreal.COSTS), throughput and call counts.  with --baseline, more calls or simulated time
+# than the baseline allows fails the run (exit code 1),  so regressions show up on ci.
+#   python bench/run_bench.py                                  # ci scenarios
+#   python bench/run_bench.py --scenario sets_10k mixed_10k
+#   python bench/run_bench.py --baseline bench/baseline.json
+#   python bench/run_bench.py --save-baseline bench/baseline.json
+import argparse
+import contextlib
+import io
+import json
+import os
+import runpy
+import shutil
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+import fake_unreal
+fake_unreal.install()
+
+import scenarios
+
+# calls and simulated time may grow this much over the baseline before it counts as a regression
+TOLERANCE = 0.05
+# call counts compared against the baseline (the rest are only reported)
+TRACKED_CALLS = ['load_asset', 'load_asset_failed', 'list_folder', 'create_asset', 'save_call', 'save_asset',
+                 'update_material_instance', 'post_edit_change', 'open_editor']
+
+
+def _run_script(script, selection):
+    del fake_unreal.SELECTED[:]
+    fake_unreal.SELECTED.extend(selection)
+    fake_unreal.CALLS.clear()
+    fake_unreal.SIM_SECONDS[0] = 0.0
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        runpy.run_path(os.path.join(REPO_DIR, script), run_name='__main__')
+    wall = time.perf_counter() - start
+    return {
+        'wall_seconds': round(wall, 4),
+        'sim_seconds': round(fake_unreal.sim_seconds(), 4),
+        'calls': fake_unreal.counts(),
+    }
+
+
+def _with_throughput(result, items):
+    total = result['wall_seconds'] + result['sim_seconds']
+    result['items'] = items
+    result['items_per_second'] = round(items / total, 1) if total else 0.0
+    return result
+
+
+# connector on every texture selected:  cold run, then a rerun in a fresh session (incremental path)
+def bench_connector(name, assets):
+    results = {}
+    objects = scenarios.seed(assets)
+    scenarios.seed_parent_materials()
+    sets = len([obj for obj in objects if obj.get_name().endswith('_BaseColor')])
+    results['connector_cold'] = _with_throughput(_run_script('mat_instance_connector_simple.py', objects), sets)
+    fake_unreal.unload_all()
+    results['connector_rerun'] = _with_throughput(_run_script('mat_instance_connector_simple.py', objects), sets)
+    return results
+
+
+# sRGB off on every data map that is selected,  half of them already linear
+def bench_mass_change_attr(name, assets):
+    objects = scenarios.seed(assets)
+    linear = [obj for obj in objects if 'srgb' in obj._props and obj.get_name().endswith(tuple(scenarios.LINEAR_SUFFIXES))]
+    return {'mass_change_attr': _with_throughput(_run_script('mass_change_attr.py', linear), len(linear))}
+
+
+def bench_orc_connector(name, assets):
+    scenarios.seed_orc_test()
+    return {'orc_connector': _with_throughput(_run_script(os.path.join('test', 'mat_instance_connector.py'), []), 1)}
+
+
+TARGETS = [bench_connector, bench_mass_change_attr]
+
+
+def run_scenario(name):
+    assets = scenarios.scenario_assets(name)
+    results = {}
+    for target in TARGETS:
+        project_dir = tempfile.mkdtemp(prefix='bench_')
+        try:
+            fake_unreal.reset(project_dir=project_dir)
+            results.update(target(name, assets))
+        finally:
+            shutil.rmtree(project_dir, ignore_errors=True)
+    return results
+
+
+def run_single_asset_scripts():
+    project_dir = tempfile.mkdtemp(prefix='bench_')
+    try:
+        fake_unreal.reset(project_dir=project_dir)
+        return bench_orc_connector('orc', [])
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+
+
+def format_results(all_results):
+    lines = ['{0:<18} {1:<18} {2:>10} {3:>10} {4:>10} {5:>12}'.format('scenario', 'run', 'items', 'wall s', 'sim s', 'items/s')]
+    for scenario_name, results in all_results.items():
+        for run_name, result in results.items():
+            lines.append('{0:<18} {1:<18} {2:>10} {3:>10.3f} {4:>10.3f} {5:>12.1f}'.format(
+                scenario_name, run_name, result['items'], result['wall_seconds'], result['sim_seconds'], result['items_per_second']))
+            calls = result['calls']
+            lines.append('    ' + ',  '.join(name + ' ' + str(calls[name]) for name in TRACKED_CALLS if calls.get(name)))
+    return '\n'.join(lines)
+
+
+# [regression messages] for results that do more calls or take more simulated time than the baseline
+def compare(all_results, baseline, tolerance=TOLERANCE):
+    problems = []
+    for scenario_name, results in all_results.items():
+        for run_name, result in results.items():
+            expected = baseline.get(scenario_name, {}).get(run_name)
+            if expected == None:
+                continue
+            label = scenario_name + '/' + run_name
+            for call in TRACKED_CALLS:
+                allowed = expected['calls'].get(call, 0) * (1.0 + tolerance)
+                if result['calls'].get(call, 0) > allowed:
+                    problems.append(label + ':  ' + call + ' ' + str(result['calls'].get(call, 0))
+                                    + ' calls,  baseline ' + str(expected['calls'].get(call, 0)))
+            if result['sim_seconds'] > expected['sim_seconds'] * (1.0 + tolerance) + 1e-6:
+                problems.append(label + ':  simulated ' + str(result['sim_seconds']) + ' s,  baseline ' + str(expected['sim_seconds']) + ' s')
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='benchmark the automation scripts against a fake unreal module')
+    parser.add_argument('--scenario', nargs='+', choices=sorted(scenarios.SCENARIOS), help='default: ' + ' '.join(scenarios.CI_SCENARIOS))
+    parser.add_argument('--all', action='store_true', help='every scenario, including 100k sets')
+    parser.add_argument('--baseline', help='fail on call count or simulated time regressions against this json')
+    parser.add_argument('--save-baseline', help='write results as a new baseline')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    parser.add_argument('--out', help='also write the report to this file')
+    args = parser.parse_args(argv)
+
+    names = sorted(scenarios.SCENARIOS) if args.all else (args.scenario or scenarios.CI_SCENARIOS)
+    all_results = {}
+    for name in names:
+        all_results[name] = run_scenario(name)
+    all_results['orc'] = run_single_asset_scripts()
+
+    report = format_results(all_results)
+    problems = []
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            problems = compare(all_results, json.load(f), args.tolerance)
+        report += '\n\n' + ('\n'.join('REGRESSION  ' + problem for problem in problems) if problems else 'no regressions against ' + args.baseline)
+    print(report)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(report + '\n')
+    if args.save_baseline:
+        baseline = {}
+        for scenario_name, results in all_results.items():
+            baseline[scenario_name] = dict((run_name, {'sim_seconds': result['sim_seconds'], 'calls': result['calls']})
+                                           for run_name, result in results.items())
+        with open(args.save_baseline, 'w') as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,87 @@
+# synthetic content for the benchmarks:  texture sets in several naming conventions, with missing maps.
+# every generator is seeded so runs are repeatable.
+import random
+
+import fake_unreal
+
+# suffixes of one texture set per naming convention,  first one is the base texture
+NAMINGS = {
+    'pbr': ['_BaseColor', '_Normal', '_OcclusionRoughnessMetallic', '_Emissive'],        # mat_instance_connector_simple.py
+    'albedo': ['_Albedo', '_Normal', '_Roughness', '_Metalness', '_AO', '_Emissive'],     # mat_instance_connector_prb_basic.py
+    't_prefix': ['_basecolor', '_masks', '_normal', '_Bentnormal'],                       # automate_material_creation.py
+}
+OPTIONAL_SUFFIXES = ['_Emissive', '_AO', '_Bentnormal']
+LINEAR_SUFFIXES = ['_OcclusionRoughnessMetallic', '_Roughness', '_Metalness', '_AO', '_masks']
+
+SCENARIOS = {
+    'sets_1k': {'sets': 1000},
+    'sets_10k': {'sets': 10000},
+    'sets_100k': {'sets': 100000},
+    'mixed_10k': {'sets': 10000, 'naming': 'mixed'},
+    'missing_maps_10k': {'sets': 10000, 'missing_ratio': 0.25},
+}
+
+# run on every ci build,  the big ones on demand
+CI_SCENARIOS = ['sets_1k']
+
+
+# [(object_path, class_name, props)] for count texture sets
+#   naming:          'pbr', 'albedo', 't_prefix' or 'mixed'
+#   missing_ratio:   chance each required non base map is missing
+#   optional_ratio:  chance a set has its optional maps (emissive, ao...)
+#   linear_ratio:    chance a data map is already imported linear
+def texture_sets(count, naming='pbr', missing_ratio=0.0, optional_ratio=0.2, linear_ratio=0.5, folder_size=200,
+                 root='/Game/bench', seed=1):
+    rng = random.Random(seed)
+    namings = sorted(NAMINGS) if naming == 'mixed' else [naming]
+    assets = []
+    for n in range(count):
+        set_naming = namings[n % len(namings)]
+        folder = root + '/folder_' + str(n // folder_size)
+        base_name = ('T_' if set_naming == 't_prefix' else '') + 'set' + str(n)
+        for position, suffix in enumerate(NAMINGS[set_naming]):
+            if suffix in OPTIONAL_SUFFIXES:
+                if rng.random() >= optional_ratio:
+                    continue
+            elif position > 0 and rng.random() < missing_ratio:
+                continue
+            props = {}
+            if suffix in LINEAR_SUFFIXES:
+                props['srgb'] = rng.random() >= linear_ratio
+            asset_name = base_name + suffix
+            assets.append((folder + '/' + asset_name + '.' + asset_name, 'Texture2D', props))
+    return assets
+
+
+def scenario_assets(name):
+    settings = dict(SCENARIOS[name])
+    return texture_sets(settings.pop('sets'), **settings)
+
+
+# put the assets into the fake editor,  returns the created objects
+def seed(assets):
+    return [fake_unreal.add_asset(object_path, class_name, **props) for object_path, class_name, props in assets]
+
+
+# the parent material every connector variant loads
+def seed_parent_materials():
+    fake_unreal.add_asset('/Game/dawnOfWar/assets/materials/unreal_pbr_base_mat.unreal_pbr_base_mat', 'Material')
+    fake_unreal.add_asset('/Game/dawnOfWar/materials/master_materials/basic_pbr_base_mat.basic_pbr_base_mat', 'Material')
+
+
+# hard coded assets test/mat_instance_connector.py works on
+def seed_orc_test():
+    seed_parent_materials()
+    folder = '/Game/dawnOfWar/assets/orc/materials/orc/test/'
+    old_mat = fake_unreal.add_asset(folder + 'orc_loincloth_mat_blinn_dup.orc_loincloth_mat_blinn_dup', 'Material')
+    # twelve slots,  the loincloth is slot 11
+    slots = []
+    for n, part in enumerate(['body', 'head', 'arms', 'legs', 'belt', 'boots', 'gloves', 'hair', 'teeth', 'eyes', 'armour']):
+        material = fake_unreal.add_asset(folder + 'orc_' + part + '_mat.orc_' + part + '_mat', 'Material')
+        slots.append(fake_unreal.StaticMaterial(material, 'orc_' + part))
+    slots.append(fake_unreal.StaticMaterial(old_mat, 'orc_loincloth'))
+    fake_unreal.add_asset('/Game/dawnOfWar/assets/orc/orc_dup.orc_dup', 'StaticMesh', static_materials=slots)
+    for suffix in ['_BaseColor', '_Normal', '_OcclusionRoughnessMetallic']:
+        asset_name = 'orc_loincloth' + suffix + '_dup'
+        fake_unreal.add_asset(folder + asset_name + '.' + asset_name, 'Texture2D')
+    fake_unreal.EditorAssetLibrary.make_directory('/Game/Test_Mat_Output')
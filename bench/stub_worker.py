@@ -0,0 +1,49 @@
+# stand-in for a headless editor worker of shard_coordinator.py,  no engine needed.
+# "applies" a shard plan by writing every set that is not unchanged into the worker manifest,
+# and logs the same lines run_job.py apply_plan does.
+#   python bench/stub_worker.py plan.json manifest.json [--seconds-per-instance 0.001] [--fail]
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import content_manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='stub shard worker')
+    parser.add_argument('plan')
+    parser.add_argument('manifest')
+    parser.add_argument('--seconds-per-instance', type=float, default=0.0)
+    parser.add_argument('--fail', action='store_true', help='log a failed job and exit 1 half way through')
+    args = parser.parse_args(argv)
+
+    with open(args.plan, 'r') as f:
+        plan = json.load(f)
+    manifest = content_manifest.ContentManifest(args.manifest)
+    counts = dict((name, 0) for name in ['sets', 'skipped', 'created', 'rebuilt', 'saved', 'failed'])
+    print('LogPython: run_job: ' + json.dumps({'job': 'apply_plan', 'plan': args.plan, 'manifest_file': args.manifest}, sort_keys=True))
+    for n, entry in enumerate(plan['instances']):
+        if args.fail and n >= len(plan['instances']) // 2:
+            manifest.save()
+            print('LogPython: Error: run_job: apply_plan failed:  stub failure')
+            print('LogPython: run_job: apply_plan FAILED')
+            return 1
+        counts['sets'] += 1
+        if entry['unchanged']:
+            counts['skipped'] += 1
+            continue
+        time.sleep(args.seconds_per_instance)
+        counts['rebuilt' if entry['exists'] else 'created'] += 1
+        counts['saved'] += 1
+        manifest.update(entry['inst_path'], entry['set_digest'])
+        print('LogPython: done:  ' + entry['inst_path'])
+    manifest.save()
+    print('LogPython: run_job: apply_plan done  ' + json.dumps(counts, sort_keys=True))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
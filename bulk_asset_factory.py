@@ -0,0 +1,168 @@
+# create many assets from a spec:  names are checked against one asset registry listing of the target folder
+# before anything is created,  assets are created and set up chunk by chunk with one save call per chunk,
+# and the run reports its throughput.
+#   spec = {
+#       'factory': 'BlueprintFactory',                      # unreal factory class name
+#       'factory_properties': {'ParentClass': 'Actor'},     # class names are resolved to unreal classes
+#       'folder': '/Game/LoadTest',
+#       'name': 'BP_Load_{n:05d}',                          # {n} is the asset number
+#       'count': 5000,
+#       'start': 0, 'step': 1,                              # worker k of K:  start=k, step=K  -> disjoint names
+#       'properties': {},                                   # set on each new asset
+#       'default_properties': {},                           # blueprints: set on the generated class default object
+#       'on_exists': 'skip',                                # 'skip' existing names or 'error' before creating anything
+#       'chunk_size': 200,
+#   }
+#   report = bulk_asset_factory.create_assets(spec)
+# create_blueprints.py and run_job.py blueprints are built on this.
+import os
+import sys
+import time
+import unreal
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__))) # so modules next to this script import from the unreal console
+import batch_save
+import run_stats
+from asset_naming import make_object_path
+
+DEFAULT_SPEC = {
+    'factory': 'BlueprintFactory',
+    'factory_properties': {},
+    'start': 0,
+    'step': 1,
+    'properties': {},
+    'default_properties': {},
+    'on_exists': 'skip',
+    'chunk_size': batch_save.DEFAULT_CHUNK_SIZE,
+}
+
+
+def _spec(spec):
+    merged = dict(DEFAULT_SPEC)
+    merged.update(spec)
+    for key in ['folder', 'name', 'count']:
+        if key not in merged:
+            raise ValueError('asset spec needs ' + key)
+    merged['folder'] = merged['folder'].rstrip('/')
+    return merged
+
+
+def asset_names(spec):
+    spec = _spec(spec)
+    return [spec['name'].format(n=spec['start'] + i * spec['step']) for i in range(spec['count'])]
+
+
+# (names to create, existing names, names the template produces more than once),  from one folder listing.
+# object paths are compared lowercased,  the editor treats BP_Door and bp_door as the same asset
+def check_names(spec):
+    spec = _spec(spec)
+    registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    with run_stats.timer('list_folder'):
+        existing = set(make_object_path(spec['folder'], str(asset_data.asset_name)).lower()
+                       for asset_data in registry.get_assets_by_path(spec['folder'], recursive=False))
+    seen = set()
+    to_create, collisions, duplicates = [], [], []
+    for name in asset_names(spec):
+        key = make_object_path(spec['folder'], name).lower()
+        if key in seen:
+            duplicates.append(name)
+        elif key in existing:
+            collisions.append(name)
+        else:
+            to_create.append(name)
+        seen.add(key)
+    return to_create, collisions, duplicates
+
+
+def _resolve(value):
+    # 'Actor' -> unreal.Actor for class valued factory properties
+    if isinstance(value, str) and hasattr(unreal, value):
+        return getattr(unreal, value)
+    return value
+
+
+def make_factory(spec):
+    factory = getattr(unreal, spec['factory'])()
+    factory.set_editor_property('edit_after_new', False) # no asset editor opened for every new asset
+    for name, value in spec['factory_properties'].items():
+        factory.set_editor_property(name, _resolve(value))
+    return factory
+
+
+def _set_up(asset, spec):
+    if spec['properties']:
+        asset.set_editor_properties(spec['properties'])
+    if spec['default_properties']:
+        default_object = unreal.get_default_object(asset.generated_class())
+        default_object.set_editor_properties(spec['default_properties'])
+
+
+# returns {'requested', 'created', 'skipped', 'failed', 'saved', 'seconds', 'assets_per_second', 'collisions', 'duplicates'}
+@run_stats.timed('create_assets')
+def create_assets(spec, dry_run=False):
+    spec = _spec(spec)
+    start_time = time.time()
+    to_create, collisions, duplicates = check_names(spec)
+    if duplicates:
+        raise ValueError('name template ' + spec['name'] + ' gives the same name more than once, e.g. ' + duplicates[0])
+    if collisions and spec['on_exists'] == 'error':
+        raise ValueError(str(len(collisions)) + ' assets already exist in ' + spec['folder'] + ', e.g. ' + collisions[0])
+    report = {'requested': spec['count'], 'created': 0, 'skipped': len(collisions), 'failed': 0, 'saved': 0,
+              'collisions': collisions, 'duplicates': duplicates}
+    if dry_run:
+        report['created'] = len(to_create)
+        return _throughput(report, start_time)
+
+    factory = make_factory(spec)
+    asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+    chunk_size = max(1, int(spec['chunk_size']))
+    for chunk_start in range(0, len(to_create), chunk_size):
+        chunk = []
+        for name in to_create[chunk_start:chunk_start + chunk_size]:
+            with run_stats.timer('create_asset'):
+                asset = asset_tools.create_asset(name, spec['folder'], None, factory)
+            if asset == None:
+                unreal.log_warning('bulk_asset_factory: could not create ' + spec['folder'] + '/' + name)
+                report['failed'] += 1
+                continue
+            _set_up(asset, spec)
+            run_stats.count('creates')
+            chunk.append(asset)
+        report['created'] += len(chunk)
+        report['saved'] += batch_save.save_assets_chunked(chunk, chunk_size) # one save call for the chunk
+    return _throughput(report, start_time)
+
+
+def _throughput(report, start_time):
+    seconds = time.time() - start_time
+    report['seconds'] = round(seconds, 3)
+    report['assets_per_second'] = round(report['created'] / seconds, 1) if seconds > 0 else 0.0
+    return report
+
+
+def format_report(report, dry_run=False):
+    lines = [str(report['created']) + ' of ' + str(report['requested']) + (' would be created' if dry_run else ' created') + ',  '
+             + str(report['skipped']) + ' already existed,  ' + str(report['failed']) + ' failed,  ' + str(report['saved']) + ' saved  ('
+             + str(report['seconds']) + ' s,  ' + str(report['assets_per_second']) + ' assets/s)']
+    for name in report['collisions'][:20]:
+        lines.append('exists:  ' + name)
+    if len(report['collisions']) > 20:
+        lines.append('... ' + str(len(report['collisions']) - 20) + ' more')
+    return lines
+
+
+if __name__ == '__main__':
+    SPEC = {
+        'factory': 'BlueprintFactory',
+        'factory_properties': {'ParentClass': 'Actor'},
+        'folder': '/Game/LoadTest',
+        'name': 'BP_Load_{n:05d}',
+        'count': 1000,
+    }
+    DRY_RUN = False
+
+    run_stats.new_run()
+    report = create_assets(SPEC, DRY_RUN)
+    for line in format_report(report, DRY_RUN):
+        print(line)
+    print(run_stats.end_run())
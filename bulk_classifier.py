@@ -0,0 +1,140 @@
+# classify a whole asset listing at once instead of asset by asset.
+# names are matched against every suffix (or prefix) with array string ops when numpy is installed,
+# otherwise through one sorted index of the reversed names where each suffix is a bisect range lookup,
+# so the cost is a sort plus the matches,  not names x suffixes string checks.
+# plain python, no unreal import.
+#   result = bulk_classifier.classify_sets(records, ['_BaseColor', '_Normal'], base_suffix='_BaseColor')
+#   python bulk_classifier.py listing.json --schema pbr
+import argparse
+import bisect
+import sys
+import time
+
+try:
+    import numpy
+except ImportError: # not in the editor's python by default,  the bisect index does the same job
+    numpy = None
+
+import texture_schema
+from asset_listing import load_listing
+
+
+def _range_end(key):
+    # smallest string greater than every string that starts with key
+    return key[:-1] + chr(ord(key[-1]) + 1)
+
+
+class NameIndex(object):
+    # names sorted once (reversed for suffixes),  every lookup after that is a bisect range
+
+    def __init__(self, names, reverse=True):
+        self.names = names
+        self.reverse = reverse
+        keys = [name[::-1] for name in names] if reverse else list(names)
+        self.order = sorted(range(len(names)), key=keys.__getitem__)
+        self.keys = [keys[n] for n in self.order]
+
+    # positions in names of every name that ends (starts) with affix
+    def lookup(self, affix):
+        key = affix[::-1] if self.reverse else affix
+        start = bisect.bisect_left(self.keys, key)
+        end = bisect.bisect_left(self.keys, _range_end(key), start)
+        return self.order[start:end]
+
+    def matches(self, affixes):
+        names = self.names
+        found = [-1] * len(names)
+        for affix_index in sorted(range(len(affixes)), key=lambda i: -len(affixes[i])): # longest wins
+            affix = affixes[affix_index]
+            if not affix:
+                continue
+            for n in self.lookup(affix):
+                if found[n] == -1 and len(names[n]) > len(affix):
+                    found[n] = affix_index
+        return found
+
+
+def _numpy_matches(names, affixes, reverse):
+    array = numpy.array(names, dtype=str)
+    lengths = numpy.char.str_len(array)
+    found = numpy.full(len(names), -1, dtype=int)
+    test = numpy.char.endswith if reverse else numpy.char.startswith
+    for affix_index in sorted(range(len(affixes)), key=lambda i: -len(affixes[i])):
+        affix = affixes[affix_index]
+        if not affix:
+            continue
+        hits = test(array, affix) & (lengths > len(affix)) & (found == -1)
+        found[hits] = affix_index
+    return found.tolist()
+
+
+# [index into suffixes of the longest one each name ends with,  -1 for none]  (name must be longer than the suffix)
+def suffix_matches(names, suffixes, use_numpy=None):
+    if not names:
+        return []
+    if use_numpy if use_numpy != None else numpy != None:
+        return _numpy_matches(names, suffixes, True)
+    return NameIndex(names, True).matches(suffixes)
+
+
+def prefix_matches(names, prefixes, use_numpy=None):
+    if not names:
+        return []
+    if use_numpy if use_numpy != None else numpy != None:
+        return _numpy_matches(names, prefixes, False)
+    return NameIndex(names, False).matches(prefixes)
+
+
+# one shot over the listing:
+#   'sets':       {folder/: {base name: {suffix: object path}}}  for sets that have the base texture (all if base_suffix is None)
+#   'orphans':    texture paths in a set without its base texture
+#   'unmatched':  texture paths with none of the suffixes
+def classify_sets(records, suffixes, base_suffix=None, texture_prefix=None, use_numpy=None):
+    textures = [record for record in records if record.class_name.startswith('Texture')]
+    names = [record.asset_name for record in textures]
+    found = suffix_matches(names, suffixes, use_numpy)
+    if texture_prefix:
+        has_prefix = prefix_matches(names, [texture_prefix], use_numpy)
+
+    groups = {}
+    unmatched = []
+    for n, record in enumerate(textures):
+        if found[n] == -1 or (texture_prefix and has_prefix[n] == -1):
+            unmatched.append(record.object_path)
+            continue
+        suffix = suffixes[found[n]]
+        base_name = record.asset_name[:-len(suffix)]
+        groups.setdefault(record.package_path.rstrip('/') + '/', {}).setdefault(base_name, {})[suffix] = record.object_path
+
+    orphans = []
+    if base_suffix != None:
+        for folder, sets in groups.items():
+            for base_name in [base_name for base_name, tex_paths in sets.items() if base_suffix not in tex_paths]:
+                orphans.extend(sets.pop(base_name).values())
+    return {'sets': groups, 'orphans': sorted(orphans), 'unmatched': sorted(unmatched)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='group the texture sets of an asset listing and report orphans')
+    parser.add_argument('listing', help='json listing from asset_query.export_listing()')
+    parser.add_argument('--schema', default='pbr', help='texture_schemas.json entry')
+    parser.add_argument('--no-numpy', dest='use_numpy', action='store_false', default=None)
+    args = parser.parse_args(argv)
+
+    schema = texture_schema.get_schema(args.schema)
+    records = load_listing(args.listing)
+    start = time.time()
+    result = classify_sets(records, texture_schema.schema_suffixes(schema), texture_schema.base_suffix(schema),
+                           schema.get('texture_prefix'), args.use_numpy)
+    seconds = time.time() - start
+    sets = sum(len(sets) for sets in result['sets'].values())
+    print(str(sets) + ' sets in ' + str(len(result['sets'])) + ' folders,  ' + str(len(result['orphans'])) + ' orphan textures,  '
+          + str(len(result['unmatched'])) + ' unmatched textures  (' + str(len(records)) + ' assets in '
+          + str(int(seconds * 1000)) + ' ms, ' + ('numpy' if args.use_numpy != False and numpy != None else 'bisect index') + ')')
+    for path in result['orphans']:
+        print('orphan:  ' + path)
+    return result
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,58 @@
+# bulk property editor: reads current values first and only writes properties that differ,
+# so assets that already have the value are not dirtied, re-saved or (for textures) recompressed.
+#   report = bulk_property_editor.apply_properties(assets, {'srgb': False}, dry_run=True)
+import unreal
+
+
+# editor hands back bools for 0/1 flags, floats with rounding etc.
+def values_equal(current, wanted):
+    if isinstance(current, bool) or isinstance(wanted, bool):
+        return bool(current) == bool(wanted)
+    if isinstance(current, float) or isinstance(wanted, float):
+        try:
+            return abs(float(current) - float(wanted)) < 1e-6
+        except (TypeError, ValueError):
+            return False
+    return current == wanted
+
+
+# [(property, current value, wanted value)] for every property that differs,  None if asset lacks one of them
+def diff_properties(asset, properties):
+    changes = []
+    for name, wanted in properties.items():
+        try:
+            current = asset.get_editor_property(name)
+        except Exception:
+            return None
+        if not values_equal(current, wanted):
+            changes.append((name, current, wanted))
+    return changes
+
+
+# returns (changed, skipped):  changed is [(asset path, changes)],  skipped is paths of assets without the properties.
+# all differing properties of an asset are set in one call so it gets a single post edit change
+def apply_properties(assets, properties, dry_run=False):
+    changed = []
+    skipped = []
+    for asset in assets:
+        changes = diff_properties(asset, properties)
+        if changes == None:
+            skipped.append(asset.get_path_name())
+            continue
+        if not changes:
+            continue
+        if not dry_run:
+            asset.set_editor_properties(dict((name, wanted) for name, current, wanted in changes))
+        changed.append((asset.get_path_name(), changes))
+    return changed, skipped
+
+
+def format_report(changed, skipped, dry_run=False):
+    lines = []
+    for asset_path, changes in changed:
+        lines.append(('would change:  ' if dry_run else 'changed:  ') + asset_path)
+        for name, current, wanted in changes:
+            lines.append('    ' + name + ':  ' + str(current) + ' -> ' + str(wanted))
+    for asset_path in skipped:
+        lines.append('skipped (missing property):  ' + asset_path)
+    return lines
@@ -0,0 +1,191 @@
+# pack separate grayscale maps into one ORM texture before import:
+#   <base>_AO, <base>_Roughness, <base>_Metalness  ->  <base>_OcclusionRoughnessMetallic.tga  (r = ao, g = roughness, b = metallic)
+# so a set made for the 'albedo' schema (three samplers, three streamed textures) binds like a 'pbr' set with one.
+# suffixes come from texture_schemas.json:  the source schema's AO / Roughness / Metallic parameters,
+# the target schema's OcclusionRoughnessMetallic parameter.  a missing ao is white, a missing metallic black,
+# roughness has to be there.  with base_color the albedo is also copied to the target's base suffix
+# (<base>_BaseColor),  which the standard connector path needs to find the set.
+# the output is a memory mapped tga filled one band of rows per source at a time (image_io.py),  so a 8k set
+# holds one band in memory.  outputs newer than their sources are left alone.  needs numpy,  no unreal import.
+#   python channel_packer.py C:/drops/orc --workers 4 --base-color
+import argparse
+import concurrent.futures
+import os
+import shutil
+import sys
+import time
+
+import image_io
+import texture_schema
+from asset_naming import split_texture_name
+from image_io import numpy
+
+SOURCE_SCHEMA = 'albedo'
+TARGET_SCHEMA = 'pbr'
+PACKED_PARAM = 'OcclusionRoughnessMetallic'
+# output channel -> (source parameter, value when the map is missing or None if it is required)
+CHANNELS = [('AO', 255), ('Roughness', None), ('Metallic', 0)]
+
+
+def _suffix_for(schema, param):
+    for texture in schema['textures']:
+        if texture['param'] == param:
+            return texture['suffix']
+    raise ValueError('schema has no ' + param + ' texture')
+
+
+# {'sources': [suffix per output channel], 'packed': suffix, 'base': source base suffix, 'target_base': target base suffix}
+def pack_config(source_schema=SOURCE_SCHEMA, target_schema=TARGET_SCHEMA):
+    source = texture_schema.get_schema(source_schema) if isinstance(source_schema, str) else source_schema
+    target = texture_schema.get_schema(target_schema) if isinstance(target_schema, str) else target_schema
+    return {
+        'sources': [_suffix_for(source, param) for param, default in CHANNELS],
+        'packed': _suffix_for(target, PACKED_PARAM),
+        'base': texture_schema.base_suffix(source),
+        'target_base': texture_schema.base_suffix(target),
+    }
+
+
+# [{'base': folder/base name, 'files': {suffix: path}}] for every set with at least one of the maps to pack
+def find_sets(paths, config):
+    suffixes = config['sources'] + [config['base']]
+    sets = {}
+    for path in paths:
+        split = split_texture_name(os.path.splitext(os.path.basename(path))[0], suffixes)
+        if split == None:
+            continue
+        base = os.path.join(os.path.dirname(path), split[0])
+        files = sets.setdefault(base, {})
+        if split[1] in files:
+            continue # same map in two formats,  the first sorted path wins
+        files[split[1]] = path
+    return [{'base': base, 'files': files} for base, files in sorted(sets.items())
+            if any(suffix in files for suffix in config['sources'])]
+
+
+def packed_path(texture_set, config):
+    return texture_set['base'] + config['packed'] + '.tga'
+
+
+def is_current(texture_set, config):
+    out_path = packed_path(texture_set, config)
+    if not os.path.isfile(out_path):
+        return False
+    newest = max(os.path.getmtime(path) for path in texture_set['files'].values())
+    return os.path.getmtime(out_path) >= newest
+
+
+def _gray(band):
+    # first channel of a grayscale map saved as rgb,  any bit depth -> uint8
+    if band.dtype == numpy.uint8:
+        return band[:, :, 0]
+    return numpy.clip(numpy.round(image_io.to_float(band[:, :, 0]) * 255.0), 0, 255).astype(numpy.uint8)
+
+
+# write the packed tga,  returns (out path, None) or (None, reason)
+def pack_set(texture_set, config, band_rows=image_io.BAND_ROWS, base_color=False):
+    files = texture_set['files']
+    headers = {}
+    for suffix, (param, default) in zip(config['sources'], CHANNELS):
+        if suffix in files:
+            headers[suffix] = image_io.read_header(files[suffix])
+        elif default == None:
+            return None, 'no ' + suffix
+    sizes = set((header['width'], header['height']) for header in headers.values())
+    if len(sizes) > 1:
+        return None, 'maps differ in size: ' + ', '.join(str(w) + 'x' + str(h) for w, h in sorted(sizes))
+    width, height = sizes.pop()
+
+    out_path = packed_path(texture_set, config)
+    tmp_path = out_path + '.tmp'
+    try:
+        pixels = image_io.create_tga(tmp_path, width, height, 3)
+        try:
+            for channel, (suffix, (param, default)) in enumerate(zip(config['sources'], CHANNELS)):
+                target = image_io.TGA_CHANNEL[channel]
+                if suffix not in files:
+                    for top in range(0, height, band_rows):
+                        pixels[top:top + band_rows, :, target] = default
+                    continue
+                for top, band in image_io.iter_bands(files[suffix], band_rows, headers[suffix]):
+                    pixels[top:top + band.shape[0], :, target] = _gray(band)
+            pixels.flush()
+        finally:
+            del pixels
+    except Exception:
+        if os.path.isfile(tmp_path): # no partial file left next to the sources
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, out_path)
+
+    if base_color and config['base'] in files and config['base'] != config['target_base']:
+        source = files[config['base']]
+        copy_path = texture_set['base'] + config['target_base'] + os.path.splitext(source)[1]
+        if not os.path.isfile(copy_path) or os.path.getmtime(copy_path) < os.path.getmtime(source):
+            shutil.copyfile(source, copy_path)
+    return out_path, None
+
+
+def _pack_args(args):
+    texture_set, config, band_rows, base_color = args
+    try:
+        return texture_set['base'], pack_set(texture_set, config, band_rows, base_color)
+    except (ValueError, ImportError, OSError) as error: # ImportError:  no decoder (Pillow, OpenEXR) for one of its files
+        return texture_set['base'], (None, str(error))
+
+
+# packs every set under the roots that is not current,  returns {'packed': [paths], 'current': [bases], 'failed': [(base, reason)]}
+def pack_folders(roots, config=None, workers=1, band_rows=image_io.BAND_ROWS, base_color=False, force=False):
+    config = config or pack_config()
+    report = {'packed': [], 'current': [], 'failed': []}
+    jobs = []
+    for texture_set in find_sets(image_io.find_images(roots), config):
+        if not force and is_current(texture_set, config):
+            report['current'].append(texture_set['base'])
+        else:
+            jobs.append((texture_set, config, band_rows, base_color))
+    if workers > 1 and len(jobs) > 1:
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_pack_args, jobs))
+    else:
+        results = [_pack_args(job) for job in jobs]
+    for base, (out_path, reason) in results:
+        if out_path != None:
+            report['packed'].append(out_path)
+        else:
+            report['failed'].append((base, reason))
+    return report
+
+
+def format_report(report):
+    lines = ['packed:  ' + path for path in report['packed']]
+    lines += ['could not pack:  ' + base + '  ' + reason for base, reason in report['failed']]
+    lines.append(str(len(report['packed'])) + ' packed,  ' + str(len(report['current'])) + ' already current,  '
+                 + str(len(report['failed'])) + ' failed')
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='pack ao / roughness / metallic maps into one ORM tga')
+    parser.add_argument('paths', nargs='+', help='image files or folders')
+    parser.add_argument('--source-schema', default=SOURCE_SCHEMA)
+    parser.add_argument('--target-schema', default=TARGET_SCHEMA)
+    parser.add_argument('--base-color', action='store_true', help="copy the source base map to the target's base suffix")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--band-rows', type=int, default=image_io.BAND_ROWS)
+    parser.add_argument('--force', action='store_true', help='repack sets that are already current')
+    args = parser.parse_args(argv)
+    if numpy == None:
+        print('channel_packer needs numpy')
+        return 1
+    start = time.time()
+    report = pack_folders(args.paths, pack_config(args.source_schema, args.target_schema), args.workers, args.band_rows,
+                          args.base_color, args.force)
+    for line in format_report(report):
+        print(line)
+    print(str(round(time.time() - start, 2)) + ' s')
+    return 1 if report['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
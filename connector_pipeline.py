@@ -0,0 +1,269 @@
+# material instance connector as a chain of generator stages.
+# (the planning itself is connector_planner.plan_instance(),  which also runs outside the editor)
+# records stream through  discover -> resolve_sets -> create_instances -> bind_parameters -> assign_to_mesh -> persist
+# one at a time,  persist holds at most window_size items before updating/saving them and letting them go,
+# so memory is bound by the window and not by the whole selection.
+# stages can be left out, reordered or wrapped (profiling, batching):
+#   ctx = connector_pipeline.ConnectorRun(config)
+#   for item in connector_pipeline.run_stages(ctx, [connector_pipeline.resolve_sets]): print(item.inst_path)
+import os
+
+import unreal
+
+import asset_cache
+import asset_query
+import batch_save
+import bulk_property_editor
+import connector_planner
+import content_manifest
+import material_batch
+import mesh_material_reassign
+import run_stats
+import texture_set_index
+from asset_naming import make_object_path, strip_prefix
+
+DEFAULT_CONFIG = dict(connector_planner.DEFAULT_PLAN_CONFIG) # parent, suffixes, parameters, naming ('pbr' in texture_schemas.json)
+DEFAULT_CONFIG.update({
+    'asset_source': 'selection',   # 'selection' or 'query'
+    'query': {},                   # asset_query.query_assets() arguments for 'query'
+    'batch_mode': True,            # save per window instead of per instance
+    'save_chunk_size': 200,
+    'window_size': 500,            # instances held before update + save
+    'headless_batch': True,        # no editor per new instance, one update pass per window
+    'incremental': True,
+    'manifest_file': None,         # defaults to <project>/mat_instance_manifest.json
+    'collect_garbage': False,      # gc after every window,  frees the window's uobjects on very large runs
+})
+
+
+class ConnectorItem(object):
+    # one planned material instance (connector_planner.plan_instance() entry) on its way through the stages
+
+    def __init__(self, entry):
+        self.entry = entry
+        self.inst_name = entry['inst_name']
+        self.inst_path = entry['inst_path']
+        self.folder = entry['folder']            # '/Game/folder/'
+        self.inst_exists = entry['exists']
+        self.set_digest = entry['set_digest']
+        self.parent = None
+        self.inst = None
+        self.mesh_path = None                    # optional mesh + slot for assign_to_mesh
+        self.mesh_slot = 0
+        self.mesh = None
+
+    # drop uobject references once the item is saved
+    def release(self):
+        self.parent = None
+        self.inst = None
+        self.mesh = None
+
+
+class ConnectorRun(object):
+    # state shared by the stages of one run
+
+    def __init__(self, config=None):
+        self.config = dict(DEFAULT_CONFIG)
+        self.config.update(config or {})
+        asset_cache.new_run() # parent material and shared textures are loaded once per run
+        self.parent = asset_cache.load_asset(self.config['parent_material'])
+        if self.parent == None:
+            raise ValueError('parent material not found: ' + self.config['parent_material'])
+        self.texture_index = texture_set_index.TextureSetIndex(list(self.config['texture_params']))
+        manifest_file = self.config['manifest_file'] or os.path.join(unreal.Paths.project_dir(), 'mat_instance_manifest.json')
+        self.manifest = content_manifest.ContentManifest(manifest_file)
+        self.counts = dict((name, 0) for name in ['records', 'sets', 'skipped', 'incomplete', 'created', 'rebuilt', 'saved', 'failed'])
+
+
+# base texture records from the selection or an asset registry query
+def discover(ctx):
+    if ctx.config['asset_source'] == 'query':
+        records = asset_query.query_assets(**ctx.config['query'])
+    else:
+        records = asset_query.records_from_assets(unreal.EditorUtilityLibrary().get_selected_assets())
+    for record in records:
+        ctx.counts['records'] += 1
+        yield record
+
+
+# record -> item planned from the set's texture paths in the folder index (nothing loaded),  unchanged sets are dropped here
+def resolve_sets(ctx, records):
+    base_suffix = ctx.config['base_suffix']
+    for record in records:
+        if not record.asset_name.endswith(base_suffix):
+            continue
+        texture_base = record.asset_name[:-len(base_suffix)]
+        base_name = strip_prefix(texture_base, ctx.config.get('texture_prefix'))
+        folder = record.package_path + '/'
+        tex_paths = ctx.texture_index.get_set(folder, texture_base)
+        inst_path = make_object_path(folder, ctx.config['instance_name'].format(base=base_name))
+        existing = [inst_path] if unreal.EditorAssetLibrary.does_asset_exist(inst_path) else []
+        manifest_entries = ctx.manifest.entries if ctx.config['incremental'] else None
+        entry = connector_planner.plan_instance(base_name, folder, tex_paths, ctx.config, existing, manifest_entries)
+        ctx.counts['sets'] += 1
+        if entry['missing']:
+            unreal.log_warning(record.object_path + ' is missing required ' + ', '.join(entry['missing']) + ',  skipping')
+            ctx.counts['incomplete'] += 1
+            continue
+        if entry['unchanged']:
+            ctx.counts['skipped'] += 1
+            run_stats.count('skips')
+            continue
+        yield ConnectorItem(entry)
+
+
+# create the instance,  or reuse and clear an existing one for a changed set
+def create_instances(ctx, items):
+    asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+    headless = ctx.config['headless_batch']
+    for item in items:
+        if item.inst_exists:
+            item.inst = asset_cache.load_asset(item.inst_path)
+            if item.inst == None: # listing or manifest older than the content
+                unreal.log_warning('could not load ' + item.inst_path)
+                ctx.counts['failed'] += 1
+                continue
+            unreal.MaterialEditingLibrary.clear_all_material_instance_parameters(item.inst)
+            ctx.counts['rebuilt'] += 1
+        else:
+            factory = unreal.MaterialInstanceConstantFactoryNew()
+            factory.set_editor_property('create_new', 1)
+            factory.set_editor_property('edit_after_new', 0 if headless else 1)
+            with run_stats.timer('create_asset'):
+                item.inst = asset_tools.create_asset(item.inst_name, item.folder, None, factory)
+            if item.inst == None:
+                unreal.log_warning('could not create ' + item.inst_path)
+                ctx.counts['failed'] += 1
+                continue
+            ctx.counts['created'] += 1
+            run_stats.count('creates')
+        item.parent = asset_cache.load_asset(item.entry['parent']) # run's parent unless a plan says otherwise
+        if headless:
+            material_batch.set_parent_quiet(item.inst, item.parent)
+        else:
+            item.inst.set_editor_property('parent', item.parent)
+        yield item
+
+
+# load the set's textures and connect them,  non headless runs update the instance right away
+def bind_parameters(ctx, items):
+    material_lib = unreal.MaterialEditingLibrary
+    for item in items:
+        linear = [asset_cache.load_asset(tex_path) for tex_path in item.entry['linear_textures']]
+        bulk_property_editor.apply_properties([tex for tex in linear if tex != None], {'srgb': False}) # only if not already linear
+        textures = {}
+        for param_name, tex_path in sorted(item.entry['textures'].items()):
+            textures[param_name] = asset_cache.load_asset(tex_path)
+            if textures[param_name] == None:
+                unreal.log_warning('missing texture ' + tex_path + ' for ' + item.inst_path)
+        with run_stats.timer('set_parameters'):
+            for param_name, tex in sorted(textures.items()):
+                if tex != None:
+                    material_lib.set_material_instance_texture_parameter_value(item.inst, param_name, tex)
+            for param_name, value in sorted(item.entry['scalars'].items()):
+                material_lib.set_material_instance_scalar_parameter_value(item.inst, param_name, value)
+        if not ctx.config['headless_batch']:
+            with run_stats.timer('update_material_instance'):
+                material_lib.update_material_instance(item.inst)
+            run_stats.count('updates')
+        yield item
+
+
+# load the item's mesh, if one was given.  the slot is set when the window is persisted,
+# together with every other slot change to the same mesh
+def assign_to_mesh(ctx, items):
+    for item in items:
+        if item.mesh_path != None:
+            item.mesh = asset_cache.load_asset(item.mesh_path)
+            if item.mesh == None:
+                unreal.log_warning('missing mesh ' + item.mesh_path)
+        yield item
+
+
+# per window: one update pass grouped by parent (headless), one slot change per mesh, one chunked save,
+# manifest update, then release
+def persist(ctx, items):
+    window_size = ctx.config['window_size'] if ctx.config['batch_mode'] else 1
+    window = []
+    for item in items:
+        window.append(item)
+        if len(window) >= window_size:
+            for done in _flush_window(ctx, window):
+                yield done
+            window = []
+    if window:
+        for done in _flush_window(ctx, window):
+            yield done
+
+
+def _flush_window(ctx, window):
+    if ctx.config['headless_batch']:
+        insts_by_parent = {}
+        for item in window:
+            material_batch.add_to_parent_group(insts_by_parent, item.inst, item.parent)
+        material_batch.update_instances_by_parent(insts_by_parent)
+    meshes = {}
+    slots_by_mesh = {}
+    for item in window:
+        if item.mesh != None:
+            meshes[item.mesh_path] = item.mesh
+            slots_by_mesh.setdefault(item.mesh_path, {})[item.mesh_slot] = item.inst
+    for mesh_path, slot_materials in sorted(slots_by_mesh.items()):
+        mesh_material_reassign.assign_slots(meshes[mesh_path], slot_materials)
+    to_save = [item.inst for item in window] + [meshes[mesh_path] for mesh_path in sorted(meshes)]
+    saved = batch_save.save_assets_chunked(to_save, ctx.config['save_chunk_size'])
+    if saved == len(to_save):
+        ctx.counts['saved'] += len(window)
+        for item in window:
+            ctx.manifest.update(item.inst_path, item.set_digest)
+    else:
+        unreal.log_warning('not every asset in window saved,  manifest not updated for it (sets rebuild next run)')
+        ctx.counts['failed'] += len(window)
+    ctx.manifest.save() # also kept when not incremental, so a later incremental run starts from it
+    for item in window:
+        item.release()
+    if ctx.config['collect_garbage']:
+        unreal.SystemLibrary.collect_garbage()
+    return window
+
+
+DEFAULT_STAGES = [resolve_sets, create_instances, bind_parameters, assign_to_mesh, persist]
+
+
+# chain stages on top of discover (or the given records),  nothing runs until the result is iterated
+def run_stages(ctx, stages=None, records=None):
+    stream = discover(ctx) if records == None else iter(records)
+    for stage in (DEFAULT_STAGES if stages == None else stages):
+        stream = stage(ctx, stream)
+    return stream
+
+
+# editor side of a connector_planner plan:  make directories, then create/bind/assign/persist the planned instances
+def apply_plan(plan, config=None, stages=None):
+    ctx = ConnectorRun(config)
+    for folder in plan.get('make_directories', []):
+        if not unreal.EditorAssetLibrary.does_directory_exist(folder):
+            unreal.EditorAssetLibrary.make_directory(folder)
+    meshes_by_inst = dict((mesh['inst_path'], mesh) for mesh in plan.get('meshes', []))
+    items = []
+    for entry in plan['instances']:
+        ctx.counts['sets'] += 1
+        if ctx.config['incremental'] and entry['unchanged']:
+            ctx.counts['skipped'] += 1
+            continue
+        item = ConnectorItem(entry)
+        if entry['inst_path'] in meshes_by_inst:
+            item.mesh_path = meshes_by_inst[entry['inst_path']]['mesh_path']
+            item.mesh_slot = meshes_by_inst[entry['inst_path']]['slot']
+        items.append(item)
+    stages = [create_instances, bind_parameters, assign_to_mesh, persist] if stages == None else stages
+    for item in run_stages(ctx, stages, items):
+        unreal.log('done:  ' + item.inst_path)
+    return ctx
+
+
+def run(config=None, stages=None):
+    ctx = ConnectorRun(config)
+    for item in run_stages(ctx, stages):
+        unreal.log('done:  ' + item.inst_path)
+    return ctx
@@ -0,0 +1,166 @@
+# planning phase of the connector,  plain python with no unreal import.
+# takes an asset listing (asset_query.export_listing() json,  or any list of asset_listing.AssetRecord)
+# and works out every instance to create, the parameters to bind and the meshes to patch.
+# only connector_pipeline.apply_plan() needs the editor.
+#   python connector_planner.py listing.json --out plan.json
+#   python connector_planner.py listing.json --mode meshes --manifest mat_instance_manifest.json
+import argparse
+import json
+import sys
+import time
+
+import bulk_classifier
+import content_manifest
+import texture_schema
+from asset_listing import load_listing
+from asset_naming import make_object_path, normalize_object_path, sibling_folder, strip_prefix
+
+# texture sets found from their base color texture,  instance next to the textures (mat_instance_connector_simple.py)
+DEFAULT_PLAN_CONFIG = texture_schema.plan_config('pbr')
+
+# one instance per static mesh,  <base>/Meshes/S_name -> <base>/Materials/MI_name with <base>/Textures/T_name_* (automate_material_creation.py)
+MESH_PLAN_CONFIG = texture_schema.plan_config('cave_masks')
+
+
+def _config(defaults, config):
+    merged = dict(defaults)
+    merged.update(config or {})
+    return merged
+
+
+# one instance entry of a plan (json friendly).
+# tex_paths: {suffix: texture object path} of the textures that exist for this set.
+# config 'texture_redirects' {duplicate texture path: canonical path} (texture_redirects.py) binds the canonical
+# texture instead of a duplicate,  members keep the set's own paths
+def plan_instance(base_name, folder, tex_paths, config, existing_paths=(), manifest_entries=None):
+    texture_params = config['texture_params']
+    parent_path = normalize_object_path(config['parent_material'])
+    inst_name = config['instance_name'].format(base=base_name)
+    inst_path = make_object_path(folder, inst_name)
+    redirects = config.get('texture_redirects') or {}
+    bound = dict((suffix, redirects.get(path, path)) for suffix, path in tex_paths.items())
+
+    scalars = dict(config.get('scalar_values', {}))
+    for suffix, suffix_scalars in config.get('scalar_params', {}).items():
+        if suffix in tex_paths:
+            scalars.update(suffix_scalars)
+    set_digest = content_manifest.set_hash(bound, parent_path, scalars)
+    exists = inst_path in existing_paths
+    return {
+        'missing': [suffix for suffix in config.get('required_suffixes', []) if suffix not in tex_paths],
+        'inst_name': inst_name,
+        'inst_path': inst_path,
+        'folder': folder.rstrip('/') + '/',
+        'parent': parent_path,
+        'members': dict(tex_paths),
+        'textures': dict((texture_params[suffix], path) for suffix, path in bound.items() if suffix in texture_params),
+        'linear_textures': sorted(set(path for suffix, path in bound.items() if suffix in config.get('linear_suffixes', []))),
+        'scalars': scalars,
+        'set_digest': set_digest,
+        'exists': exists,
+        'unchanged': bool(exists and manifest_entries and manifest_entries.get(inst_path) == set_digest),
+    }
+
+
+def _new_plan(mode):
+    return {'mode': mode, 'instances': [], 'meshes': [], 'make_directories': [], 'orphans': [], 'skipped': []}
+
+
+def _skip_incomplete(plan, entry, path):
+    plan['skipped'].append({'path': path, 'reason': 'missing required ' + ', '.join(entry['missing'])})
+
+
+# one instance per texture set that has a base texture,  textures without one are reported as orphans
+# and sets without every required map are skipped
+def plan_texture_sets(records, config=None, manifest_entries=None):
+    config = _config(DEFAULT_PLAN_CONFIG, config)
+    base_suffix = config['base_suffix']
+    existing_paths = set(record.object_path for record in records)
+    plan = _new_plan('sets')
+    classified = bulk_classifier.classify_sets(records, list(config['texture_params']), base_suffix)
+    plan['orphans'] = classified['orphans']
+    for folder, sets in sorted(classified['sets'].items()):
+        for base_name, tex_paths in sorted(sets.items()):
+            base_name = strip_prefix(base_name, config.get('texture_prefix'))
+            entry = plan_instance(base_name, folder, tex_paths, config, existing_paths, manifest_entries)
+            if entry['missing']:
+                _skip_incomplete(plan, entry, tex_paths[base_suffix])
+                continue
+            plan['instances'].append(entry)
+    return plan
+
+
+# one instance per mesh in a '<base>/Meshes' folder,  textures looked up by name in '<base>/Textures'
+def plan_mesh_materials(records, config=None, manifest_entries=None):
+    config = _config(MESH_PLAN_CONFIG, config)
+    existing_paths = set(record.object_path for record in records)
+    existing_folders = set(record.package_path.rstrip('/') + '/' for record in records)
+    plan = _new_plan('meshes')
+    for record in sorted(records, key=lambda r: r.object_path):
+        if record.class_name not in config['mesh_classes']:
+            continue
+        mtl_folder = sibling_folder(record.package_path, config['mesh_folder'], config['material_folder'])
+        if mtl_folder == None:
+            plan['skipped'].append({'path': record.object_path, 'reason': 'not in a ' + config['mesh_folder'] + ' folder'})
+            continue
+        tex_folder = sibling_folder(record.package_path, config['mesh_folder'], config['texture_folder'])
+        base_name = strip_prefix(record.asset_name, config['mesh_prefix'])
+        tex_paths = {}
+        for suffix in config['texture_params']:
+            tex_path = make_object_path(tex_folder, config['texture_prefix'] + base_name + suffix)
+            if tex_path in existing_paths:
+                tex_paths[suffix] = tex_path
+        entry = plan_instance(base_name, mtl_folder, tex_paths, config, existing_paths, manifest_entries)
+        if entry['missing']:
+            _skip_incomplete(plan, entry, record.object_path)
+            continue
+        plan['instances'].append(entry)
+        plan['meshes'].append({'mesh_path': record.object_path, 'slot': config['mesh_slot'], 'inst_path': entry['inst_path']})
+        if mtl_folder not in existing_folders and mtl_folder not in plan['make_directories']:
+            plan['make_directories'].append(mtl_folder)
+    return plan
+
+
+def summary(plan):
+    instances = plan['instances']
+    unchanged = len([entry for entry in instances if entry['unchanged']])
+    existing = len([entry for entry in instances if entry['exists']])
+    return (str(len(instances)) + ' instances (' + str(len(instances) - existing) + ' new, ' + str(existing - unchanged)
+            + ' changed, ' + str(unchanged) + ' unchanged),  ' + str(len(plan['meshes'])) + ' meshes,  '
+            + str(len(plan['orphans'])) + ' orphan textures,  ' + str(len(plan['skipped'])) + ' skipped')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='plan material instances from an asset listing, no editor needed')
+    parser.add_argument('listing', help='json listing from asset_query.export_listing()')
+    parser.add_argument('--mode', choices=['sets', 'meshes'], default='sets')
+    parser.add_argument('--schema', help='texture_schemas.json entry,  default pbr for sets and cave_masks for meshes')
+    parser.add_argument('--config', help='json file with plan config overrides')
+    parser.add_argument('--manifest', help='content manifest of the last run, marks unchanged sets')
+    parser.add_argument('--redirect-plan', help='texture_redirects.py plan,  duplicates are bound as their canonical texture')
+    parser.add_argument('--out', help='write the plan here (json)')
+    args = parser.parse_args(argv)
+
+    config = texture_schema.plan_config(args.schema) if args.schema else {}
+    if args.config:
+        with open(args.config, 'r') as f:
+            config.update(json.load(f))
+    if args.redirect_plan:
+        with open(args.redirect_plan, 'r') as f:
+            config['texture_redirects'] = json.load(f)['redirects']
+    manifest_entries = content_manifest.ContentManifest(args.manifest).entries if args.manifest else None
+
+    start = time.time()
+    records = load_listing(args.listing)
+    planner = plan_mesh_materials if args.mode == 'meshes' else plan_texture_sets
+    plan = planner(records, config, manifest_entries)
+    print(summary(plan) + '  (' + str(len(records)) + ' assets in ' + str(int((time.time() - start) * 1000)) + ' ms)')
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(plan, f, indent=1, sort_keys=True)
+    return plan
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,85 @@
+# contact sheets from preview tiles:  a grid of images with their labels, split into pages.
+# Pillow does the tiling when it is installed (not in the editor's python by default),  otherwise an html
+# page with the same grid is written next to the tiles.  plain python, no unreal import.
+#   pages = contact_sheet.make_sheets([('M_rock_inst', 'cache/ab12.png'), ...], 'review/rock_sheet.png')
+import html
+import os
+
+try:
+    from PIL import Image, ImageDraw
+except ImportError:
+    Image = None
+
+COLUMNS = 8
+TILE_SIZE = 256
+LABEL_HEIGHT = 20
+TILES_PER_PAGE = 64
+BACKGROUND = (32, 32, 32)
+MISSING = (96, 0, 0)     # tile that did not render
+
+
+def _pages(tiles, per_page):
+    return [tiles[start:start + per_page] for start in range(0, len(tiles), per_page)] or [[]]
+
+
+def _page_path(out_path, page, page_count):
+    if page_count == 1:
+        return out_path
+    root, extension = os.path.splitext(out_path)
+    return root + '_' + str(page + 1).zfill(len(str(page_count))) + extension
+
+
+def _sheet_image(tiles, columns, tile_size):
+    rows = max(1, (len(tiles) + columns - 1) // columns)
+    sheet = Image.new('RGB', (columns * tile_size, rows * (tile_size + LABEL_HEIGHT)), BACKGROUND)
+    draw = ImageDraw.Draw(sheet)
+    for n, (label, image_path) in enumerate(tiles):
+        x = (n % columns) * tile_size
+        y = (n // columns) * (tile_size + LABEL_HEIGHT)
+        if image_path != None and os.path.isfile(image_path):
+            with Image.open(image_path) as tile:
+                tile = tile.convert('RGB')
+                tile.thumbnail((tile_size, tile_size))
+                sheet.paste(tile, (x + (tile_size - tile.width) // 2, y + (tile_size - tile.height) // 2))
+        else:
+            draw.rectangle([x, y, x + tile_size - 1, y + tile_size - 1], fill=MISSING)
+        draw.text((x + 4, y + tile_size + 4), label[:tile_size // 6], fill=(220, 220, 220))
+    return sheet
+
+
+def _sheet_html(tiles, columns, tile_size, out_path):
+    folder = os.path.dirname(os.path.abspath(out_path))
+    lines = ['<html><body style="background:#202020;color:#dcdcdc;font-family:sans-serif">',
+             '<table cellspacing="4">']
+    for start in range(0, len(tiles), columns):
+        lines.append('<tr>')
+        for label, image_path in tiles[start:start + columns]:
+            if image_path != None and os.path.isfile(image_path):
+                src = os.path.relpath(os.path.abspath(image_path), folder).replace(os.sep, '/')
+                image = '<img src="' + html.escape(src) + '" width="' + str(tile_size) + '">'
+            else:
+                image = '<div style="width:' + str(tile_size) + 'px;height:' + str(tile_size) + 'px;background:#600000"></div>'
+            lines.append('<td>' + image + '<br>' + html.escape(label) + '</td>')
+        lines.append('</tr>')
+    lines.append('</table></body></html>')
+    with open(out_path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+# tiles: [(label, image path or None)].  returns the written page paths (.html instead of the image without Pillow)
+def make_sheets(tiles, out_path, columns=COLUMNS, tile_size=TILE_SIZE, tiles_per_page=TILES_PER_PAGE):
+    folder = os.path.dirname(out_path)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+    if Image == None:
+        out_path = os.path.splitext(out_path)[0] + '.html'
+    pages = _pages(list(tiles), tiles_per_page)
+    written = []
+    for page, page_tiles in enumerate(pages):
+        page_path = _page_path(out_path, page, len(pages))
+        if Image == None:
+            _sheet_html(page_tiles, columns, tile_size, page_path)
+        else:
+            _sheet_image(page_tiles, columns, tile_size).save(page_path)
+        written.append(page_path)
+    return written
@@ -0,0 +1,61 @@
+# manifest of texture sets a connector run has built,  so reruns only rebuild sets that changed.
+# json file:  {instance object path: hash of the set's member texture paths, parent material and parameter values}
+# (no unreal import here, manifests can be read and merged outside the editor)
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 1
+
+
+# stable hash of everything that ends up in a material instance
+def set_hash(member_paths, parent_path, params):
+    data = {'members': dict(member_paths), 'parent': str(parent_path), 'params': dict(params)}
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class ContentManifest(object):
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {} # instance object path -> set hash
+        self.changed = False
+        self.load()
+
+    def load(self):
+        self.entries = {}
+        if os.path.isfile(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+            except ValueError:
+                print('content_manifest: unreadable manifest, rebuilding everything  ' + self.path)
+                return
+            if data.get('version') == MANIFEST_VERSION:
+                self.entries = data.get('entries', {})
+
+    def is_current(self, key, digest):
+        return self.entries.get(key) == digest
+
+    def update(self, key, digest):
+        if self.entries.get(key) != digest:
+            self.entries[key] = digest
+            self.changed = True
+
+    def remove(self, key):
+        if self.entries.pop(key, None) != None:
+            self.changed = True
+
+    # write to a temp file first so a crash mid write never leaves a broken manifest
+    def save(self):
+        if not self.changed:
+            return False
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'entries': self.entries}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.changed = False
+        return True
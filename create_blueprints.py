@@ -0,0 +1,45 @@
+# create numbered blueprint assets:  name0, name1 ... in one folder,  saved in chunks (bulk_asset_factory.py)
+#   py path/to/create_blueprints.py 100 ASteamingBlueprint
+#   (or run_job.py blueprints --count 100 --name ASteamingBlueprint)
+# several editors can fill one folder without clashing:  worker k of K uses start=k, step=K
+import os
+import sys
+import unreal
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__))) # so modules next to this script import from the unreal console
+import batch_save
+import bulk_asset_factory
+import run_stats
+
+BLUEPRINT_PATH = '/Game/Blueprints'
+PARENT_CLASS = 'Character'
+
+
+# name is a prefix the number is added to ('BP_Load' -> BP_Load0) or a template ('BP_Load_{n:05d}').
+# parent_class is an unreal class or its name ('Character', 'Actor'...),  default_properties go on the class defaults.
+# returns the bulk_asset_factory report
+def create_blueprints(count, name, folder=BLUEPRINT_PATH, parent_class=PARENT_CLASS, chunk_size=batch_save.DEFAULT_CHUNK_SIZE,
+                      start=0, step=1, default_properties=None):
+    if isinstance(parent_class, str):
+        parent_class = getattr(unreal, parent_class)
+    spec = {
+        'factory': 'BlueprintFactory',
+        'factory_properties': {'ParentClass': parent_class},
+        'folder': folder,
+        'name': name if '{' in name else name + '{n}',
+        'count': count,
+        'start': start,
+        'step': step,
+        'default_properties': default_properties or {},
+        'chunk_size': chunk_size,
+    }
+    report = bulk_asset_factory.create_assets(spec)
+    for line in bulk_asset_factory.format_report(report):
+        unreal.log('create_blueprints: ' + line)
+    return report
+
+
+if __name__ == '__main__':
+    run_stats.new_run()
+    create_blueprints(int(sys.argv[1]), str(sys.argv[2]))
+    print(run_stats.end_run())
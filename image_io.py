@@ -0,0 +1,291 @@
+# read source images (tga, png, exr) in bands of rows so a 4k/8k texture never has to be in memory at once.
+#   header = image_io.read_header('T_rock_BaseColor.tga')     # {'format', 'width', 'height', 'channels', 'bits', 'float', ...}
+#   for top, band in image_io.iter_bands('T_rock_BaseColor.tga'):
+#       ...    # band is a numpy array (rows, width, channels) in r, g, b, a order,  its first row is image row `top`
+# headers are parsed in plain python.  bands need numpy:
+#   tga   uncompressed files are memory mapped,  rle files are decoded a band at a time
+#   png   decoded by Pillow (whole image,  png can not be read a band at a time without it)
+#   exr   read a band of scan lines at a time through the OpenEXR module
+# create_tga() writes the other way:  a memory mapped uncompressed tga filled a band at a time.
+# bands of a bottom-up tga come bottom band first,  place them by `top` rather than by order.
+# plain python, no unreal import.
+import os
+import struct
+
+try:
+    import numpy
+except ImportError: # not in the editor's python by default
+    numpy = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    import OpenEXR
+    import Imath
+except ImportError:
+    OpenEXR = None
+
+BAND_ROWS = 256
+EXTENSIONS = {'.tga': 'tga', '.png': 'png', '.exr': 'exr'}
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_CHANNELS = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4} # colour type -> channels (palette is expanded to rgb)
+EXR_MAGIC = 20000630
+EXR_CHANNEL_ORDER = ['R', 'G', 'B', 'A']
+TGA_CHANNEL = [2, 1, 0, 3] # r, g, b, a -> position in a tga pixel
+
+
+def image_format(path):
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+# image files under the roots (files are taken as they are),  sorted
+def find_images(roots):
+    paths = []
+    for root in roots:
+        if os.path.isfile(root):
+            paths.append(root)
+            continue
+        for folder, folder_names, file_names in os.walk(root):
+            folder_names.sort()
+            paths.extend(os.path.join(folder, name) for name in sorted(file_names) if image_format(name) != None)
+    return paths
+
+
+def _need_numpy():
+    if numpy == None:
+        raise ImportError('image_io: numpy is needed to read pixels (pip install numpy into the python that runs this)')
+
+
+# ---- headers ----
+
+def _tga_header(f):
+    data = f.read(18)
+    if len(data) < 18:
+        raise ValueError('truncated tga header')
+    (id_length, colormap_type, image_type, colormap_start, colormap_length, colormap_bits,
+     x_origin, y_origin, width, height, pixel_bits, descriptor) = struct.unpack('<BBBHHBHHHHBB', data)
+    if image_type not in (2, 3, 10, 11):
+        raise ValueError('unsupported tga image type ' + str(image_type) + ' (colour mapped or empty)')
+    if pixel_bits not in (8, 24, 32) or (image_type in (3, 11)) != (pixel_bits == 8):
+        raise ValueError('unsupported tga pixel depth ' + str(pixel_bits))
+    if width == 0 or height == 0:
+        raise ValueError('empty tga')
+    return {
+        'format': 'tga',
+        'width': width,
+        'height': height,
+        'channels': pixel_bits // 8,
+        'bits': 8,
+        'float': False,
+        'rle': image_type in (10, 11),
+        'top_down': bool(descriptor & 0x20),
+        'offset': 18 + id_length + colormap_type * colormap_length * ((colormap_bits + 7) // 8),
+    }
+
+
+def _png_header(f):
+    data = f.read(33)
+    if len(data) < 33 or data[:8] != PNG_SIGNATURE or data[12:16] != b'IHDR':
+        raise ValueError('not a png')
+    width, height, bit_depth, colour_type = struct.unpack('>IIBB', data[16:26])
+    if colour_type not in PNG_CHANNELS:
+        raise ValueError('unknown png colour type ' + str(colour_type))
+    if width == 0 or height == 0:
+        raise ValueError('empty png')
+    return {
+        'format': 'png',
+        'width': width,
+        'height': height,
+        'channels': PNG_CHANNELS[colour_type],
+        'bits': 8 if colour_type == 3 else bit_depth,
+        'float': False,
+    }
+
+
+def _read_cstring(f):
+    chars = []
+    while True:
+        char = f.read(1)
+        if not char:
+            raise ValueError('truncated exr header')
+        if char == b'\x00':
+            return b''.join(chars).decode('latin-1')
+        chars.append(char)
+
+
+def _exr_header(f):
+    magic, version = struct.unpack('<iI', f.read(8))
+    if magic != EXR_MAGIC:
+        raise ValueError('not an exr')
+    channels = []
+    window = None
+    while True:
+        name = _read_cstring(f)
+        if not name:
+            break
+        attribute_type = _read_cstring(f)
+        size = struct.unpack('<i', f.read(4))[0]
+        value = f.read(size)
+        if name == 'dataWindow' and attribute_type == 'box2i':
+            window = struct.unpack('<iiii', value)
+        elif name == 'channels' and attribute_type == 'chlist':
+            position = 0
+            while value[position:position + 1] not in (b'\x00', b''):
+                end = value.index(b'\x00', position)
+                pixel_type = struct.unpack('<i', value[end + 1:end + 5])[0]
+                channels.append((value[position:end].decode('latin-1'), pixel_type))
+                position = end + 17 # name \0, pixel type, pLinear + reserved, x/y sampling
+    if window == None or not channels:
+        raise ValueError('exr header without dataWindow or channels')
+    names = [name for name, pixel_type in channels]
+    ordered = [name for name in EXR_CHANNEL_ORDER if name in names] or sorted(names)
+    return {
+        'format': 'exr',
+        'width': window[2] - window[0] + 1,
+        'height': window[3] - window[1] + 1,
+        'channels': len(ordered),
+        'channel_names': ordered,
+        'bits': 32 if any(pixel_type == 2 for name, pixel_type in channels) else 16,
+        'float': True,
+        'y_min': window[1],
+    }
+
+
+HEADER_READERS = {'tga': _tga_header, 'png': _png_header, 'exr': _exr_header}
+
+
+# size and layout from the first bytes of the file,  ValueError for unsupported or broken files
+def read_header(path):
+    kind = image_format(path)
+    if kind == None:
+        raise ValueError('unsupported image type ' + os.path.splitext(path)[1])
+    with open(path, 'rb') as f:
+        try:
+            return HEADER_READERS[kind](f)
+        except struct.error:
+            raise ValueError('truncated ' + kind + ' header')
+
+
+# ---- bands ----
+
+def _tga_swizzle(pixels, channels):
+    # tga stores bgr(a)
+    if channels >= 3:
+        order = [2, 1, 0] + ([3] if channels == 4 else [])
+        return pixels[..., order]
+    return pixels
+
+
+def _tga_bands(path, header, band_rows):
+    width, height, channels = header['width'], header['height'], header['channels']
+    # file rows are bottom up unless the descriptor says otherwise
+    file_bands = [(start, min(band_rows, height - start)) for start in range(0, height, band_rows)]
+
+    def place(file_start, band):
+        if header['top_down']:
+            return file_start, band
+        return height - file_start - band.shape[0], band[::-1]
+
+    if not header['rle']:
+        pixels = numpy.memmap(path, dtype=numpy.uint8, mode='r', offset=header['offset'], shape=(height, width, channels))
+        for file_start, rows in file_bands:
+            band = _tga_swizzle(numpy.asarray(pixels[file_start:file_start + rows]), channels)
+            yield place(file_start, band)
+        del pixels
+        return
+
+    # rle packets can run across rows and bands,  so decode into a band buffer and carry the rest over
+    with open(path, 'rb') as f:
+        f.seek(header['offset'])
+        carry = numpy.empty((0, channels), dtype=numpy.uint8)
+        for file_start, rows in file_bands:
+            wanted = rows * width
+            band = numpy.empty((wanted, channels), dtype=numpy.uint8)
+            filled = min(len(carry), wanted)
+            band[:filled] = carry[:filled]
+            carry = carry[filled:]
+            while filled < wanted:
+                packet = f.read(1)
+                if not packet:
+                    raise ValueError('truncated rle data in ' + path)
+                count = (packet[0] & 0x7f) + 1
+                if packet[0] & 0x80:
+                    pixels = numpy.tile(numpy.frombuffer(f.read(channels), dtype=numpy.uint8), (count, 1))
+                else:
+                    pixels = numpy.frombuffer(f.read(count * channels), dtype=numpy.uint8).reshape(count, channels)
+                used = min(count, wanted - filled)
+                band[filled:filled + used] = pixels[:used]
+                carry = pixels[used:]
+                filled += used
+            yield place(file_start, _tga_swizzle(band.reshape(rows, width, channels), channels))
+
+
+def _png_bands(path, header, band_rows):
+    if Image == None:
+        raise ImportError('image_io: Pillow is needed to read png pixels')
+    with Image.open(path) as image:
+        if image.mode == 'P':
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+        elif image.mode in ('1', 'CMYK', 'YCbCr', 'LAB', 'HSV'):
+            image = image.convert('RGB')
+        pixels = numpy.asarray(image)
+    if pixels.ndim == 2:
+        pixels = pixels[:, :, None]
+    for start in range(0, pixels.shape[0], band_rows):
+        yield start, pixels[start:start + band_rows]
+
+
+def _exr_bands(path, header, band_rows):
+    if OpenEXR == None:
+        raise ImportError('image_io: the OpenEXR module is needed to read exr pixels')
+    exr = OpenEXR.InputFile(path)
+    pixel_type = Imath.PixelType(Imath.PixelType.FLOAT)
+    width, height = header['width'], header['height']
+    try:
+        for start in range(0, height, band_rows):
+            rows = min(band_rows, height - start)
+            first, last = header['y_min'] + start, header['y_min'] + start + rows - 1
+            planes = [numpy.frombuffer(exr.channel(name, pixel_type, first, last), dtype=numpy.float32).reshape(rows, width)
+                      for name in header['channel_names']]
+            yield start, numpy.stack(planes, axis=-1)
+    finally:
+        exr.close()
+
+
+BAND_READERS = {'tga': _tga_bands, 'png': _png_bands, 'exr': _exr_bands}
+
+
+# (first row, band) pairs covering the whole image,  at most band_rows rows each
+def iter_bands(path, band_rows=BAND_ROWS, header=None):
+    _need_numpy()
+    header = header or read_header(path)
+    return BAND_READERS[header['format']](path, header, max(1, int(band_rows)))
+
+
+# band as float32 with 0..1 for the full integer range (float images are left as they are)
+def to_float(band):
+    if band.dtype == numpy.uint8:
+        return band.astype(numpy.float32) / 255.0
+    if band.dtype.kind in 'ui':
+        return band.astype(numpy.float32) / 65535.0 # 16 bit png (Pillow gives 'I' images as int32)
+    return band.astype(numpy.float32, copy=False)
+
+
+# new uncompressed top down tga of width x height,  returned as a writable memory map (height, width, channels)
+# in the file's b, g, r(, a) order (TGA_CHANNEL).  flush() it and let it go when done
+def create_tga(path, width, height, channels):
+    _need_numpy()
+    if channels not in (1, 3, 4):
+        raise ValueError('tga can hold 1, 3 or 4 channels,  not ' + str(channels))
+    if not 0 < width <= 0xffff or not 0 < height <= 0xffff:
+        raise ValueError('tga size is 1 to 65535 pixels a side')
+    descriptor = 0x20 | (8 if channels == 4 else 0) # top down,  alpha bits
+    header = struct.pack('<BBBHHBHHHHBB', 0, 0, 3 if channels == 1 else 2, 0, 0, 0, 0, 0, width, height, channels * 8, descriptor)
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.truncate(len(header) + width * height * channels)
+    return numpy.memmap(path, dtype=numpy.uint8, mode='r+', offset=len(header), shape=(height, width, channels))
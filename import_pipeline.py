@@ -0,0 +1,173 @@
+# drop folder on disk -> imported textures -> material instances,  in one run instead of import, wait, select, connect.
+#   plan      import_planner.plan_import():  texture sets by schema suffixes,  headers checked in a thread pool,
+#             srgb / compression per texture from its schema entry (INSPECT refines it from the pixels,  texture_inspector.py)
+#   import    one import_asset_tasks() call per content folder (AssetImportTask list,  automated, not saved yet),
+#             textures already in the folder are left alone unless replace_existing
+#   settings  srgb / compression set where the import defaults differ (bulk_property_editor),  then one chunked save
+#   connect   the connector for every complete set,  one run per schema,  straight from the imported base textures
+# settings are at the bottom,  or run as a job:  run_job.py import --source C:/drops/orc --folder /Game/drops/orc
+import os
+import sys
+import unreal
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__))) # so modules next to this script import from the unreal console
+import asset_cache
+import batch_save
+import bulk_property_editor
+import connector_pipeline
+import image_io
+import import_planner
+import run_stats
+import texture_color_space
+import texture_inspector
+import texture_schema
+from asset_listing import AssetRecord
+
+
+def _existing_names(folder):
+    registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    with run_stats.timer('list_folder'):
+        return set(str(asset_data.asset_name) for asset_data in registry.get_assets_by_path(folder.rstrip('/'), recursive=False))
+
+
+def _import_task(entry, folder, replace_existing):
+    task = unreal.AssetImportTask()
+    task.set_editor_property('filename', entry['file'])
+    task.set_editor_property('destination_path', folder.rstrip('/'))
+    task.set_editor_property('destination_name', entry['name'])
+    task.set_editor_property('replace_existing', replace_existing)
+    task.set_editor_property('automated', True) # no dialogs
+    task.set_editor_property('save', False)     # saved once,  after the settings are in
+    return task
+
+
+# one batched import per folder,  returns {'imported': [object paths], 'existing': [object paths], 'failed': [files]}
+def import_folders(plan, replace_existing=False, dry_run=False):
+    report = {'imported': [], 'existing': [], 'failed': []}
+    asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+    for folder, entries in sorted(plan['folders'].items()):
+        existing = set() if replace_existing else _existing_names(folder)
+        to_import = []
+        for entry in entries:
+            if entry['name'] in existing:
+                report['existing'].append(entry['object_path'])
+            else:
+                to_import.append(entry)
+        if not to_import:
+            continue
+        if dry_run:
+            report['imported'] += [entry['object_path'] for entry in to_import]
+            continue
+        tasks = [_import_task(entry, folder, replace_existing) for entry in to_import]
+        with run_stats.timer('import_asset_tasks'):
+            asset_tools.import_asset_tasks(tasks)
+        run_stats.count('imports', len(tasks))
+        for entry, task in zip(to_import, tasks):
+            if task.get_editor_property('imported_object_paths'):
+                report['imported'].append(entry['object_path'])
+            else:
+                unreal.log_warning('import_pipeline: could not import ' + entry['file'])
+                report['failed'].append(entry['file'])
+    return report
+
+
+# srgb / compression of the plan on the imported textures,  then every import is saved in chunks.
+# returns (changed, saved)
+def apply_settings(plan, object_paths, chunk_size=batch_save.DEFAULT_CHUNK_SIZE):
+    object_paths = set(object_paths)
+    groups = {}
+    for entries in plan['folders'].values():
+        for entry in entries:
+            if entry['object_path'] in object_paths:
+                groups.setdefault((entry['srgb'], entry['compression_settings']), []).append(entry['object_path'])
+    changed = []
+    assets = []
+    for (srgb, compression), group in sorted(groups.items()):
+        textures = [texture for texture in (asset_cache.load_asset(path) for path in sorted(group)) if texture != None]
+        properties = {'srgb': srgb, 'compression_settings': getattr(unreal.TextureCompressionSettings, compression)}
+        group_changed, skipped = bulk_property_editor.apply_properties(textures, properties)
+        changed += group_changed
+        assets += textures
+    # changed or not,  the import tasks did not save
+    saved = batch_save.save_assets_chunked(assets, chunk_size)
+    return changed, saved
+
+
+# connector runs over the complete sets that were imported (or already there),  one per schema in 'sets' mode.
+# config: connector config overrides for every run.  returns {schema: counts}
+def connect_sets(plan, object_paths, config=None):
+    object_paths = set(object_paths)
+    bases = {}
+    for texture_set in plan['sets']:
+        schema = texture_schema.get_schema(texture_set['schema'])
+        if texture_set['missing'] or schema.get('mode', 'sets') != 'sets':
+            continue
+        base_path = texture_set['textures'][texture_schema.base_suffix(schema)]
+        if base_path in object_paths:
+            bases.setdefault(texture_set['schema'], []).append(base_path)
+    counts = {}
+    for name, base_paths in sorted(bases.items()):
+        run_config = texture_schema.plan_config(name)
+        run_config.update(config or {})
+        ctx = connector_pipeline.ConnectorRun(run_config)
+        records = []
+        for object_path in sorted(base_paths):
+            package_name, asset_name = object_path.rsplit('.', 1)
+            records.append(AssetRecord(object_path, package_name.rsplit('/', 1)[0], asset_name, 'Texture2D'))
+        ctx.counts['records'] += len(records)
+        for item in connector_pipeline.run_stages(ctx, records=records):
+            unreal.log('done:  ' + item.inst_path)
+        counts[name] = ctx.counts
+    return counts
+
+
+@run_stats.timed('import_drop')
+def import_drop(source_root, destination, schema_name=None, workers=import_planner.WORKERS, inspect=False, replace_existing=False,
+                connect=True, connector_config=None, dry_run=False, chunk_size=batch_save.DEFAULT_CHUNK_SIZE):
+    asset_cache.new_run()
+    inspections = None
+    if inspect:
+        with run_stats.timer('inspect_sources'):
+            # threads,  the editor can not start worker processes (see texture_inspector.py)
+            inspections = texture_inspector.inspect_files(image_io.find_images([source_root]), workers,
+                                                          texture_color_space.default_cache_file(), processes=False)
+    with run_stats.timer('plan_import'):
+        plan = import_planner.plan_import(source_root, destination, schema_name, workers, inspections=inspections)
+    report = {'plan': plan, 'changed': [], 'saved': 0, 'connector': {}}
+    report.update(import_folders(plan, replace_existing, dry_run))
+    if dry_run:
+        return report
+    report['changed'], report['saved'] = apply_settings(plan, report['imported'], chunk_size)
+    if connect:
+        report['connector'] = connect_sets(plan, report['imported'] + report['existing'], connector_config)
+    return report
+
+
+def format_report(report, dry_run=False):
+    lines = import_planner.format_report(report['plan'])
+    for path in report['failed']:
+        lines.append('import failed:  ' + path)
+    lines.append(str(len(report['imported'])) + (' to import,  ' if dry_run else ' imported,  ') + str(len(report['existing']))
+                 + ' already there,  ' + str(len(report['changed'])) + ' with srgb / compression changed')
+    for name, counts in sorted(report['connector'].items()):
+        lines.append('connector ' + name + ':  ' + ',  '.join(key + ' ' + str(counts[key]) for key in sorted(counts)))
+    return lines
+
+
+if __name__ == '__main__':
+    SOURCE_ROOT = 'C:/drops/orc'
+    DESTINATION = '/Game/dawnOfWar/assets/orc'
+    # texture_schemas.json entry every set is imported for,  None picks the best fit per set
+    SCHEMA = None
+    # compression from the source pixels (texture_inspector.py,  needs numpy),  the suffixes still decide srgb
+    INSPECT = False
+    REPLACE_EXISTING = False
+    CONNECT = True
+    DRY_RUN = True
+
+    run_stats.new_run()
+    report = import_drop(SOURCE_ROOT, DESTINATION, SCHEMA, inspect=INSPECT, replace_existing=REPLACE_EXISTING,
+                         connect=CONNECT, dry_run=DRY_RUN)
+    for line in format_report(report, DRY_RUN):
+        print(line)
+    print(run_stats.end_run())
@@ -0,0 +1,194 @@
+# planning phase of source file imports,  plain python with no unreal import.
+# scans a drop folder on disk,  sorts the images into texture sets by the schemas' suffix rules
+# (texture_schema.SchemaRegistry,  the same rules the connector uses),  checks every file from its header alone
+# (image_io.read_header in a thread pool:  readable, power of two, channels for the map it is meant to be,  same size
+# across a set) and gives each texture the srgb / compression its schema entry calls for (source pixels,  when
+# inspected,  only pick the compression within that and class files no schema knows,  texture_inspector.resolve).
+# only import_pipeline.py needs the editor:  it imports the plan one folder per AssetImportTask batch and runs the connector.
+#   plan = import_planner.plan_import('C:/drops/orc', '/Game/drops/orc', workers=8)
+#   python import_planner.py C:/drops/orc /Game/drops/orc --out import_plan.json
+import argparse
+import concurrent.futures
+import json
+import os
+import re
+import sys
+import time
+
+import image_io
+import texture_inspector
+import texture_schema
+from asset_naming import make_object_path
+
+PLAN_VERSION = 1
+WORKERS = 8
+IMPORT_DEFAULTS = {'srgb': True, 'compression_settings': 'TC_DEFAULT'}
+ASSET_NAME = re.compile(r'^[A-Za-z0-9_\-]+$') # anything else the editor renames on import,  and the set falls apart
+
+
+def _is_power_of_two(value):
+    return value > 0 and value & (value - 1) == 0
+
+
+# header + problems of one file:  (header or None, [errors], [warnings])
+def check_file(path):
+    name = os.path.splitext(os.path.basename(path))[0]
+    errors = []
+    warnings = []
+    if not ASSET_NAME.match(name):
+        errors.append('name has characters an asset name can not have')
+    try:
+        header = image_io.read_header(path)
+    except (ValueError, OSError) as error:
+        return None, errors + [str(error)], warnings
+    if not (_is_power_of_two(header['width']) and _is_power_of_two(header['height'])):
+        warnings.append(str(header['width']) + 'x' + str(header['height']) + ' is not a power of two,  no mips or streaming')
+    return header, errors, warnings
+
+
+# headers are a few bytes each,  threads keep many slow (network) reads in flight
+def check_files(paths, workers=WORKERS):
+    if workers > 1 and len(paths) > 1:
+        with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+            return dict(zip(paths, pool.map(check_file, paths)))
+    return dict((path, check_file(path)) for path in paths)
+
+
+# 'C:/drops/orc/body' under 'C:/drops/orc' -> '/Game/drops/orc/body/'
+def destination_folder(folder, source_root, destination):
+    relative = os.path.relpath(folder, source_root).replace(os.sep, '/')
+    folder = destination.rstrip('/') if relative == '.' else destination.rstrip('/') + '/' + relative
+    return folder + '/'
+
+
+# srgb and compression_settings name for a texture,  the schema entry's role first (texture_inspector.resolve):
+# the pixels (a texture_inspector result) or else the header only pick the compression within it.
+# returns (settings, note),  note when the pixels disagree with the name.  the editor's import defaults when nothing is sure
+def import_settings(header, texture=None, inspection=None):
+    role = texture_schema.texture_role(texture) if texture != None else None
+    if inspection == None or 'error' in inspection:
+        kind = 'hdr' if header['float'] else ('grayscale' if header['channels'] == 1 else None)
+        inspection = {'kind': kind} if kind != None else None
+    settings, note = texture_inspector.resolve(inspection, role)
+    return settings or dict(IMPORT_DEFAULTS), note
+
+
+# the schema a set is imported for:  the given one,  else the one whose base texture the set has and that misses least
+def _pick_schema(registry, candidates, schema_name):
+    if schema_name != None:
+        return schema_name if schema_name in candidates else None
+    scored = []
+    for name, tex_paths in candidates.items():
+        if texture_schema.base_suffix(registry.schemas[name]) in tex_paths:
+            scored.append((len(registry.missing(name, tex_paths)), -len(tex_paths), name))
+    return min(scored)[2] if scored else None
+
+
+# the import plan (json friendly):
+#   {"version": 1, "source_root", "destination",
+#    "folders": {content folder: [{"file", "name", "object_path", "srgb", "compression_settings", "schema", "suffix", "warnings"}]},
+#    "sets": [{"schema", "folder", "base", "textures": {suffix: object path}, "missing": [suffixes], "warnings"}],
+#    "errors": [[file, reason]]}
+# files that fit no set are still imported,  with settings from their header.  files with errors are left out
+def plan_import(source_root, destination, schema_name=None, workers=WORKERS, schemas=None, inspections=None):
+    registry = texture_schema.SchemaRegistry(schemas)
+    if schema_name != None and schema_name not in registry.schemas:
+        raise ValueError('no texture schema ' + schema_name)
+    paths = image_io.find_images([source_root])
+    checks = check_files(paths, workers)
+
+    plan = {'version': PLAN_VERSION, 'source_root': source_root, 'destination': destination, 'folders': {}, 'sets': [], 'errors': []}
+    entries = {}
+    # (content folder, base name) -> {schema: {suffix: object path}},  _pick_schema chooses one schema per key
+    candidates = {}
+    for path in paths:
+        header, errors, warnings = checks[path]
+        if errors:
+            plan['errors'] += [[path, error] for error in errors]
+            continue
+        name = os.path.splitext(os.path.basename(path))[0]
+        folder = destination_folder(os.path.dirname(path), source_root, destination)
+        object_path = make_object_path(folder, name)
+        if object_path in entries:
+            plan['errors'].append([path, 'same asset name as ' + entries[object_path]['file']])
+            continue
+        entries[object_path] = {'file': path, 'name': name, 'object_path': object_path, 'header': header,
+                                'schema': None, 'suffix': None, 'warnings': warnings}
+        for match_schema, base_name, texture in registry.match(name):
+            candidates.setdefault((folder, base_name), {}).setdefault(match_schema, {})[texture['suffix']] = object_path
+
+    for (folder, base_name), by_schema in sorted(candidates.items()):
+        name = _pick_schema(registry, by_schema, schema_name)
+        if name == None:
+            continue
+        tex_paths = by_schema[name]
+        texture_set = {'schema': name, 'folder': folder, 'base': base_name, 'textures': tex_paths,
+                       'missing': registry.missing(name, tex_paths), 'warnings': []}
+        sizes = set((entries[path]['header']['width'], entries[path]['header']['height']) for path in tex_paths.values())
+        if len(sizes) > 1:
+            texture_set['warnings'].append('maps differ in size: ' + ', '.join(str(w) + 'x' + str(h) for w, h in sorted(sizes)))
+        textures = dict((texture['suffix'], texture) for texture in registry.schemas[name]['textures'])
+        for suffix, object_path in tex_paths.items():
+            entry = entries[object_path]
+            entry['schema'], entry['suffix'] = name, suffix
+            if 'normal' in textures[suffix]['param'].lower() and entry['header']['channels'] < 3:
+                entry['warnings'].append('normal map with ' + str(entry['header']['channels']) + ' channels')
+            entry['texture'] = textures[suffix]
+        plan['sets'].append(texture_set)
+
+    for object_path, entry in sorted(entries.items()):
+        settings, note = import_settings(entry.pop('header'), entry.pop('texture', None), (inspections or {}).get(entry['file']))
+        if note != None:
+            entry['warnings'].append(note)
+        entry.update(settings)
+        plan['folders'].setdefault(object_path.rsplit('/', 1)[0] + '/', []).append(entry)
+    return plan
+
+
+def summary(plan):
+    files = sum(len(entries) for entries in plan['folders'].values())
+    complete = len([texture_set for texture_set in plan['sets'] if not texture_set['missing']])
+    return (str(files) + ' files in ' + str(len(plan['folders'])) + ' folders,  ' + str(complete) + ' complete sets,  '
+            + str(len(plan['sets']) - complete) + ' incomplete,  ' + str(len(plan['errors'])) + ' errors')
+
+
+def format_report(plan):
+    lines = []
+    for path, reason in plan['errors']:
+        lines.append('not imported:  ' + path + '  ' + reason)
+    for texture_set in plan['sets']:
+        if texture_set['missing']:
+            lines.append('incomplete ' + texture_set['schema'] + ' set ' + texture_set['folder'] + texture_set['base']
+                         + ',  missing ' + ', '.join(texture_set['missing']))
+        for warning in texture_set['warnings']:
+            lines.append('set ' + texture_set['folder'] + texture_set['base'] + ':  ' + warning)
+    for folder, entries in sorted(plan['folders'].items()):
+        for entry in entries:
+            for warning in entry['warnings']:
+                lines.append(entry['file'] + ':  ' + warning)
+    lines.append(summary(plan))
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='plan the import of a drop folder of source textures, no editor needed')
+    parser.add_argument('source_root', help='drop folder on disk')
+    parser.add_argument('destination', help='content folder it goes to, e.g. /Game/drops/orc')
+    parser.add_argument('--schema', help='texture_schemas.json entry,  default: the best fit per set')
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    parser.add_argument('--out', help='write the plan here (json)')
+    args = parser.parse_args(argv)
+
+    start = time.time()
+    plan = plan_import(args.source_root, args.destination, args.schema, args.workers)
+    for line in format_report(plan):
+        print(line)
+    print(str(round(time.time() - start, 2)) + ' s')
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(plan, f, indent=1, sort_keys=True)
+    return 1 if plan['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
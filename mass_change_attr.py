@@ -1,14 +1,51 @@
 # mass change attributes of all selected objects in unreal editor
+# current values are read first and only differing ones are written, so assets already set are not dirtied
+# (texture_color_space.py sets srgb from the source images' pixels instead of by hand)
+import os
+import sys
 import unreal 
 
-selectedAssets = unreal.EditorUtilityLibrary().get_selected_assets()
+sys.path.append(os.path.dirname(os.path.abspath(__file__))) # so modules next to this script import from the unreal console
+import asset_query
+import bulk_property_editor
+import run_stats
 
-for i in selectedAssets:
-    print( i.get_fname() )
-    # test changing multiple substance OcclusionRoughnessMetalness sRGB value to 'off'
-    i.set_editor_property('srgb', 0)
-    print('sRGB:  ' + str(i.get_editor_property('srgb')) )
+# property -> value for every selected asset
+# test changing multiple substance OcclusionRoughnessMetalness sRGB value to 'off'
+PROPERTIES = {'srgb': False}
 
-    unreal.log('________________________')
+# only print what would change
+DRY_RUN = False
 
+# 'selection' uses the content browser selection,  'query' picks assets from asset registry data (see asset_query.query_assets)
+ASSET_SOURCE = 'selection'
+QUERY = {
+    'path_globs': ['/Game/dawnOfWar/assets'],
+    'class_names': ['Texture2D'],
+    'name_suffixes': ['_OcclusionRoughnessMetallic'],
+}
+
+# json lines trace of every timed call,  None for just the summary printed at the end
+TRACE_FILE = None
+
+run_stats.new_run(TRACE_FILE)
+
+if ASSET_SOURCE == 'query':
+    selectedAssets = list(asset_query.load_records(asset_query.query_assets(**QUERY)))
+else:
+    selectedAssets = unreal.EditorUtilityLibrary().get_selected_assets()
+
+with run_stats.timer('apply_properties'):
+    changed, skipped = bulk_property_editor.apply_properties(selectedAssets, PROPERTIES, DRY_RUN)
+run_stats.count('assets', len(selectedAssets))
+run_stats.count('changed', len(changed))
+run_stats.count('skipped', len(skipped))
+
+for line in bulk_property_editor.format_report(changed, skipped, DRY_RUN):
+    print(line)
+
+unreal.log('________________________')
+print(str(len(changed)) + ' of ' + str(len(selectedAssets)) + ' assets ' + ('would change' if DRY_RUN else 'changed'))
+
+print(run_stats.end_run())
 print ('DOIN GOOD!')
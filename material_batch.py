@@ -0,0 +1,34 @@
+# consolidated update pass for material instances that were edited without per instance recompiles.
+# set the parent with set_parent_quiet() and parameters as usual, then run update_instances_by_parent()
+# once for the whole batch instead of update_material_instance() inside the loop.
+import unreal
+
+import run_stats
+
+
+# set parent without post edit change (that would recompile the instance right away)
+def set_parent_quiet(inst, parent):
+    inst.set_editor_property('parent', parent, unreal.PropertyAccessChangeNotifyMode.NEVER)
+
+
+def add_to_parent_group(insts_by_parent, inst, parent):
+    insts_by_parent.setdefault(parent.get_path_name(), []).append(inst)
+
+
+# one update per instance after all edits,  grouped by parent so each parent's shaders are worked through together
+def update_instances_by_parent(insts_by_parent):
+    total = sum(len(insts) for insts in insts_by_parent.values())
+    updated = 0
+    with unreal.ScopedSlowTask(total, 'Updating material instances') as slow_task:
+        slow_task.make_dialog(True)
+        for parent_path in sorted(insts_by_parent):
+            for inst in insts_by_parent[parent_path]:
+                if slow_task.should_cancel():
+                    unreal.log_warning('material instance update cancelled, ' + str(total - updated) + ' left')
+                    return updated
+                slow_task.enter_progress_frame(1, 'Updating ' + str(inst.get_fname()))
+                with run_stats.timer('update_material_instance'):
+                    unreal.MaterialEditingLibrary.update_material_instance(inst)
+                updated += 1
+    run_stats.count('updates', updated)
+    return updated
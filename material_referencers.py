@@ -0,0 +1,165 @@
+# replace materials everywhere they are used.
+# the referencer index (referencer_index.py) is built from the asset registry once and cached in Saved/,
+# later runs only query packages whose .uasset/.umap changed.  every referencer is then repointed in bulk:
+#   static meshes        all their slots in one modification each (mesh_material_reassign)
+#   material instances   parent swapped
+#   anything else        (levels, blueprints, skeletal meshes) reported,  or handled by consolidate_assets if CONSOLIDATE
+# settings are at the bottom,  or run as a job:  run_job.py replace_material --path /Game --replace OLD=NEW
+import os
+import sys
+import unreal
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__))) # so modules next to this script import from the unreal console
+import asset_cache
+import asset_query
+import batch_save
+import mesh_material_reassign
+import run_stats
+from asset_naming import normalize_object_path
+from referencer_index import ReferencerIndex
+from texture_set_index import asset_class_name
+
+# classes whose dependencies go into the index
+CANDIDATE_CLASSES = ['StaticMesh', 'SkeletalMesh', 'World', 'Blueprint', 'MaterialInstanceConstant']
+
+
+def default_index_file():
+    return os.path.join(unreal.Paths.project_saved_dir(), 'referencer_index.json')
+
+
+# '/Game/a/b' -> '<project>/Content/a/b.uasset' (.umap for levels),  None outside /Game
+def package_file(package_name, class_name):
+    if not package_name.startswith('/Game/'):
+        return None
+    extension = '.umap' if class_name == 'World' else '.uasset'
+    return os.path.join(unreal.Paths.project_content_dir(), package_name[len('/Game/'):] + extension)
+
+
+def package_stamp(file_path):
+    if file_path == None:
+        return None
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return [stat.st_mtime, stat.st_size]
+
+
+# list the roots once,  query dependencies only for candidate packages that are new or changed on disk
+@run_stats.timed('build_referencer_index')
+def build_index(roots=('/Game',), index_file=None, class_names=CANDIDATE_CLASSES):
+    registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    options = asset_query.dependency_options()
+    index = ReferencerIndex(index_file or default_index_file())
+    seen = []
+    for root in roots:
+        for asset_data in registry.get_assets_by_path(root, recursive=True):
+            class_name = asset_class_name(asset_data)
+            if class_name not in class_names:
+                continue
+            package_name = str(asset_data.package_name)
+            seen.append(package_name)
+            stamp = package_stamp(package_file(package_name, class_name))
+            if index.is_current(package_name, stamp):
+                run_stats.count('index_cached')
+                continue
+            deps = registry.get_dependencies(package_name, options) or []
+            index.update(package_name, class_name, stamp, [str(dep) for dep in deps])
+            run_stats.count('index_queried')
+    index.keep_only(seen, roots)
+    index.save()
+    return index
+
+
+def _package(object_path):
+    return normalize_object_path(object_path).split('.', 1)[0]
+
+
+def _object_path(package_name):
+    return package_name + '.' + package_name.rsplit('/', 1)[-1]
+
+
+# replacements: {old material path: new material path}.
+# returns {'meshes': {mesh path: [(slot, old, new)]}, 'instances': [instance paths], 'other': {old path: [(package, class)]},
+#          'consolidated': [old paths], 'saved': count}
+def replace_materials(index, replacements, consolidate=False, dry_run=False, chunk_size=batch_save.DEFAULT_CHUNK_SIZE):
+    report = {'meshes': {}, 'instances': [], 'other': {}, 'consolidated': [], 'saved': 0}
+    by_path = {}
+    for old_path, new_path in sorted(replacements.items()):
+        old = asset_cache.load_asset(old_path)
+        new = asset_cache.load_asset(new_path)
+        if old == None or new == None:
+            unreal.log_warning('material_referencers: could not load ' + (old_path if old == None else new_path))
+            continue
+        by_path[old.get_path_name()] = (old, new)
+
+    mesh_packages = set()
+    instance_packages = set()
+    for old_path in sorted(by_path):
+        for package_name, class_name in index.referencers(_package(old_path)):
+            if class_name == 'StaticMesh':
+                mesh_packages.add(package_name)
+            elif class_name == 'MaterialInstanceConstant':
+                instance_packages.add(package_name)
+            else:
+                report['other'].setdefault(old_path, []).append((package_name, class_name))
+
+    meshes = [mesh for mesh in (asset_cache.load_asset(_object_path(package)) for package in sorted(mesh_packages)) if mesh != None]
+    mesh_replacements = dict((old_path, new) for old_path, (old, new) in by_path.items())
+    report['meshes'], report['saved'] = mesh_material_reassign.reassign(meshes, replacements=mesh_replacements,
+                                                                        dry_run=dry_run, chunk_size=chunk_size)
+
+    changed_instances = []
+    for package_name in sorted(instance_packages):
+        inst = asset_cache.load_asset(_object_path(package_name))
+        if inst == None:
+            continue
+        parent = inst.get_editor_property('parent')
+        if parent == None or parent.get_path_name() not in by_path:
+            continue
+        report['instances'].append(inst.get_path_name())
+        if not dry_run:
+            unreal.MaterialEditingLibrary.set_material_instance_parent(inst, by_path[parent.get_path_name()][1])
+            changed_instances.append(inst)
+    report['saved'] += batch_save.save_assets_chunked(changed_instances, chunk_size)
+
+    # consolidate_assets replaces every remaining reference and removes the old material,  only for matching classes
+    if consolidate and not dry_run:
+        for old_path in sorted(report['other']):
+            old, new = by_path[old_path]
+            if old.get_class().get_name() != new.get_class().get_name():
+                unreal.log_warning('material_referencers: can not consolidate ' + old_path + ' into a different class, repoint its referencers by hand')
+                continue
+            if unreal.EditorAssetLibrary.consolidate_assets(new, [old]):
+                report['consolidated'].append(old_path)
+    return report
+
+
+def format_report(report, dry_run=False):
+    lines = mesh_material_reassign.format_report(report['meshes'], dry_run)
+    for inst_path in report['instances']:
+        lines.append(('would reparent:  ' if dry_run else 'reparented:  ') + inst_path)
+    for old_path, referencers in sorted(report['other'].items()):
+        done = old_path in report['consolidated']
+        for package_name, class_name in referencers:
+            lines.append(('consolidated:  ' if done else 'not repointed:  ') + package_name + ' (' + class_name + ')  uses ' + old_path)
+    return lines
+
+
+if __name__ == '__main__':
+    # old material -> its replacement
+    REPLACEMENTS = {
+        '/Game/dawnOfWar/assets/orc/materials/orc/test/orc_loincloth_mat_blinn_dup': '/Game/Test_Mat_Output/orc_loincloth_mat_inst',
+    }
+    ROOTS = ['/Game']
+    DRY_RUN = True
+    # also replace references in levels/blueprints with consolidate_assets (deletes the old material)
+    CONSOLIDATE = False
+
+    run_stats.new_run()
+    asset_cache.new_run()
+    index = build_index(ROOTS)
+    report = replace_materials(index, REPLACEMENTS, CONSOLIDATE, DRY_RUN)
+    for line in format_report(report, DRY_RUN):
+        print(line)
+    print(run_stats.end_run())
@@ -0,0 +1,127 @@
+# put materials on mesh slots in bulk.
+# every mesh's slots are read once into a slot name / material name -> index map, so slots are found by
+# name instead of guessed indices, and all changes to one mesh go in with a single static_materials write
+# (one post edit change and rebuild per mesh,  set_material() rebuilds once per slot).
+#   report = mesh_material_reassign.reassign(meshes, instances, rename_rules=[('_blinn_dup', '_inst')])
+import unreal
+
+import batch_save
+import run_stats
+
+
+class SlotIndex(object):
+    # slots of one mesh:  index by slot name and by the name of the material currently in it
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.materials = list(mesh.get_editor_property('static_materials'))
+        self.by_slot_name = {}
+        self.by_material_name = {}
+        for index, static_material in enumerate(self.materials):
+            self.by_slot_name[str(static_material.get_editor_property('material_slot_name'))] = index
+            material = static_material.get_editor_property('material_interface')
+            if material != None:
+                self.by_material_name.setdefault(str(material.get_fname()), []).append(index)
+
+    # slot index from an index, a slot name or the name of the material in the slot,  None if not found
+    def find(self, slot):
+        if isinstance(slot, int):
+            return slot if 0 <= slot < len(self.materials) else None
+        slot = str(slot)
+        if slot in self.by_slot_name:
+            return self.by_slot_name[slot]
+        indices = self.by_material_name.get(slot)
+        return indices[0] if indices else None
+
+    def material(self, index):
+        return self.materials[index].get_editor_property('material_interface')
+
+
+# 'orc_loincloth_mat_blinn_dup' -> 'orc_loincloth_mat_inst' for rules [('_blinn_dup', '_inst')],  None if no rule fits
+def rename_material(name, rename_rules):
+    for old_suffix, new_suffix in rename_rules:
+        if name.endswith(old_suffix):
+            return name[:-len(old_suffix)] + new_suffix
+    return None
+
+
+# {material name: material} for looking up renamed materials
+def materials_by_name(materials):
+    return dict((str(material.get_fname()), material) for material in materials if material != None)
+
+
+# write the slot changes {index: material} of one mesh in a single modification,  returns False if nothing changed
+def apply_slots(slot_index, changes):
+    changed = False
+    for index, material in changes.items():
+        if slot_index.material(index) != material:
+            slot_index.materials[index].set_editor_property('material_interface', material)
+            changed = True
+    if changed:
+        with run_stats.timer('set_static_materials'):
+            slot_index.mesh.set_editor_property('static_materials', slot_index.materials)
+        run_stats.count('mesh_modifications')
+    return changed
+
+
+# {slot (index, slot name or current material name): material} onto one mesh.
+# returns [(index, old material name, new material name)] of the slots that changed
+def assign_slots(mesh, slot_materials, dry_run=False):
+    slot_index = SlotIndex(mesh)
+    changes = {}
+    for slot, material in slot_materials.items():
+        index = slot_index.find(slot)
+        if index == None:
+            unreal.log_warning('mesh_material_reassign: ' + mesh.get_name() + ' has no slot ' + str(slot))
+            continue
+        changes[index] = material
+    report = [(index, _name(slot_index.material(index)), _name(material)) for index, material in sorted(changes.items())
+              if slot_index.material(index) != material]
+    if not dry_run:
+        apply_slots(slot_index, changes)
+    return report
+
+
+def _name(material):
+    return str(material.get_fname()) if material != None else 'None'
+
+
+# every slot of every mesh whose material renames (rename_rules) to one of materials,  or whose
+# slot name, material name or material path is a key of replacements.  meshes that changed are saved in chunks.
+# returns ({mesh path: [(index, old material name, new material name)]}, saved count)
+def reassign(meshes, materials=None, rename_rules=None, replacements=None, dry_run=False, save=True,
+             chunk_size=batch_save.DEFAULT_CHUNK_SIZE):
+    by_name = materials if isinstance(materials, dict) else materials_by_name(materials or [])
+    replacements = replacements or {}
+    report = {}
+    changed_meshes = []
+    for mesh in meshes:
+        slot_index = SlotIndex(mesh)
+        changes = {}
+        for index in range(len(slot_index.materials)):
+            old = slot_index.material(index)
+            old_name = _name(old)
+            slot_name = str(slot_index.materials[index].get_editor_property('material_slot_name'))
+            new = replacements.get(slot_name, replacements.get(old_name))
+            if new == None and old != None:
+                new = replacements.get(old.get_path_name())
+            if new == None and rename_rules:
+                new = by_name.get(rename_material(old_name, rename_rules))
+            if new != None and new != old:
+                changes[index] = new
+        if not changes:
+            continue
+        report[mesh.get_path_name()] = [(index, _name(slot_index.material(index)), _name(new)) for index, new in sorted(changes.items())]
+        if not dry_run and apply_slots(slot_index, changes):
+            changed_meshes.append(mesh)
+    saved = batch_save.save_assets_chunked(changed_meshes, chunk_size) if save and changed_meshes else 0
+    return report, saved
+
+
+def format_report(report, dry_run=False):
+    lines = []
+    for mesh_path, changes in sorted(report.items()):
+        lines.append(('would change:  ' if dry_run else 'changed:  ') + mesh_path)
+        for index, old_name, new_name in changes:
+            lines.append('    slot ' + str(index) + ':  ' + old_name + ' -> ' + new_name)
+    return lines
@@ -0,0 +1,145 @@
+# preview tiles of material instances,  rendered in batch and put on contact sheets for review.
+# each instance is put on a preview actor (sphere, shader ball...) in the open level and shot from a preview camera
+# through screenshot_queue,  so the editor keeps ticking while the batch renders.
+# tiles are cached on disk under the instance's name and a hash of its parent and effective parameter values,
+# so re-reviewing a folder only renders the instances that changed since the last sheet.
+# the preview actor gets its own material back once the batch is rendered.
+#   lookdev level with a mesh actor PREVIEW_ACTOR_LABEL and a camera actor CAMERA_LABEL,  settings at the bottom
+import hashlib
+import json
+import os
+import shutil
+import sys
+import unreal
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__))) # so modules next to this script import from the unreal console
+import asset_cache
+import asset_query
+import contact_sheet
+import run_stats
+import screenshot_queue
+
+RESOLUTION = (512, 512)
+
+
+def default_cache_dir():
+    return os.path.join(unreal.Paths.project_saved_dir(), 'PreviewCache')
+
+
+def _parameters(material):
+    lib = unreal.MaterialEditingLibrary
+    textures = {}
+    for name in lib.get_texture_parameter_names(material):
+        texture = lib.get_material_instance_texture_parameter_value(material, name)
+        textures[str(name)] = texture.get_path_name() if texture != None else None
+    scalars = dict((str(name), round(float(lib.get_material_instance_scalar_parameter_value(material, name)), 6))
+                   for name in lib.get_scalar_parameter_names(material))
+    vectors = dict((str(name), str(lib.get_material_instance_vector_parameter_value(material, name)))
+                   for name in lib.get_vector_parameter_names(material))
+    return {'textures': textures, 'scalars': scalars, 'vectors': vectors}
+
+
+# stable hash of what the preview shows:  parent chain and effective parameter values, plus the render size
+def parameter_hash(inst, resolution=RESOLUTION):
+    parent = inst.get_editor_property('parent')
+    data = _parameters(inst)
+    data['parent'] = parent.get_path_name() if parent != None else None
+    if parent != None and parent.get_class().get_name() == 'MaterialInstanceConstant':
+        data['parent_hash'] = parameter_hash(parent, resolution)
+    data['resolution'] = list(resolution)
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _find_actor(label):
+    for actor in unreal.get_editor_subsystem(unreal.EditorActorSubsystem).get_all_level_actors():
+        if actor.get_actor_label() == label:
+            return actor
+    raise ValueError('no actor labelled ' + label + ' in the open level')
+
+
+class PreviewBatch(object):
+    # cache lookup, render of the missing tiles, and the contact sheets once they are in
+
+    def __init__(self, instances, preview_actor_label, camera_label, sheet_path, resolution=RESOLUTION, cache_dir=None,
+                 slot=0, on_done=None):
+        self.instances = instances
+        self.preview_actor = _find_actor(preview_actor_label)
+        self.camera = _find_actor(camera_label)
+        self.sheet_path = sheet_path
+        self.resolution = tuple(resolution)
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.slot = slot
+        self.on_done = on_done
+        self.tiles = []     # (label, cache path)
+        self.to_render = {} # inst path -> cache path
+        self.pages = []
+
+    # the name keeps instances with the same parameters apart (each gets its own shot and tile)
+    def tile_path(self, inst_name, digest):
+        return os.path.join(self.cache_dir, inst_name + '_' + digest + '.png')
+
+    # cached tiles are reused,  the rest go to the screenshot queue.  returns the queue (already started) or None
+    def start(self):
+        shots = []
+        for inst in self.instances:
+            with run_stats.timer('parameter_hash'):
+                digest = parameter_hash(inst, self.resolution)
+            inst_name = str(inst.get_fname())
+            path = self.tile_path(inst_name, digest)
+            self.tiles.append((inst_name, path))
+            if os.path.isfile(path):
+                run_stats.count('tiles_cached')
+                continue
+            self.to_render[inst.get_path_name()] = path
+            shots.append({'camera': self.camera, 'variant': inst.get_path_name(), 'res_x': self.resolution[0],
+                          'res_y': self.resolution[1], 'filename': 'preview_' + inst_name + '_' + digest + '.png'})
+        if not shots:
+            self._finish(None)
+            return None
+        component = self.preview_actor.get_component_by_class(unreal.StaticMeshComponent)
+        apply_variant = lambda inst_path: component.set_material(self.slot, asset_cache.load_asset(inst_path))
+        manifest_file = os.path.join(self.cache_dir, 'last_render.json')
+        restore = screenshot_queue.material_restore(self.preview_actor, self.slot)
+        return screenshot_queue.ScreenshotQueue(shots, apply_variant, manifest_file=manifest_file, on_done=self._finish,
+                                                restore=restore).start()
+
+    # move finished shots into the cache and lay out the sheets
+    def _finish(self, queue):
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        for shot in (queue.done if queue != None else []):
+            if shot['status'] == 'done' and os.path.isfile(shot['file']):
+                shutil.move(shot['file'], self.to_render[shot['variant']])
+                run_stats.count('tiles_rendered')
+            else:
+                unreal.log_warning('preview_contact_sheet: no preview for ' + shot['variant'])
+        with run_stats.timer('contact_sheet'):
+            self.pages = contact_sheet.make_sheets(self.tiles, self.sheet_path)
+        if self.on_done != None:
+            self.on_done(self)
+
+
+if __name__ == '__main__':
+    # material instances to review:  'selection' or 'query'
+    ASSET_SOURCE = 'selection'
+    QUERY = {
+        'path_globs': ['/Game/dawnOfWar/assets'],
+        'class_names': ['MaterialInstanceConstant'],
+    }
+    PREVIEW_ACTOR_LABEL = 'PreviewSphere'
+    CAMERA_LABEL = 'PreviewCamera'
+    SHEET_PATH = os.path.join(unreal.Paths.project_saved_dir(), 'PreviewSheets', 'contact_sheet.png')
+
+    def report(batch):
+        unreal.log('preview_contact_sheet: ' + str(len(batch.tiles)) + ' tiles (' + str(len(batch.to_render)) + ' rendered)  '
+                   + ', '.join(batch.pages))
+        unreal.log(run_stats.end_run())
+
+    run_stats.new_run()
+    asset_cache.new_run()
+    if ASSET_SOURCE == 'query':
+        instances = list(asset_query.load_records(asset_query.query_assets(**QUERY)))
+    else:
+        instances = [asset for asset in unreal.EditorUtilityLibrary().get_selected_assets()
+                     if asset.get_class().get_name() == 'MaterialInstanceConstant']
+    PreviewBatch(instances, PREVIEW_ACTOR_LABEL, CAMERA_LABEL, SHEET_PATH, on_done=report).start()
@@ -0,0 +1,87 @@
+# reverse dependency index:  package -> packages that reference it (meshes, levels, blueprints, instances...).
+# built from every candidate package's dependency list once, so looking up the referencers of many
+# materials is a dict lookup each instead of one registry query per material.
+# cached in json with each package's file time and size,  only packages whose file changed are queried again.
+# plain python with no unreal import (material_referencers.py fills it from the asset registry).
+import json
+import os
+
+INDEX_VERSION = 1
+
+
+class ReferencerIndex(object):
+
+    def __init__(self, path=None):
+        self.path = path
+        self.packages = {} # package name -> {'class': class name, 'stamp': [mtime, size] or None, 'deps': [package names]}
+        self.changed = False
+        self._reverse = None
+        if path:
+            self.load()
+
+    def load(self):
+        self.packages = {}
+        if self.path and os.path.isfile(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+            except ValueError:
+                print('referencer_index: unreadable cache, rebuilding  ' + self.path)
+                return
+            if data.get('version') == INDEX_VERSION:
+                self.packages = data.get('packages', {})
+        self._reverse = None
+
+    # write to a temp file first so a crash mid write never leaves a broken cache
+    def save(self):
+        if not self.changed or not self.path:
+            return False
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': INDEX_VERSION, 'packages': self.packages}, f, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.changed = False
+        return True
+
+    # cached dependencies are only good if the package file has not changed (no stamp: never trusted)
+    def is_current(self, package_name, stamp):
+        entry = self.packages.get(package_name)
+        return entry != None and stamp != None and entry['stamp'] == list(stamp)
+
+    def update(self, package_name, class_name, stamp, deps):
+        self.packages[package_name] = {'class': class_name, 'stamp': list(stamp) if stamp != None else None, 'deps': sorted(deps)}
+        self.changed = True
+        self._reverse = None
+
+    # drop packages under roots that are gone or no longer candidates (all packages if no roots)
+    def keep_only(self, package_names, roots=None):
+        package_names = set(package_names)
+        roots = tuple(root.rstrip('/') + '/' for root in roots) if roots else None
+        for package_name in [name for name in self.packages if name not in package_names and (roots == None or name.startswith(roots))]:
+            del self.packages[package_name]
+            self.changed = True
+        self._reverse = None
+
+    def reverse(self):
+        if self._reverse == None:
+            self._reverse = {}
+            for package_name, entry in self.packages.items():
+                for dep in entry['deps']:
+                    self._reverse.setdefault(dep, []).append(package_name)
+        return self._reverse
+
+    # [(referencer package, class name)] of a package,  optionally only some classes
+    def referencers(self, package_name, class_names=None):
+        found = []
+        for referencer in sorted(self.reverse().get(package_name, [])):
+            class_name = self.packages[referencer]['class']
+            if class_names == None or class_name in class_names:
+                found.append((referencer, class_name))
+        return found
+
+    # {package: [(referencer, class name)]} for many packages at once
+    def impact(self, package_names, class_names=None):
+        return dict((package_name, self.referencers(package_name, class_names)) for package_name in package_names)
@@ -0,0 +1,340 @@
+# one entry point for the tools as jobs,  from the editor console or headless (no editor ui, no viewport):
+#   UnrealEditor-Cmd.exe MyGame.uproject -run=pythonscript -script="C:/tools/run_job.py connector --path /Game/dawnOfWar/assets"
+#   UnrealEditor-Cmd.exe MyGame.uproject -run=pythonscript -script="C:/tools/run_job.py --job-file C:/tools/nightly.json"
+#   py C:/tools/run_job.py mass_change_attr --path /Game/dawnOfWar --suffix _OcclusionRoughnessMetallic --set srgb=false --dry-run
+#
+# jobs:
+#   connector          material instances for texture sets (connector_pipeline.run)
+#   apply_plan         material instances from a connector_planner.py plan file (connector_pipeline.apply_plan)
+#   mass_change_attr   set properties on every matching asset, changed assets are saved in chunks
+#   blueprints         numbered blueprint assets (create_blueprints.py),  --start/--step split the numbers between workers
+#   replace_material   repoint every referencer of old materials under --path (material_referencers.py)
+#   texture_color_space  srgb (and --compression) from each texture's source image (texture_color_space.py)
+#   dedup_textures     redirect plan for textures with duplicated source images,  --consolidate applies it (texture_redirects.py)
+#   export_listing     asset listing json for offline tools,  --budget adds the texture tags and dependencies texture_budget.py needs
+#   import             source images from a drop folder (--source) into --folder,  then the connector on the sets (import_pipeline.py)
+#
+# a job file is json,  one job or {"jobs": [...]} run in order.  keys are the long option names:
+#   {"jobs": [{"job": "connector", "path": ["/Game/dawnOfWar/assets"], "window_size": 1000},
+#             {"job": "mass_change_attr", "path": ["/Game/dawnOfWar"], "suffix": ["_masks"], "set": {"srgb": false}}]}
+# options given on the command line override the same key in every job of the file.
+# headless there is no content browser selection,  so asset jobs always query the asset registry.
+import argparse
+import json
+import os
+import sys
+import unreal
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__))) # so modules next to this script import from the unreal console
+import asset_cache
+import asset_query
+import batch_save
+import bulk_property_editor
+import connector_pipeline
+import create_blueprints
+import import_pipeline
+import import_planner
+import material_referencers
+import run_stats
+import texture_budget
+import texture_color_space
+import texture_redirects
+import texture_schema
+
+JOBS = ['connector', 'apply_plan', 'mass_change_attr', 'blueprints', 'replace_material', 'texture_color_space', 'dedup_textures', 'export_listing', 'import']
+
+# asset_query.query_assets() filters for a job that does not give any
+DEFAULT_FILTERS = {
+    'connector': {'class_names': ['Texture2D']},   # plus the schema's base texture suffix
+    'mass_change_attr': {'class_names': ['Texture2D'], 'name_suffixes': ['_OcclusionRoughnessMetallic']},
+    'texture_color_space': {'class_names': ['Texture2D']},
+    'dedup_textures': {'class_names': ['Texture2D']},
+}
+
+
+def _parser():
+    parser = argparse.ArgumentParser(prog='run_job.py', description='run an automation tool as a job')
+    parser.add_argument('job', nargs='?', choices=JOBS)
+    parser.add_argument('--job-file', help='json job file,  one job or {"jobs": [...]}')
+    # filters (asset_query.query_assets)
+    parser.add_argument('--path', action='append', help='content folder or folder glob,  repeat for more')
+    parser.add_argument('--exclude', action='append', help='folder glob to leave out')
+    parser.add_argument('--class', dest='class_name', action='append', help='asset class, e.g. Texture2D')
+    parser.add_argument('--suffix', action='append', help='asset name suffix')
+    parser.add_argument('--prefix', action='append', help='asset name prefix')
+    parser.add_argument('--tag', action='append', help='asset registry tag=value (or just tag)')
+    parser.add_argument('--no-recursive', dest='recursive', action='store_false', default=None)
+    # batch sizes
+    parser.add_argument('--save-chunk-size', type=int, help='assets per save call')
+    parser.add_argument('--window-size', type=int, help='connector instances held before update + save')
+    # connector
+    parser.add_argument('--schema', help='texture_schemas.json entry,  default pbr (import: the best fit per set)')
+    parser.add_argument('--parent-material')
+    parser.add_argument('--plan', help='apply_plan: plan json from connector_planner.py')
+    parser.add_argument('--full', dest='incremental', action='store_false', default=None, help='rebuild sets the manifest says are unchanged')
+    parser.add_argument('--manifest-file')
+    parser.add_argument('--collect-garbage', action='store_true', default=None)
+    parser.add_argument('--redirect-plan', help='texture_redirects.py plan:  connector binds canonical textures,  dedup_textures writes it')
+    # mass_change_attr
+    parser.add_argument('--set', action='append', help='property=value,  value is json (false, 0.5, "text") or an enum like TextureCompressionSettings.TC_MASKS.  blueprints: class defaults')
+    parser.add_argument('--dry-run', action='store_true', default=None)
+    # blueprints
+    parser.add_argument('--count', type=int)
+    parser.add_argument('--name')
+    parser.add_argument('--folder', help='blueprints: where they go,  import: content folder the drop goes to')
+    parser.add_argument('--parent-class', help='unreal class name, e.g. Character')
+    parser.add_argument('--start', type=int, help='first number,  worker k of K: --start k --step K')
+    parser.add_argument('--step', type=int)
+    # replace_material
+    parser.add_argument('--replace', action='append', help='old material path=new material path')
+    parser.add_argument('--consolidate', action='store_true', default=None, help='consolidate_assets for levels/blueprints (deletes the old material),  dedup_textures: the duplicates')
+    parser.add_argument('--index-file', help='referencer index cache,  default Saved/referencer_index.json')
+    # texture_color_space
+    parser.add_argument('--compression', dest='set_compression', action='store_true', default=None, help='set compression_settings too')
+    parser.add_argument('--workers', type=int, help='processes reading source images (threads in the editor)')
+    parser.add_argument('--inspection-cache', help='default Saved/texture_inspection.json')
+    # dedup_textures
+    parser.add_argument('--near', action='store_true', default=None, help='also sources that look the same,  reported but only replaced with --confirm-near')
+    parser.add_argument('--confirm-near', action='append', help='canonical texture path whose near duplicates may be replaced,  repeat for more')
+    parser.add_argument('--hash-cache', help='default Saved/texture_hashes.json')
+    # export_listing
+    parser.add_argument('--listing-file', help='where to write the listing')
+    parser.add_argument('--budget', action='store_true', default=None, help='texture tags and dependencies for texture_budget.py')
+    # import
+    parser.add_argument('--source', help='drop folder on disk')
+    parser.add_argument('--inspect', action='store_true', default=None, help='compression from the source pixels,  the suffixes still decide srgb')
+    parser.add_argument('--replace-existing', action='store_true', default=None, help='reimport textures already in the folder')
+    parser.add_argument('--no-connect', dest='connect', action='store_false', default=None, help='import only')
+    # output
+    parser.add_argument('--trace-file', help='json lines trace of every timed call')
+    return parser
+
+
+# 'false' -> False,  '0.5' -> 0.5,  'TextureCompressionSettings.TC_MASKS' -> unreal enum value,  anything else stays a string
+def parse_value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    enum_name, _, value_name = text.rpartition('.')
+    enum_class = getattr(unreal, enum_name.replace('unreal.', '', 1), None) if enum_name else None
+    if enum_class != None and hasattr(enum_class, value_name):
+        return getattr(enum_class, value_name)
+    return text
+
+
+def _pairs(items):
+    pairs = {}
+    for item in items or []:
+        name, sep, value = item.partition('=')
+        pairs[name] = parse_value(value) if sep else None
+    return pairs
+
+
+# job dicts from the file, the command line, or both (command line wins)
+def load_jobs(args):
+    jobs = [{}]
+    if args.job_file:
+        with open(args.job_file, 'r') as f:
+            data = json.load(f)
+        jobs = data['jobs'] if 'jobs' in data else [data]
+    overrides = dict((name, value) for name, value in vars(args).items() if value != None and name != 'job_file')
+    if 'set' in overrides:
+        overrides['set'] = _pairs(overrides['set'])
+    if 'tag' in overrides:
+        overrides['tag'] = _pairs(overrides['tag'])
+    if 'replace' in overrides:
+        overrides['replace'] = dict(item.split('=', 1) for item in overrides['replace'])
+    merged = []
+    for job in jobs:
+        job = dict(job)
+        job.update(overrides)
+        if job.get('job') not in JOBS:
+            raise ValueError('unknown job: ' + str(job.get('job')) + ',  one of ' + ', '.join(JOBS))
+        merged.append(job)
+    return merged
+
+
+def _as_list(value):
+    return [value] if isinstance(value, str) else value
+
+
+def job_query(job):
+    if not job.get('path'):
+        raise ValueError(job['job'] + ' needs at least one --path')
+    query = dict(DEFAULT_FILTERS.get(job['job'], {}))
+    query['path_globs'] = _as_list(job['path'])
+    for key, query_key in [('class_name', 'class_names'), ('suffix', 'name_suffixes'), ('prefix', 'name_prefixes'),
+                           ('exclude', 'exclude_globs')]:
+        if job.get(key):
+            query[query_key] = _as_list(job[key])
+    if job.get('tag'):
+        query['tags'] = job['tag']
+    if job.get('recursive') != None:
+        query['recursive'] = job['recursive']
+    return query
+
+
+def _connector_config(job):
+    config = texture_schema.plan_config(job.get('schema') or 'pbr')
+    for key in ['parent_material', 'save_chunk_size', 'window_size', 'incremental', 'manifest_file', 'collect_garbage']:
+        if job.get(key) != None:
+            config[key] = job[key]
+    if job.get('redirect_plan'):
+        config['texture_redirects'] = texture_redirects.load_redirects(job['redirect_plan'])
+    return config
+
+
+def run_connector(job):
+    config = _connector_config(job)
+    config['asset_source'] = 'query'
+    config['query'] = job_query(job)
+    config['query'].setdefault('name_suffixes', [config['base_suffix']])
+    return connector_pipeline.run(config).counts
+
+
+def run_apply_plan(job):
+    if not job.get('plan'):
+        raise ValueError('apply_plan needs --plan')
+    with open(job['plan'], 'r') as f:
+        plan = json.load(f)
+    return connector_pipeline.apply_plan(plan, _connector_config(job)).counts
+
+
+def run_mass_change_attr(job):
+    properties = job.get('set')
+    if not properties:
+        raise ValueError('mass_change_attr needs at least one --set property=value')
+    asset_cache.new_run()
+    assets = list(asset_query.load_records(asset_query.query_assets(**job_query(job))))
+    dry_run = bool(job.get('dry_run'))
+    with run_stats.timer('apply_properties'):
+        changed, skipped = bulk_property_editor.apply_properties(assets, properties, dry_run)
+    for line in bulk_property_editor.format_report(changed, skipped, dry_run):
+        unreal.log(line)
+    saved = 0
+    if not dry_run:
+        changed_paths = set(asset_path for asset_path, changes in changed)
+        to_save = [asset for asset in assets if asset.get_path_name() in changed_paths]
+        saved = batch_save.save_assets_chunked(to_save, job.get('save_chunk_size') or batch_save.DEFAULT_CHUNK_SIZE)
+    return {'assets': len(assets), 'changed': len(changed), 'skipped': len(skipped), 'saved': saved}
+
+
+def run_blueprints(job):
+    if not job.get('count') or not job.get('name'):
+        raise ValueError('blueprints needs --count and --name')
+    report = create_blueprints.create_blueprints(
+        job['count'], job['name'], job.get('folder') or create_blueprints.BLUEPRINT_PATH,
+        job.get('parent_class') or create_blueprints.PARENT_CLASS, job.get('save_chunk_size') or batch_save.DEFAULT_CHUNK_SIZE,
+        job.get('start') or 0, job.get('step') or 1, job.get('set'))
+    return {'created': report['created'], 'skipped': report['skipped'], 'failed': report['failed'], 'saved': report['saved'],
+            'assets_per_second': report['assets_per_second']}
+
+
+def run_replace_material(job):
+    if not job.get('replace') or not job.get('path'):
+        raise ValueError('replace_material needs --path and at least one --replace old=new')
+    asset_cache.new_run()
+    index = material_referencers.build_index(_as_list(job['path']), job.get('index_file'))
+    dry_run = bool(job.get('dry_run'))
+    report = material_referencers.replace_materials(index, job['replace'], bool(job.get('consolidate')), dry_run,
+                                                    job.get('save_chunk_size') or batch_save.DEFAULT_CHUNK_SIZE)
+    for line in material_referencers.format_report(report, dry_run):
+        unreal.log(line)
+    return {'meshes': len(report['meshes']), 'instances': len(report['instances']), 'consolidated': len(report['consolidated']),
+            'not_repointed': sum(len(refs) for old_path, refs in report['other'].items() if old_path not in report['consolidated']),
+            'saved': report['saved']}
+
+
+def run_texture_color_space(job):
+    asset_cache.new_run()
+    textures = list(asset_query.load_records(asset_query.query_assets(**job_query(job))))
+    dry_run = bool(job.get('dry_run'))
+    report = texture_color_space.apply_color_space(textures, bool(job.get('set_compression')), dry_run,
+                                                   job.get('workers') or texture_color_space.WORKERS, job.get('inspection_cache'),
+                                                   job.get('save_chunk_size') or batch_save.DEFAULT_CHUNK_SIZE)
+    for line in texture_color_space.format_report(report, dry_run):
+        unreal.log(line)
+    return {'textures': len(textures), 'changed': len(report['changed']), 'no_source': len(report['no_source']),
+            'errors': len(report['errors']), 'conflicts': len(report['conflicts']), 'left_alone': len(report['left_alone']),
+            'saved': report['saved']}
+
+
+def run_dedup_textures(job):
+    if not job.get('redirect_plan'):
+        raise ValueError('dedup_textures needs --redirect-plan to write the plan to')
+    asset_cache.new_run()
+    textures = list(asset_query.load_records(asset_query.query_assets(**job_query(job))))
+    plan = texture_redirects.build_redirects(textures, job.get('workers') or texture_redirects.WORKERS, job.get('hash_cache'),
+                                             bool(job.get('near')), _as_list(job.get('confirm_near') or []))
+    texture_redirects.save_plan(plan, job['redirect_plan'])
+    dry_run = not job.get('consolidate') or bool(job.get('dry_run'))
+    consolidated = texture_redirects.apply_redirects(plan, dry_run)
+    for line in texture_redirects.format_report(plan, consolidated, dry_run):
+        unreal.log(line)
+    return {'textures': len(textures), 'groups': len(plan['groups']), 'duplicates': len(texture_redirects.plan_redirects(plan)),
+            'no_source': len(plan['no_source']), 'consolidated': 0 if dry_run else len(consolidated)}
+
+
+def run_export_listing(job):
+    if not job.get('listing_file'):
+        raise ValueError('export_listing needs --listing-file')
+    query = job_query(job)
+    if job.get('budget'):
+        count = asset_query.export_listing(query.pop('path_globs'), job['listing_file'], texture_budget.TEXTURE_TAGS, True, **query)
+    else:
+        count = asset_query.export_listing(query.pop('path_globs'), job['listing_file'], **query)
+    return {'assets': count}
+
+
+def run_import(job):
+    if not job.get('source') or not job.get('folder'):
+        raise ValueError('import needs --source and --folder')
+    connector_config = {}
+    for key in ['parent_material', 'save_chunk_size', 'window_size', 'incremental', 'manifest_file', 'collect_garbage']:
+        if job.get(key) != None:
+            connector_config[key] = job[key]
+    dry_run = bool(job.get('dry_run'))
+    report = import_pipeline.import_drop(job['source'], job['folder'], job.get('schema'), job.get('workers') or import_planner.WORKERS,
+                                         bool(job.get('inspect')), bool(job.get('replace_existing')), job.get('connect') != False,
+                                         connector_config, dry_run, job.get('save_chunk_size') or batch_save.DEFAULT_CHUNK_SIZE)
+    for line in import_pipeline.format_report(report, dry_run):
+        unreal.log(line)
+    return {'imported': len(report['imported']), 'existing': len(report['existing']), 'failed': len(report['failed']),
+            'errors': len(report['plan']['errors']), 'sets': len(report['plan']['sets']), 'saved': report['saved'],
+            'instances': sum(counts['saved'] for counts in report['connector'].values())}
+
+
+RUNNERS = {
+    'connector': run_connector,
+    'apply_plan': run_apply_plan,
+    'mass_change_attr': run_mass_change_attr,
+    'blueprints': run_blueprints,
+    'replace_material': run_replace_material,
+    'texture_color_space': run_texture_color_space,
+    'dedup_textures': run_dedup_textures,
+    'export_listing': run_export_listing,
+    'import': run_import,
+}
+
+
+# runs every job,  returns [(job name, counts or None if it failed)].  a failed job is logged and the next one still runs
+def main(argv=None):
+    args = _parser().parse_args(argv)
+    results = []
+    for job in load_jobs(args):
+        run_stats.new_run(job.get('trace_file'))
+        unreal.log('run_job: ' + json.dumps(job, sort_keys=True, default=str))
+        try:
+            counts = RUNNERS[job['job']](job)
+        except Exception as error:
+            unreal.log_error('run_job: ' + job['job'] + ' failed:  ' + str(error))
+            counts = None
+        unreal.log('run_job: ' + job['job'] + (' done  ' + json.dumps(counts, sort_keys=True) if counts != None else ' FAILED'))
+        unreal.log(run_stats.end_run())
+        results.append((job['job'], counts))
+    return results
+
+
+if __name__ == '__main__':
+    sys.exit(1 if any(counts == None for _, counts in main(sys.argv[1:])) else 0)
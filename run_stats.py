@@ -0,0 +1,115 @@
+# lightweight timing and counters for the automation scripts,  to see where a slow run spends its time.
+#   run_stats.new_run('C:/temp/connector_trace.jsonl')   # trace file optional,  one json object per line
+#   with run_stats.timer('create_asset'): ...
+#   @run_stats.timed('save')
+#   run_stats.count('loads')
+#   print(run_stats.report())
+# no unreal import,  works the same outside the editor.
+import collections
+import contextlib
+import functools
+import json
+import time
+
+
+class RunStats(object):
+
+    def __init__(self):
+        self.timings = {}  # name -> [calls, total seconds, max seconds]
+        self.counters = collections.Counter()
+        self.trace = None
+        self.started = time.time()
+
+    def reset(self):
+        self.timings = {}
+        self.counters = collections.Counter()
+        self.started = time.time()
+
+    def start_trace(self, file_path):
+        self.stop_trace()
+        self.trace = open(file_path, 'a')
+
+    def stop_trace(self):
+        if self.trace != None:
+            self.trace.close()
+            self.trace = None
+
+    def write_trace(self, event, name, **fields):
+        if self.trace == None:
+            return
+        fields.update({'t': round(time.time(), 6), 'event': event, 'name': name})
+        self.trace.write(json.dumps(fields, sort_keys=True) + '\n')
+
+    def add_time(self, name, seconds):
+        timing = self.timings.setdefault(name, [0, 0.0, 0.0])
+        timing[0] += 1
+        timing[1] += seconds
+        timing[2] = max(timing[2], seconds)
+        self.write_trace('time', name, seconds=round(seconds, 6))
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def timed(self, name=None):
+        def decorator(func):
+            timer_name = name or func.__name__
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(timer_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def report(self):
+        lines = ['run stats  (' + str(round(time.time() - self.started, 3)) + ' s wall)']
+        for name, (calls, total, longest) in sorted(self.timings.items(), key=lambda item: -item[1][1]):
+            lines.append('  {0:<28} {1:>10.3f} s  {2:>8} calls  {3:>9.2f} ms avg  {4:>9.2f} ms max'.format(
+                name, total, calls, total / calls * 1000.0, longest * 1000.0))
+        for name, amount in sorted(self.counters.items()):
+            lines.append('  {0:<28} {1:>10}'.format(name, amount))
+        self.write_trace('summary', 'run', counters=dict(self.counters),
+                         timings=dict((name, round(timing[1], 6)) for name, timing in self.timings.items()))
+        return '\n'.join(lines)
+
+
+# stats shared by every module in a run
+stats = RunStats()
+
+
+# start of a script run: clear numbers from an earlier run,  optionally append a json lines trace to trace_file
+def new_run(trace_file=None):
+    stats.reset()
+    stats.stop_trace()
+    if trace_file:
+        stats.start_trace(trace_file)
+
+
+def timer(name):
+    return stats.timer(name)
+
+
+def timed(name=None):
+    return stats.timed(name)
+
+
+def count(name, amount=1):
+    stats.count(name, amount)
+
+
+def report():
+    return stats.report()
+
+
+# end of a script run: report (also written to the trace) and close the trace file
+def end_run():
+    text = stats.report()
+    stats.stop_trace()
+    return text
@@ -0,0 +1,187 @@
+# queue of high res screenshots (cameras x resolutions x material variants) taken across editor ticks.
+# a slate post tick callback starts captures and polls them,  so the editor stays responsive during a batch.
+# at most max_in_flight captures run at once (each holds a high res render target),  and the variant is only
+# switched when nothing is in flight,  so a capture never mixes two variants.
+# every finished shot goes into a json manifest (file, camera, variant, resolution, status, seconds).
+#   queue = screenshot_queue.ScreenshotQueue(screenshot_queue.build_shots(cameras, [(1920, 1080)], variants),
+#                                            apply_variant=screenshot_queue.material_variants(actor, materials),
+#                                            restore=screenshot_queue.material_restore(actor))
+#   queue.start()    # returns right away,  on_done(queue) is called after the last shot
+import json
+import os
+import sys
+import time
+import unreal
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__))) # so modules next to this script import from the unreal console
+import run_stats
+
+MAX_IN_FLIGHT = 1
+SETTLE_TICKS = 2        # ticks to wait after a variant switch so materials are compiled/streamed before capturing
+TIMEOUT_TICKS = 600     # a capture not done after this many ticks is given up on
+NAME_FORMAT = '{camera}_{variant}_{res_x}x{res_y}.png'
+
+
+def _label(camera):
+    if camera == None:
+        return 'viewport'
+    return camera.get_actor_label() if hasattr(camera, 'get_actor_label') else str(camera.get_name())
+
+
+# camera actors in the open level,  optionally only the ones with these labels
+def find_cameras(labels=None):
+    actors = unreal.get_editor_subsystem(unreal.EditorActorSubsystem).get_all_level_actors()
+    cameras = [actor for actor in actors if isinstance(actor, unreal.CameraActor)]
+    if labels != None:
+        cameras = [camera for camera in cameras if camera.get_actor_label() in labels]
+    return sorted(cameras, key=_label)
+
+
+# one shot dict per camera x resolution x variant,  grouped by variant so each variant is applied once
+def build_shots(cameras, resolutions, variants=None, name_format=NAME_FORMAT):
+    shots = []
+    for variant in (variants or [None]):
+        for camera in (cameras or [None]):
+            for res_x, res_y in resolutions:
+                shots.append({
+                    'camera': camera,
+                    'variant': variant,
+                    'res_x': res_x,
+                    'res_y': res_y,
+                    'filename': name_format.format(camera=_label(camera), variant=variant or 'default', res_x=res_x, res_y=res_y),
+                })
+    return shots
+
+
+# apply_variant callback that puts {variant name: material} on a static mesh actor's slot
+def material_variants(actor, materials, slot=0):
+    component = actor.get_component_by_class(unreal.StaticMeshComponent)
+
+    def apply_variant(variant):
+        component.set_material(slot, materials[variant])
+    return apply_variant
+
+
+# restore callback that puts the slot's current material back,  for after the last variant
+def material_restore(actor, slot=0):
+    component = actor.get_component_by_class(unreal.StaticMeshComponent)
+    original = component.get_material(slot)
+
+    def restore():
+        component.set_material(slot, original)
+    return restore
+
+
+class ScreenshotQueue(object):
+
+    def __init__(self, shots, apply_variant=None, max_in_flight=MAX_IN_FLIGHT, manifest_file=None, on_done=None,
+                 settle_ticks=SETTLE_TICKS, timeout_ticks=TIMEOUT_TICKS, restore=None):
+        self.pending = list(shots)
+        self.apply_variant = apply_variant
+        self.restore = restore # called once the last shot is in,  puts back what apply_variant changed
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.manifest_file = manifest_file or os.path.join(unreal.Paths.screen_shot_dir(), 'screenshot_manifest.json')
+        self.on_done = on_done
+        self.settle_ticks = settle_ticks
+        self.timeout_ticks = timeout_ticks
+        self.in_flight = [] # (shot, task, start time, start tick)
+        self.done = []      # manifest entries
+        self.variant = None
+        self.variant_applied = False
+        self.wait_ticks = 0
+        self.ticks = 0
+        self.handle = None
+
+    def start(self):
+        if self.handle == None:
+            self.handle = unreal.register_slate_post_tick_callback(self._tick)
+        return self
+
+    def stop(self):
+        if self.handle != None:
+            unreal.unregister_slate_post_tick_callback(self.handle)
+            self.handle = None
+
+    def is_finished(self):
+        return not self.pending and not self.in_flight
+
+    def _tick(self, delta_seconds):
+        self.ticks += 1
+        self._poll()
+        if self.wait_ticks > 0:
+            self.wait_ticks -= 1
+        elif self.pending:
+            self._launch()
+        if self.is_finished():
+            self.stop()
+            if self.restore != None and self.variant_applied:
+                self.restore()
+            self.write_manifest()
+            if self.on_done != None:
+                self.on_done(self)
+
+    def _poll(self):
+        still_running = []
+        for shot, task, start, start_tick in self.in_flight:
+            if task == None or task.is_task_done():
+                self._finish(shot, 'done' if task != None else 'failed', start)
+            elif self.ticks - start_tick > self.timeout_ticks:
+                unreal.log_warning('screenshot_queue: gave up on ' + shot['filename'])
+                self._finish(shot, 'timeout', start)
+            else:
+                still_running.append((shot, task, start, start_tick))
+        self.in_flight = still_running
+
+    def _launch(self):
+        # a new variant only once every capture of the last one is done,  then let it settle
+        if self.pending[0]['variant'] != self.variant or not self.variant_applied:
+            if self.in_flight:
+                return
+            self.variant = self.pending[0]['variant']
+            self.variant_applied = True
+            if self.variant != None and self.apply_variant != None:
+                with run_stats.timer('apply_variant'):
+                    self.apply_variant(self.variant)
+                self.wait_ticks = self.settle_ticks
+                return
+        while self.pending and len(self.in_flight) < self.max_in_flight and self.pending[0]['variant'] == self.variant:
+            shot = self.pending.pop(0)
+            with run_stats.timer('take_high_res_screenshot'): # only the request, the capture finishes on a later tick
+                task = unreal.AutomationLibrary.take_high_res_screenshot(shot['res_x'], shot['res_y'], shot['filename'], shot['camera'])
+            self.in_flight.append((shot, task, time.time(), self.ticks))
+
+    def _finish(self, shot, status, start):
+        run_stats.count('screenshots_' + status)
+        self.done.append({
+            'file': os.path.join(unreal.Paths.screen_shot_dir(), shot['filename']),
+            'camera': _label(shot['camera']),
+            'variant': shot['variant'],
+            'resolution': [shot['res_x'], shot['res_y']],
+            'status': status,
+            'seconds': round(time.time() - start, 3),
+        })
+
+    # write to a temp file first so a crash mid write never leaves a broken manifest
+    def write_manifest(self):
+        folder = os.path.dirname(self.manifest_file)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+        tmp_path = self.manifest_file + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'shots': self.done}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_file)
+        return self.manifest_file
+
+
+if __name__ == '__main__':
+    # every camera actor in the level (or these labels),  at every resolution
+    CAMERA_LABELS = None
+    RESOLUTIONS = [(1920, 1080)]
+    MAX_IN_FLIGHT_CAPTURES = 1
+
+    def report(queue):
+        unreal.log('screenshot_queue: ' + str(len(queue.done)) + ' shots,  manifest ' + queue.manifest_file)
+        unreal.log(run_stats.end_run())
+
+    run_stats.new_run()
+    ScreenshotQueue(build_shots(find_cameras(CAMERA_LABELS), RESOLUTIONS), max_in_flight=MAX_IN_FLIGHT_CAPTURES, on_done=report).start()
@@ -0,0 +1,272 @@
+# split a connector plan across several headless editors.
+# plan instances are grouped by content folder and the folders are spread over the shards,  so no two
+# workers ever write the same folder.  every worker applies its own shard plan (run_job.py apply_plan)
+# into its own manifest,  the coordinator then merges the manifests and logs.
+# plain python with no unreal import,  runs from a normal shell:
+#   python connector_planner.py listing.json --manifest mat_instance_manifest.json --out plan.json
+#   python shard_coordinator.py plan.json --workers 4 --project C:/MyGame/MyGame.uproject --manifest C:/MyGame/mat_instance_manifest.json
+# --command replaces the editor command line (json list),  e.g. the stub worker for local testing:
+#   python shard_coordinator.py plan.json --workers 3 --command "[\"python\", \"bench/stub_worker.py\", \"{plan}\", \"{manifest}\"]"
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import content_manifest
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# {plan} {manifest} {log} {shard} {project} {editor} {run_job} are filled in per worker
+# the editor splits -script on spaces,  so the paths in it are quoted ('C:/Unreal Projects/...')
+EDITOR_COMMAND = ['{editor}', '{project}', '-run=pythonscript',
+                  '-script="{run_job}" apply_plan --plan "{plan}" --manifest-file "{manifest}"',
+                  '-unattended', '-nosplash', '-nullrhi', '-stdout']
+EDITOR = 'UnrealEditor-Cmd.exe'
+
+# run_job.py log line with the job's counts
+DONE_MARKER = 'run_job: apply_plan done  '
+FAILED_MARKER = 'run_job: apply_plan FAILED'
+
+
+# {'errors': [...], 'warnings': [...]}  for things that break when the plan runs in parallel
+#   duplicate instance paths,  mesh slots assigned twice,  parents that are also written by the plan,
+#   meshes whose slots are assigned in more than one shard (both workers would write the mesh): errors
+#   parents shared by instances in different shards: warnings (read only in the workers, must not be edited meanwhile)
+def find_conflicts(plan, shards=None):
+    errors = []
+    warnings = []
+    seen = set()
+    for entry in plan['instances']:
+        if entry['inst_path'] in seen:
+            errors.append('instance planned more than once:  ' + entry['inst_path'])
+        seen.add(entry['inst_path'])
+    for entry in plan['instances']:
+        if entry['parent'] in seen:
+            errors.append('parent material is also written by the plan:  ' + entry['parent'] + '  (parent of ' + entry['inst_path'] + ')')
+    slots_by_mesh = {}
+    for mesh in plan.get('meshes', []):
+        slots = slots_by_mesh.setdefault(mesh['mesh_path'], set())
+        if mesh['slot'] in slots:
+            errors.append('mesh slot assigned more than once:  ' + mesh['mesh_path'] + ' slot ' + str(mesh['slot']))
+        slots.add(mesh['slot'])
+    if shards != None:
+        # by mesh path,  whatever the slot:  every slot change to a mesh has to come from one worker
+        mesh_shards = {}
+        for shard_id, shard in enumerate(shards):
+            for mesh in shard['meshes']:
+                mesh_shards.setdefault(mesh['mesh_path'], {}).setdefault(shard_id, set()).add(mesh['slot'])
+        for mesh_path, slots_by_shard in sorted(mesh_shards.items()):
+            if len(slots_by_shard) > 1:
+                errors.append('mesh slots assigned in more than one shard:  ' + mesh_path + '  ('
+                              + ',  '.join('shard ' + str(shard_id) + ' slot ' + ', '.join(str(slot) for slot in sorted(slots))
+                                           for shard_id, slots in sorted(slots_by_shard.items())) + ')')
+        parent_shards = {}
+        for shard_id, shard in enumerate(shards):
+            for entry in shard['instances']:
+                parent_shards.setdefault(entry['parent'], set()).add(shard_id)
+        for parent, shard_ids in sorted(parent_shards.items()):
+            if len(shard_ids) > 1:
+                warnings.append('parent material shared by shards ' + ', '.join(str(i) for i in sorted(shard_ids))
+                                + ':  ' + parent + '  (do not edit or save it while the workers run)')
+    return {'errors': sorted(set(errors)), 'warnings': warnings}
+
+
+# [shard plan] with whole content folders per shard,  biggest folders first onto the least loaded shard
+def shard_plan(plan, shard_count):
+    by_folder = {}
+    for entry in plan['instances']:
+        by_folder.setdefault(entry['folder'], []).append(entry)
+    meshes_by_inst = dict((mesh['inst_path'], mesh) for mesh in plan.get('meshes', []))
+    make_directories = dict((folder.rstrip('/'), folder) for folder in plan.get('make_directories', []))
+
+    shards = []
+    for shard_id in range(max(1, min(shard_count, len(by_folder)))):
+        shard = dict((key, []) for key in ['instances', 'meshes', 'make_directories', 'orphans', 'skipped'])
+        shard['mode'] = plan.get('mode', 'sets')
+        shard['shard'] = shard_id
+        shard['folders'] = []
+        shards.append(shard)
+    # unchanged sets cost nothing,  balance on the sets that are actually built
+    work = lambda entries: len([entry for entry in entries if not entry['unchanged']])
+    for folder in sorted(by_folder, key=lambda folder: (-work(by_folder[folder]), folder)):
+        shard = min(shards, key=lambda shard: (work(shard['instances']), shard['shard']))
+        shard['folders'].append(folder)
+        shard['instances'].extend(by_folder[folder])
+        shard['meshes'].extend(meshes_by_inst[entry['inst_path']] for entry in by_folder[folder] if entry['inst_path'] in meshes_by_inst)
+        if folder.rstrip('/') in make_directories:
+            shard['make_directories'].append(make_directories[folder.rstrip('/')])
+    return shards
+
+
+def _fill(template, values):
+    return [part.format(**values) for part in template]
+
+
+# starts at most `workers` processes at a time,  returns [{'shard', 'returncode', 'seconds', 'log', 'manifest'}]
+def run_workers(shards, work_dir, command=None, workers=None, values=None, poll_seconds=0.5):
+    command = command or EDITOR_COMMAND
+    workers = workers or len(shards)
+    if not os.path.isdir(work_dir):
+        os.makedirs(work_dir)
+
+    pending = []
+    for shard in shards:
+        shard_dir = os.path.join(work_dir, 'shard_' + str(shard['shard']))
+        if not os.path.isdir(shard_dir):
+            os.makedirs(shard_dir)
+        files = {
+            'plan': os.path.join(shard_dir, 'plan.json'),
+            'manifest': os.path.join(shard_dir, 'manifest.json'),
+            'log': os.path.join(shard_dir, 'worker.log'),
+        }
+        with open(files['plan'], 'w') as f:
+            json.dump(shard, f, indent=1, sort_keys=True)
+        if os.path.isfile(files['manifest']): # left over from an earlier run
+            os.remove(files['manifest'])
+        fill_values = dict(values or {})
+        fill_values.update(files)
+        fill_values['shard'] = shard['shard']
+        fill_values.setdefault('run_job', os.path.join(REPO_DIR, 'run_job.py'))
+        fill_values.setdefault('editor', EDITOR)
+        fill_values.setdefault('project', '')
+        pending.append((shard['shard'], _fill(command, fill_values), files))
+
+    running = []
+    results = []
+    while pending or running:
+        while pending and len(running) < workers:
+            shard_id, args, files = pending.pop(0)
+            log_file = open(files['log'], 'w')
+            print('shard_coordinator: starting shard ' + str(shard_id) + ':  ' + ' '.join(args))
+            process = subprocess.Popen(args, stdout=log_file, stderr=subprocess.STDOUT)
+            running.append((shard_id, process, log_file, files, time.time()))
+        still_running = []
+        for shard_id, process, log_file, files, start in running:
+            if process.poll() == None:
+                still_running.append((shard_id, process, log_file, files, start))
+                continue
+            log_file.close()
+            results.append({'shard': shard_id, 'returncode': process.returncode, 'seconds': round(time.time() - start, 2),
+                            'log': files['log'], 'manifest': files['manifest']})
+            print('shard_coordinator: shard ' + str(shard_id) + ' exited with ' + str(process.returncode))
+        running = still_running
+        if running:
+            time.sleep(poll_seconds)
+    return sorted(results, key=lambda result: result['shard'])
+
+
+# counts from the worker's run_job.py log line,  None if the job did not finish
+def read_worker_counts(log_path):
+    counts = None
+    with open(log_path, 'r', errors='replace') as f:
+        for line in f:
+            if DONE_MARKER in line:
+                counts = json.loads(line.split(DONE_MARKER, 1)[1])
+            elif FAILED_MARKER in line:
+                counts = None
+    return counts
+
+
+# worker manifests into the main one,  returns [conflicting instance paths] (two shards wrote different hashes)
+def merge_manifests(main_manifest, manifest_paths):
+    written = {}
+    conflicts = []
+    for path in manifest_paths:
+        shard_manifest = content_manifest.ContentManifest(path)
+        for key, digest in shard_manifest.entries.items():
+            if key in written and written[key] != digest:
+                conflicts.append(key)
+                continue
+            written[key] = digest
+            main_manifest.update(key, digest)
+    main_manifest.save()
+    return sorted(set(conflicts))
+
+
+# every worker log into one file,  lines prefixed with their shard
+def merge_logs(results, log_path):
+    with open(log_path, 'w') as out:
+        for result in results:
+            if not os.path.isfile(result['log']):
+                continue
+            with open(result['log'], 'r', errors='replace') as f:
+                for line in f:
+                    out.write('[shard ' + str(result['shard']) + '] ' + line)
+
+
+# shard, check, run, merge.  returns a summary dict (also written to <work_dir>/summary.json)
+def coordinate(plan, workers, work_dir, main_manifest_path=None, command=None, values=None, force=False):
+    shards = shard_plan(plan, workers)
+    conflicts = find_conflicts(plan, shards)
+    for warning in conflicts['warnings']:
+        print('shard_coordinator: warning:  ' + warning)
+    for error in conflicts['errors']:
+        print('shard_coordinator: conflict:  ' + error)
+    summary = {'shards': [], 'conflicts': conflicts, 'manifest_conflicts': [], 'totals': {}, 'failed_shards': []}
+    if conflicts['errors'] and not force:
+        print('shard_coordinator: not starting workers,  fix the conflicts or use --force')
+        return summary
+
+    results = run_workers(shards, work_dir, command, workers, values)
+    for result in results:
+        counts = read_worker_counts(result['log'])
+        result['counts'] = counts
+        result['folders'] = len(shards[result['shard']]['folders'])
+        result['instances'] = len(shards[result['shard']]['instances'])
+        if result['returncode'] != 0 or counts == None:
+            summary['failed_shards'].append(result['shard'])
+        for name, value in (counts or {}).items():
+            summary['totals'][name] = summary['totals'].get(name, 0) + value
+        summary['shards'].append(result)
+
+    if main_manifest_path:
+        main_manifest = content_manifest.ContentManifest(main_manifest_path)
+        summary['manifest_conflicts'] = merge_manifests(main_manifest, [result['manifest'] for result in results])
+    merge_logs(results, os.path.join(work_dir, 'workers.log'))
+    with open(os.path.join(work_dir, 'summary.json'), 'w') as f:
+        json.dump(summary, f, indent=1, sort_keys=True)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='run a connector plan on several headless editors')
+    parser.add_argument('plan', help='plan json from connector_planner.py')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--work-dir', default='connector_shards', help='shard plans, worker manifests and logs')
+    parser.add_argument('--manifest', help='main content manifest the worker manifests are merged into')
+    parser.add_argument('--project', default='', help='.uproject for the editor workers')
+    parser.add_argument('--editor', default=EDITOR, help='UnrealEditor-Cmd executable')
+    parser.add_argument('--command', help='worker command line as a json list, default runs the editor')
+    parser.add_argument('--check', action='store_true', help='only shard and report conflicts')
+    parser.add_argument('--force', action='store_true', help='start workers even with conflicts')
+    args = parser.parse_args(argv)
+
+    with open(args.plan, 'r') as f:
+        plan = json.load(f)
+    if args.check:
+        shards = shard_plan(plan, args.workers)
+        for shard in shards:
+            print('shard ' + str(shard['shard']) + ':  ' + str(len(shard['folders'])) + ' folders,  ' + str(len(shard['instances'])) + ' instances')
+        conflicts = find_conflicts(plan, shards)
+        for line in conflicts['errors'] + conflicts['warnings']:
+            print(line)
+        return 1 if conflicts['errors'] else 0
+
+    command = json.loads(args.command) if args.command else None
+    summary = coordinate(plan, args.workers, args.work_dir, args.manifest, command,
+                         {'project': args.project, 'editor': args.editor}, args.force)
+    for result in summary['shards']:
+        print('shard ' + str(result['shard']) + ':  ' + str(result['instances']) + ' instances in ' + str(result['seconds']) + ' s  '
+              + json.dumps(result['counts'], sort_keys=True))
+    print('totals:  ' + json.dumps(summary['totals'], sort_keys=True))
+    for key in summary['manifest_conflicts']:
+        print('manifest conflict:  ' + key)
+    if summary['conflicts']['errors'] and not args.force:
+        return 1
+    return 1 if summary['failed_shards'] or summary['manifest_conflicts'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
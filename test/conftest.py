@@ -0,0 +1,23 @@
+# pytest runs against bench/fake_unreal.py,  no editor needed:  python -m pytest test
+# the older files in test/ are editor scripts (run from the unreal console),  not pytest tests
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'bench'))
+
+import fake_unreal
+fake_unreal.install() # before any tool module does 'import unreal'
+
+import asset_cache
+import pytest
+
+collect_ignore = ['mass_change_attr_test.py', 'mat_instance_connector.py', 'scratch']
+
+
+@pytest.fixture
+def fake(tmp_path):
+    fake_unreal.reset(project_dir=str(tmp_path / 'project'))
+    asset_cache.new_run() # no handles from an earlier test's fake
+    return fake_unreal
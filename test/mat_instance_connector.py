@@ -1,29 +1,38 @@
 #wip; will replace object material with a standard pbr material instance and auto connect textures
+import os
+import sys
 import unreal
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')) # repo root, for shared modules
+import asset_cache
+import batch_save
+import mesh_material_reassign
+
 materialEditingLib = unreal.MaterialEditingLibrary()
 
+asset_cache.new_run()
+
 # IF OcclusionRoughnessMetalness exist in folder, set rgb to 0
 
 #test object
-tst_obj = unreal.load_asset('/Game/dawnOfWar/assets/orc/orc_dup.orc_dup')
+tst_obj = asset_cache.load_asset('/Game/dawnOfWar/assets/orc/orc_dup.orc_dup')
 
 #main pbr mat to be instanced
-main_mat = unreal.load_asset('/Game/dawnOfWar/assets/materials/unreal_pbr_base_mat.unreal_pbr_base_mat')
+main_mat = asset_cache.load_asset('/Game/dawnOfWar/assets/materials/unreal_pbr_base_mat.unreal_pbr_base_mat')
 main_mat_nam = main_mat.get_fname()
 
 #old material to replace with correct name
-old_mat = unreal.load_asset('/Game/dawnOfWar/assets/orc/materials/orc/test/orc_loincloth_mat_blinn_dup.orc_loincloth_mat_blinn_dup')
+old_mat = asset_cache.load_asset('/Game/dawnOfWar/assets/orc/materials/orc/test/orc_loincloth_mat_blinn_dup.orc_loincloth_mat_blinn_dup')
 old_mat_nam = old_mat.get_fname()
 
 # base color texture test material
-bsClr_tex = unreal.load_asset('/Game/dawnOfWar/assets/orc/materials/orc/test/orc_loincloth_BaseColor_dup.orc_loincloth_BaseColor_dup')
+bsClr_tex = asset_cache.load_asset('/Game/dawnOfWar/assets/orc/materials/orc/test/orc_loincloth_BaseColor_dup.orc_loincloth_BaseColor_dup')
 bsClr_tex_nam = bsClr_tex.get_fname()
 # normal texture test material
-nrml_tex = unreal.load_asset('/Game/dawnOfWar/assets/orc/materials/orc/test/orc_loincloth_Normal_dup.orc_loincloth_Normal_dup')
+nrml_tex = asset_cache.load_asset('/Game/dawnOfWar/assets/orc/materials/orc/test/orc_loincloth_Normal_dup.orc_loincloth_Normal_dup')
 nrml_tex_nam = bsClr_tex.get_fname()
 # OcclusionRoughnessMetallic texture test material
-aoRfMet_tex = unreal.load_asset('/Game/dawnOfWar/assets/orc/materials/orc/test/orc_loincloth_OcclusionRoughnessMetallic_dup.orc_loincloth_OcclusionRoughnessMetallic_dup')
+aoRfMet_tex = asset_cache.load_asset('/Game/dawnOfWar/assets/orc/materials/orc/test/orc_loincloth_OcclusionRoughnessMetallic_dup.orc_loincloth_OcclusionRoughnessMetallic_dup')
 aoRfMet_tex_nam = bsClr_tex.get_fname()
 
 
@@ -39,9 +48,6 @@ factory.set_editor_property( 'edit_after_new', 1 )
 assetTools = unreal.AssetToolsHelpers.get_asset_tools()
 myInst = assetTools.create_asset( blueprintName , blueprintPath, None, factory)
 
-#save instance created
-unreal.EditorAssetLibrary.save_loaded_asset(myInst)
-
 myInst_bsClr = 'BaseColor'
 
 #set instance parent to pre-made material
@@ -69,7 +75,14 @@ materialEditingLib.set_material_instance_texture_parameter_value(   myInst,
 # recompile (probably unneeded)
 materialEditingLib.update_material_instance(myInst)
 
-tst_obj.set_material(11, myInst)
+# every slot of the mesh that has the old material gets the instance (found by name, not a guessed slot index),
+# all in one change to the mesh
+report, saved = mesh_material_reassign.reassign([tst_obj], [myInst], rename_rules=[('_blinn_dup', '_inst')], save=False)
+for line in mesh_material_reassign.format_report(report):
+    print(line)
+
+#save instance and object together once everything is set (saving right after create_asset just got dirtied again)
+batch_save.save_assets_chunked([myInst, tst_obj])
 
 
 print('______________________' + '\n' + '______________________')
@@ -1,8 +1,15 @@
+import os
+import sys
 import unreal
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')) # repo root, for shared modules
+import run_stats
+
 blueprintName = 'ASteamingBlueprint2'
 blueprintPath = '/Game/Blueprints'
 
+run_stats.new_run()
+
 
 
 factory = unreal.BlueprintFactory()
@@ -10,9 +17,13 @@ factory = unreal.BlueprintFactory()
 factory.set_editor_property("ParentClass", unreal.PlayerController)
 
 assetTools = unreal.AssetToolsHelpers.get_asset_tools()
-myFile = assetTools.create_asset(blueprintName, blueprintPath, None, factory)
+with run_stats.timer('create_asset'):
+    myFile = assetTools.create_asset(blueprintName, blueprintPath, None, factory)
+
+with run_stats.timer('save'):
+    unreal.EditorAssetLibrary.save_loaded_asset(myFile)
 
-unreal.EditorAssetLibrary.save_loaded_asset(myFile)
+print(run_stats.end_run())
 
 
 
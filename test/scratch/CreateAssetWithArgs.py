@@ -1,24 +1,23 @@
-import unreal
+import os
 import sys
+import unreal
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')) # repo root, for shared modules
+import create_blueprints
+import run_stats
 
-blueprintName = 'ASteamingBlueprint2'
 blueprintPath = '/Game/Blueprints'
 
 createdAssetsCount = int(sys.argv[1])
-createdAssetsName = str(sys.argv[2])
-createdAssetsName += '%d'  #replace value with number later
+createdAssetsName = str(sys.argv[2]) # number is added to the end
 
-factory = unreal.BlueprintFactory()
+run_stats.new_run()
 
-factory.set_editor_property("ParentClass", unreal.Character)
+# names checked against one folder listing, then created and saved a chunk at a time (see bulk_asset_factory.py)
+create_blueprints.create_blueprints(createdAssetsCount, createdAssetsName, blueprintPath, unreal.Character)
 
-assetTools = unreal.AssetToolsHelpers.get_asset_tools()
-
-for x in range(createdAssetsCount):
-    myFile = assetTools.create_asset(createdAssetsName%(x), blueprintPath, None, factory) #(x) is basically a number
-    unreal.EditorAssetLibrary.save_loaded_asset(myFile)
+print(run_stats.end_run())
 
 
 # coat_mat_OcclusionRoughnessMetallic
 # py ....\Unreal Projects\Python\CreateAssetWithArgs.py
-
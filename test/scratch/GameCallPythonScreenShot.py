@@ -1,20 +1,31 @@
+# single blocking shot,  for batches (cameras x resolutions x variants) across editor ticks see screenshot_queue.py
+import os
+import sys
 import unreal
 from datetime import datetime
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')) # repo root, for shared modules
+import run_stats
+
 @unreal.uclass()
 class AutomationLib(unreal.AutomationLibrary):
     pass
 
 dateTimeSuffix = datetime.now().strftime('%d_%m_%Y_%H_%M_%S')
 
-AutomationLib.take_high_res_screenshot( 1280, 
-                                        720, 
-                                        'myFancyPicture_' + dateTimeSuffix + '.png', 
-                                        None, 
-                                        False, 
-                                        False, 
-                                        unreal.ComparisonTolerance.LOW,  #needed unreal at start
-                                        '')
+run_stats.new_run()
+
+with run_stats.timer('take_high_res_screenshot'): # only the request, the capture itself finishes on a later frame
+    AutomationLib.take_high_res_screenshot( 1280, 
+                                            720, 
+                                            'myFancyPicture_' + dateTimeSuffix + '.png', 
+                                            None, 
+                                            False, 
+                                            False, 
+                                            unreal.ComparisonTolerance.LOW,  #needed unreal at start
+                                            '')
+
+print(run_stats.end_run())
 
 # py ....\Unreal Projects\Python\GameCallPythonScreenShot.py
 
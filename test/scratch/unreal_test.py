@@ -18,12 +18,17 @@ for i in mySel:
 '''
 # py Z:\Videos\Unreal Projects\Python\unreal_test.py
 
+import os
+import sys
 import unreal
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')) # repo root, for shared modules
+import asset_cache
 #myVar = '/Game/dawnOfWar/assets/warlock/coat_mat_OcclusionRoughnessMetallic'
 #unreal.log( myVar.get_fname() )
 
 
-myTexture = unreal.load_asset('/Game/dawnOfWar/assets/warlock/coat_mat_OcclusionRoughnessMetallic.coat_mat_OcclusionRoughnessMetallic')
+myTexture = asset_cache.load_asset('/Game/dawnOfWar/assets/warlock/coat_mat_OcclusionRoughnessMetallic.coat_mat_OcclusionRoughnessMetallic')
 #for attribute in dir(myTexture): #lists all exposed attributes
 #    print (attribute)
 
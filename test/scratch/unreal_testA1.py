@@ -1,25 +1,30 @@
+import os
+import sys
 import unreal
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')) # repo root, for shared modules
+import asset_cache
+
 materialEditingLib = unreal.MaterialEditingLibrary()
 
 # IF OcclusionRoughnessMetalness exist in folder, set rgb to 0
 
 #main pbr mat to be instanced
-main_mat = unreal.load_asset('/Game/dawnOfWar/assets/warlock/PBR_mat.PBR_mat')
+main_mat = asset_cache.load_asset('/Game/dawnOfWar/assets/warlock/PBR_mat.PBR_mat')
 main_mat_nam = main_mat.get_fname()
 
 #old material to replace with correct name
-old_mat = unreal.load_asset('/Game/dawnOfWar/assets/warlock/belt_mat.belt_mat')
+old_mat = asset_cache.load_asset('/Game/dawnOfWar/assets/warlock/belt_mat.belt_mat')
 old_mat_nam = old_mat.get_fname()
 
 # base color texture test material
-bsClr_tex = unreal.load_asset('/Game/dawnOfWar/assets/warlock/belt_mat_BaseColor.belt_mat_BaseColor')
+bsClr_tex = asset_cache.load_asset('/Game/dawnOfWar/assets/warlock/belt_mat_BaseColor.belt_mat_BaseColor')
 bsClr_tex_nam = bsClr_tex.get_fname()
 # normal texture test material
-nrml_tex = unreal.load_asset('/Game/dawnOfWar/assets/warlock/belt_mat_Normal.belt_mat_Normal')
+nrml_tex = asset_cache.load_asset('/Game/dawnOfWar/assets/warlock/belt_mat_Normal.belt_mat_Normal')
 nrml_tex_nam = bsClr_tex.get_fname()
 # OcclusionRoughnessMetallic texture test material
-aoRfMet_tex = unreal.load_asset('/Game/dawnOfWar/assets/warlock/belt_mat_OcclusionRoughnessMetallic.belt_mat_OcclusionRoughnessMetallic')
+aoRfMet_tex = asset_cache.load_asset('/Game/dawnOfWar/assets/warlock/belt_mat_OcclusionRoughnessMetallic.belt_mat_OcclusionRoughnessMetallic')
 aoRfMet_tex_nam = bsClr_tex.get_fname()
 
 
@@ -0,0 +1,104 @@
+import asset_query
+import connector_pipeline
+import connector_planner
+import content_manifest
+import texture_schema
+
+PBR = texture_schema.plan_config('pbr')
+FOLDER = '/Game/orc/'
+
+
+def _textures(fake, base_name, suffixes, folder=FOLDER):
+    for suffix in suffixes:
+        fake.add_asset(folder + base_name + suffix + '.' + base_name + suffix, 'Texture2D')
+
+
+def _records(path='/Game/orc'):
+    return asset_query.query_assets([path])
+
+
+def test_complete_set(fake):
+    _textures(fake, 'body', ['_BaseColor', '_Normal', '_OcclusionRoughnessMetallic'])
+    plan = connector_planner.plan_texture_sets(_records(), PBR)
+    assert [entry['inst_path'] for entry in plan['instances']] == ['/Game/orc/body_mat_inst.body_mat_inst']
+    entry = plan['instances'][0]
+    assert entry['textures'] == {
+        'BaseColor': '/Game/orc/body_BaseColor.body_BaseColor',
+        'Normal': '/Game/orc/body_Normal.body_Normal',
+        'OcclusionRoughnessMetallic': '/Game/orc/body_OcclusionRoughnessMetallic.body_OcclusionRoughnessMetallic',
+    }
+    assert entry['linear_textures'] == ['/Game/orc/body_OcclusionRoughnessMetallic.body_OcclusionRoughnessMetallic']
+    assert entry['missing'] == [] and not entry['exists'] and not entry['unchanged']
+    assert plan['skipped'] == [] and plan['orphans'] == []
+
+
+def test_optional_maps(fake):
+    _textures(fake, 'helmet', ['_BaseColor'])
+    _textures(fake, 'lamp', ['_BaseColor', '_Emissive'])
+    plan = connector_planner.plan_texture_sets(_records(), PBR)
+    entries = dict((entry['inst_name'], entry) for entry in plan['instances'])
+    assert sorted(entries) == ['helmet_mat_inst', 'lamp_mat_inst']
+    assert list(entries['helmet_mat_inst']['textures']) == ['BaseColor']
+    assert entries['helmet_mat_inst']['scalars'] == {}
+    # an optional map brings its scalars along
+    assert entries['lamp_mat_inst']['scalars'] == {'Emissive_Scalar': 1.0}
+
+
+def test_missing_required_and_orphans(fake):
+    _textures(fake, 'armor', ['_Albedo', '_Normal', '_Roughness'])  # no _Metalness
+    _textures(fake, 'cape', ['_Normal'])                            # no base map at all
+    plan = connector_planner.plan_texture_sets(_records(), texture_schema.plan_config('albedo'))
+    assert plan['instances'] == []
+    assert plan['skipped'] == [{'path': '/Game/orc/armor_Albedo.armor_Albedo', 'reason': 'missing required _Metalness'}]
+    assert plan['orphans'] == ['/Game/orc/cape_Normal.cape_Normal']
+
+
+def test_redirects_bind_canonical_texture(fake):
+    _textures(fake, 'body', ['_BaseColor', '_Normal'])
+    config = dict(PBR, texture_redirects={'/Game/orc/body_Normal.body_Normal': '/Game/shared/normal.normal'})
+    entry = connector_planner.plan_texture_sets(_records(), config)['instances'][0]
+    assert entry['textures']['Normal'] == '/Game/shared/normal.normal'
+    assert entry['members']['_Normal'] == '/Game/orc/body_Normal.body_Normal'
+
+
+def test_apply_plan_round_trip(fake, tmp_path):
+    parent = fake.add_asset(PBR['parent_material'], 'Material')
+    _textures(fake, 'body', ['_BaseColor', '_Normal', '_OcclusionRoughnessMetallic'])
+    _textures(fake, 'helmet', ['_BaseColor'])
+    _textures(fake, 'armor', ['_Normal']) # orphan
+    config = dict(PBR, manifest_file=str(tmp_path / 'manifest.json'))
+
+    plan = connector_planner.plan_texture_sets(_records(), config)
+    ctx = connector_pipeline.apply_plan(plan, config)
+    assert ctx.counts['created'] == 2 and ctx.counts['saved'] == 2 and ctx.counts['failed'] == 0
+
+    inst = fake.get_asset('/Game/orc/body_mat_inst.body_mat_inst')
+    assert inst.get_editor_property('parent') is parent
+    textures = inst.get_editor_property('texture_parameter_values')
+    assert dict((name, texture.get_path_name()) for name, texture in textures.items()) == plan['instances'][0]['textures']
+    orm = fake.get_asset('/Game/orc/body_OcclusionRoughnessMetallic.body_OcclusionRoughnessMetallic')
+    assert orm.get_editor_property('srgb') == False
+    assert fake.SAVED_ASSETS['/Game/orc/body_mat_inst.body_mat_inst'] == 1
+
+    # second run:  the manifest marks both sets unchanged,  nothing is rebuilt or saved
+    manifest = content_manifest.ContentManifest(config['manifest_file'])
+    replan = connector_planner.plan_texture_sets(_records(), config, manifest.entries)
+    assert [entry['unchanged'] for entry in replan['instances']] == [True, True]
+    ctx = connector_pipeline.apply_plan(replan, config)
+    assert ctx.counts['skipped'] == 2 and ctx.counts['created'] == 0 and ctx.counts['saved'] == 0
+    assert fake.SAVED_ASSETS['/Game/orc/body_mat_inst.body_mat_inst'] == 1
+
+
+def test_apply_plan_instance_deleted_since_planning(fake):
+    fake.add_asset(PBR['parent_material'], 'Material')
+    _textures(fake, 'body', ['_BaseColor'])
+    _textures(fake, 'helmet', ['_BaseColor'])
+    fake.add_asset('/Game/orc/body_mat_inst.body_mat_inst', 'MaterialInstanceConstant')
+    plan = connector_planner.plan_texture_sets(_records(), PBR)
+    assert [entry['exists'] for entry in plan['instances']] == [True, False]
+
+    fake.remove_asset('/Game/orc/body_mat_inst.body_mat_inst')
+    ctx = connector_pipeline.apply_plan(plan, PBR)
+    # the stale entry fails on its own,  the rest of the run goes on
+    assert ctx.counts['failed'] == 1 and ctx.counts['rebuilt'] == 0 and ctx.counts['created'] == 1
+    assert fake.SAVED_ASSETS['/Game/orc/helmet_mat_inst.helmet_mat_inst'] == 1
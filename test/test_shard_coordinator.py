@@ -0,0 +1,131 @@
+import json
+import os
+import shlex
+import sys
+
+import content_manifest
+import shard_coordinator
+import texture_schema
+from connector_planner import plan_instance
+
+PBR = texture_schema.plan_config('pbr')
+STUB_WORKER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'bench', 'stub_worker.py')
+
+
+def _entry(folder, base_name, unchanged=False):
+    tex_paths = {'_BaseColor': folder + base_name + '_BaseColor.' + base_name + '_BaseColor'}
+    entry = plan_instance(base_name, folder, tex_paths, PBR)
+    entry['unchanged'] = unchanged
+    entry['exists'] = unchanged
+    return entry
+
+
+def _plan(sizes, meshes=()):
+    # sizes: {folder: number of sets},  meshes: [(mesh path, slot, folder, base name)]
+    plan = {'mode': 'sets', 'instances': [], 'meshes': [], 'make_directories': [], 'orphans': [], 'skipped': []}
+    for folder, count in sorted(sizes.items()):
+        plan['instances'] += [_entry(folder, 'set' + str(n)) for n in range(count)]
+    for mesh_path, slot, folder, base_name in meshes:
+        plan['meshes'].append({'mesh_path': mesh_path, 'slot': slot, 'inst_path': folder + base_name + '_mat_inst.' + base_name + '_mat_inst'})
+    return plan
+
+
+def test_shard_plan_keeps_folders_whole_and_balances():
+    plan = _plan({'/Game/a/': 6, '/Game/b/': 3, '/Game/c/': 2, '/Game/d/': 1},
+                 [('/Game/a/S_rock.S_rock', 0, '/Game/a/', 'set0'), ('/Game/c/S_tree.S_tree', 0, '/Game/c/', 'set1')])
+    plan['make_directories'] = ['/Game/c/']
+    shards = shard_coordinator.shard_plan(plan, 2)
+    assert [shard['folders'] for shard in shards] == [['/Game/a/'], ['/Game/b/', '/Game/c/', '/Game/d/']]
+    assert [len(shard['instances']) for shard in shards] == [6, 6]
+    assert [mesh['mesh_path'] for mesh in shards[0]['meshes']] == ['/Game/a/S_rock.S_rock']
+    assert [mesh['mesh_path'] for mesh in shards[1]['meshes']] == ['/Game/c/S_tree.S_tree']
+    assert shards[1]['make_directories'] == ['/Game/c/']
+    # never more shards than folders
+    assert len(shard_coordinator.shard_plan(plan, 10)) == 4
+
+
+def test_find_conflicts_in_plan():
+    plan = _plan({'/Game/a/': 2}, [('/Game/a/S_rock.S_rock', 0, '/Game/a/', 'set0'), ('/Game/a/S_rock.S_rock', 0, '/Game/a/', 'set1')])
+    plan['instances'].append(dict(plan['instances'][0]))
+    plan['instances'][1]['parent'] = plan['instances'][0]['inst_path']
+    errors = shard_coordinator.find_conflicts(plan)['errors']
+    assert 'instance planned more than once:  /Game/a/set0_mat_inst.set0_mat_inst' in errors
+    assert 'mesh slot assigned more than once:  /Game/a/S_rock.S_rock slot 0' in errors
+    assert any(error.startswith('parent material is also written by the plan') for error in errors)
+
+
+def test_mesh_slots_from_different_shards_conflict():
+    # one mesh,  two different slots,  instances in two folders that end up in different shards
+    plan = _plan({'/Game/a/': 2, '/Game/b/': 2},
+                 [('/Game/props/S_cart.S_cart', 0, '/Game/a/', 'set0'), ('/Game/props/S_cart.S_cart', 1, '/Game/b/', 'set0')])
+    shards = shard_coordinator.shard_plan(plan, 2)
+    conflicts = shard_coordinator.find_conflicts(plan, shards)
+    assert conflicts['errors'] == ['mesh slots assigned in more than one shard:  /Game/props/S_cart.S_cart  (shard 0 slot 0,  shard 1 slot 1)']
+    # the same plan on one worker is fine
+    assert shard_coordinator.find_conflicts(plan, shard_coordinator.shard_plan(plan, 1))['errors'] == []
+    # the shared parent is only a warning
+    assert len(conflicts['warnings']) == 1
+
+
+def test_merge_manifests_reports_different_digests(tmp_path):
+    paths = []
+    for n, digests in enumerate([{'/Game/a/x.x': '1', '/Game/a/y.y': '2'}, {'/Game/b/z.z': '3', '/Game/a/x.x': '9'}]):
+        manifest = content_manifest.ContentManifest(str(tmp_path / ('shard_' + str(n) + '.json')))
+        for key, digest in digests.items():
+            manifest.update(key, digest)
+        manifest.save()
+        paths.append(manifest.path)
+    main = content_manifest.ContentManifest(str(tmp_path / 'main.json'))
+    assert shard_coordinator.merge_manifests(main, paths) == ['/Game/a/x.x']
+    merged = content_manifest.ContentManifest(str(tmp_path / 'main.json')).entries
+    assert merged == {'/Game/a/x.x': '1', '/Game/a/y.y': '2', '/Game/b/z.z': '3'}
+
+
+def _stub_command(*extra):
+    return [sys.executable, STUB_WORKER, '{plan}', '{manifest}'] + list(extra)
+
+
+def test_coordinate_with_stub_workers(tmp_path):
+    plan = _plan({'/Game/a/': 3, '/Game/b/': 2, '/Game/c/': 1})
+    plan['instances'][0]['unchanged'] = True
+    main_manifest = str(tmp_path / 'main_manifest.json')
+    summary = shard_coordinator.coordinate(plan, 3, str(tmp_path / 'work'), main_manifest, _stub_command())
+    assert summary['failed_shards'] == [] and summary['manifest_conflicts'] == []
+    assert summary['totals'] == {'created': 5, 'failed': 0, 'rebuilt': 0, 'saved': 5, 'sets': 6, 'skipped': 1}
+    built = set(entry['inst_path'] for entry in plan['instances'] if not entry['unchanged'])
+    assert set(content_manifest.ContentManifest(main_manifest).entries) == built
+    with open(str(tmp_path / 'work' / 'workers.log')) as f:
+        log = f.read()
+    assert all('[shard ' + str(n) + ']' in log for n in range(3))
+    with open(str(tmp_path / 'work' / 'summary.json')) as f:
+        assert json.load(f)['totals']['saved'] == 5
+
+
+def test_coordinate_reports_failed_shards(tmp_path):
+    plan = _plan({'/Game/a/': 4, '/Game/b/': 4})
+    summary = shard_coordinator.coordinate(plan, 2, str(tmp_path / 'work'), str(tmp_path / 'main.json'), _stub_command('--fail'))
+    assert summary['failed_shards'] == [0, 1]
+    # what the workers saved before failing is still merged,  so the next run skips it
+    assert len(content_manifest.ContentManifest(str(tmp_path / 'main.json')).entries) == 4
+
+
+def test_coordinate_refuses_conflicting_plans(tmp_path):
+    plan = _plan({'/Game/a/': 1, '/Game/b/': 1},
+                 [('/Game/props/S_cart.S_cart', 0, '/Game/a/', 'set0'), ('/Game/props/S_cart.S_cart', 1, '/Game/b/', 'set0')])
+    summary = shard_coordinator.coordinate(plan, 2, str(tmp_path / 'work'), None, _stub_command())
+    assert summary['shards'] == [] and summary['conflicts']['errors']
+    assert not os.path.isdir(str(tmp_path / 'work'))
+
+
+def test_paths_with_spaces(tmp_path):
+    work_dir = str(tmp_path / 'Unreal Projects' / 'work')
+    # the editor's -script argument is split on spaces,  every path in it has to come back whole
+    values = {'run_job': 'C:/Unreal Projects/tools/run_job.py', 'plan': work_dir + '/plan.json',
+              'manifest': work_dir + '/manifest.json', 'editor': 'UnrealEditor-Cmd.exe', 'project': 'C:/Unreal Projects/Orc.uproject'}
+    script = [part for part in shard_coordinator._fill(shard_coordinator.EDITOR_COMMAND, values) if part.startswith('-script=')][0]
+    assert shlex.split(script[len('-script='):]) == [values['run_job'], 'apply_plan', '--plan', values['plan'],
+                                                     '--manifest-file', values['manifest']]
+
+    summary = shard_coordinator.coordinate(_plan({'/Game/a/': 2, '/Game/b/': 1}), 2, work_dir,
+                                           str(tmp_path / 'Unreal Projects' / 'main.json'), _stub_command())
+    assert summary['failed_shards'] == [] and summary['totals']['created'] == 3
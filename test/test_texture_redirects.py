@@ -0,0 +1,45 @@
+import texture_dedup
+import texture_redirects
+
+
+def _texture(fake, name, source, **props):
+    return fake.add_asset('/Game/drop/' + name + '.' + name, 'Texture2D',
+                          asset_import_data=fake.AssetImportData(str(source)), **props)
+
+
+def _files(tmp_path, *names):
+    paths = []
+    for name in names:
+        path = tmp_path / name
+        path.write_bytes(b'same bytes')
+        paths.append(path)
+    return paths
+
+
+def test_only_same_settings_are_grouped(fake, tmp_path):
+    first, second = _files(tmp_path, 'a_AO.png', 'b_AO.png')
+    textures = [_texture(fake, 'a_AO', first, srgb=False, compression_settings=fake.TextureCompressionSettings.TC_MASKS),
+                _texture(fake, 'b_AO', second, srgb=False, compression_settings=fake.TextureCompressionSettings.TC_MASKS),
+                _texture(fake, 'c_BaseColor', second)] # the same file imported as a color texture
+    plan = texture_redirects.build_redirects(textures, workers=1, cache_file=str(tmp_path / 'hashes.json'))
+    assert plan['redirects'] == {'/Game/drop/b_AO.b_AO': '/Game/drop/a_AO.a_AO'}
+    assert [differ['path'] for differ in plan['settings_differ']] == ['/Game/drop/c_BaseColor.c_BaseColor']
+
+    assert texture_redirects.apply_redirects(plan) == ['/Game/drop/a_AO.a_AO']
+    assert fake.get_asset('/Game/drop/c_BaseColor.c_BaseColor') != None
+
+
+def test_apply_checks_settings_again(fake, tmp_path):
+    first, second = _files(tmp_path, 'a_AO.png', 'b_AO.png')
+    textures = [_texture(fake, 'a_AO', first), _texture(fake, 'b_AO', second)]
+    plan = texture_redirects.build_redirects(textures, workers=1, cache_file=str(tmp_path / 'hashes.json'))
+    assert plan['redirects'] == {'/Game/drop/b_AO.b_AO': '/Game/drop/a_AO.a_AO'}
+    textures[1].set_editor_property('srgb', False) # changed after the plan was written
+    assert texture_redirects.apply_redirects(plan) == []
+    assert fake.get_asset('/Game/drop/b_AO.b_AO') != None
+
+
+def test_exact_hashing_reads_no_pixels(tmp_path):
+    path, = _files(tmp_path, 'a_AO.png') # not a real png,  only its bytes are hashed
+    result = texture_dedup.hash_files([str(path)])[str(path)]
+    assert 'sha1' in result and 'grid' not in result and 'error' not in result
@@ -0,0 +1,323 @@
+# what the textures bound by material instances and meshes cost in gpu memory,  from an asset listing alone.
+# texture size, format, lod group and mip settings come from registry tags and material -> texture links from
+# package dependencies,  both exported with the listing (run_job.py export_listing --budget,  asset_query.export_listing),
+# so the audit runs outside the editor (ci on every content commit).
+#   texture   full mip chain of its format after the lod group / lod bias / max texture size clamp,
+#             streamed (counts against the streaming pool) or resident (never stream, ui groups, no mips, not a power of two)
+#   instance  unique textures it binds,  directly and through its parent chain
+#   mesh      unique textures of all its materials
+# aggregated per folder and per parent material (the root of each instance's chain),  and maps bigger than
+# their rule allows (4k ao...) are flagged.  plain python, no unreal import.
+#   python texture_budget.py listing.json --out budget.json --max-folder-mb 512 --fail-on-oversized
+import argparse
+import json
+import sys
+
+from asset_listing import load_listing, load_listing_extras
+
+# registry tags texture_budget reads,  export_listing(..., tag_names=TEXTURE_TAGS, dependencies=True)
+TEXTURE_TAGS = ['Dimensions', 'Format', 'CompressionSettings', 'HasAlphaChannel', 'LODGroup', 'LODBias',
+                'MaxTextureSize', 'MipGenSettings', 'NeverStream']
+TEXTURE_CLASSES = {'Texture2D': 1, 'TextureCube': 6} # class -> faces
+MATERIAL_CLASSES = ['Material', 'MaterialInstanceConstant']
+MESH_CLASSES = ['StaticMesh', 'SkeletalMesh']
+
+# pixel format -> (block size in pixels, bytes per block)
+FORMATS = {
+    'PF_DXT1': (4, 8), 'PF_DXT3': (4, 16), 'PF_DXT5': (4, 16), 'PF_BC4': (4, 8), 'PF_BC5': (4, 16),
+    'PF_BC6H': (4, 16), 'PF_BC7': (4, 16), 'PF_ETC2_RGB': (4, 8), 'PF_ETC2_RGBA': (4, 16),
+    'PF_ASTC_4x4': (4, 16), 'PF_ASTC_6x6': (6, 16), 'PF_ASTC_8x8': (8, 16),
+    'PF_G8': (1, 1), 'PF_G16': (1, 2), 'PF_R16F': (1, 2), 'PF_R32_FLOAT': (1, 4), 'PF_B8G8R8A8': (1, 4),
+    'PF_R8G8B8A8': (1, 4), 'PF_FloatRGBA': (1, 8), 'PF_A32B32G32R32F': (1, 16),
+}
+# compression settings -> (format without alpha, with alpha),  when the listing has no Format tag
+COMPRESSION_FORMATS = {
+    'TC_DEFAULT': ('PF_DXT1', 'PF_DXT5'), 'TC_MASKS': ('PF_DXT1', 'PF_DXT5'), 'TC_NORMALMAP': ('PF_BC5', 'PF_BC5'),
+    'TC_GRAYSCALE': ('PF_G8', 'PF_G8'), 'TC_DISPLACEMENTMAP': ('PF_G8', 'PF_G8'), 'TC_ALPHA': ('PF_BC4', 'PF_BC4'),
+    'TC_DISTANCEFIELDFONT': ('PF_G8', 'PF_G8'), 'TC_VECTORDISPLACEMENTMAP': ('PF_B8G8R8A8', 'PF_B8G8R8A8'),
+    'TC_EDITORICON': ('PF_B8G8R8A8', 'PF_B8G8R8A8'), 'TC_HDR': ('PF_FloatRGBA', 'PF_FloatRGBA'),
+    'TC_HDR_COMPRESSED': ('PF_BC6H', 'PF_BC6H'), 'TC_BC7': ('PF_BC7', 'PF_BC7'), 'TC_HALFFLOAT': ('PF_R16F', 'PF_R16F'),
+    'TC_SINGLEFLOAT': ('PF_R32_FLOAT', 'PF_R32_FLOAT'), 'TC_HDR_F32': ('PF_A32B32G32R32F', 'PF_A32B32G32R32F'),
+}
+# lod group -> max size of the top mip (BaseDeviceProfiles.ini defaults,  --lod-groups for a platform's profile)
+LOD_GROUPS = {
+    'TEXTUREGROUP_World': 8192, 'TEXTUREGROUP_WorldNormalMap': 8192, 'TEXTUREGROUP_WorldSpecular': 8192,
+    'TEXTUREGROUP_Character': 8192, 'TEXTUREGROUP_CharacterNormalMap': 8192, 'TEXTUREGROUP_CharacterSpecular': 8192,
+    'TEXTUREGROUP_Weapon': 8192, 'TEXTUREGROUP_WeaponNormalMap': 8192, 'TEXTUREGROUP_WeaponSpecular': 8192,
+    'TEXTUREGROUP_Vehicle': 8192, 'TEXTUREGROUP_VehicleNormalMap': 8192, 'TEXTUREGROUP_VehicleSpecular': 8192,
+    'TEXTUREGROUP_Cinematic': 8192, 'TEXTUREGROUP_Effects': 8192, 'TEXTUREGROUP_EffectsNotFiltered': 8192,
+    'TEXTUREGROUP_Skybox': 8192, 'TEXTUREGROUP_UI': 8192, 'TEXTUREGROUP_Lightmap': 8192, 'TEXTUREGROUP_Shadowmap': 8192,
+    'TEXTUREGROUP_MobileFlattened': 2048, 'TEXTUREGROUP_ColorLookupTable': 256, 'TEXTUREGROUP_Bokeh': 256,
+    'TEXTUREGROUP_IESLightProfile': 256, 'TEXTUREGROUP_Pixels2D': 8192,
+}
+DEFAULT_LOD_GROUP = 'TEXTUREGROUP_World'
+NON_STREAMING_GROUPS = ['TEXTUREGROUP_UI', 'TEXTUREGROUP_ColorLookupTable', 'TEXTUREGROUP_Bokeh',
+                        'TEXTUREGROUP_IESLightProfile', 'TEXTUREGROUP_Pixels2D']
+# (name suffix, largest allowed side),  the first suffix the texture name ends with applies ('' for everything else)
+OVERSIZED_RULES = [
+    ('_AO', 2048), ('_Roughness', 2048), ('_Metalness', 2048), ('_Metallic', 2048), ('_Emissive', 2048),
+    ('_masks', 2048), ('', 4096),
+]
+MB = 1024.0 * 1024.0
+
+
+def _enum_name(value):
+    # 'TextureCompressionSettings.TC_Default' / 'TC_Default' -> 'TC_DEFAULT'
+    return str(value).rsplit('.', 1)[-1].upper() if value else None
+
+
+def _truthy(value):
+    return str(value).lower() in ('true', '1')
+
+
+# 'TextureGroup.TEXTUREGROUP_WORLD' / 'TEXTUREGROUP_World' -> 'TEXTUREGROUP_World'
+def _lod_group(value, lod_groups):
+    if not value:
+        return DEFAULT_LOD_GROUP
+    name = str(value).rsplit('.', 1)[-1]
+    for group in list(lod_groups) + NON_STREAMING_GROUPS:
+        if group.lower() == name.lower():
+            return group
+    return name
+
+
+def _is_power_of_two(value):
+    return value > 0 and value & (value - 1) == 0
+
+
+def texture_format(tags):
+    if tags.get('Format') in FORMATS:
+        return tags['Format']
+    compression = _enum_name(tags.get('CompressionSettings')) or 'TC_DEFAULT'
+    formats = COMPRESSION_FORMATS.get(compression, COMPRESSION_FORMATS['TC_DEFAULT'])
+    return formats[1] if _truthy(tags.get('HasAlphaChannel')) else formats[0]
+
+
+def mip_bytes(width, height, pixel_format):
+    block, block_bytes = FORMATS[pixel_format]
+    return ((width + block - 1) // block) * ((height + block - 1) // block) * block_bytes
+
+
+# full chain from the top mip down to 1x1,  returns (bytes, mip count)
+def chain_bytes(width, height, pixel_format, mips=None):
+    total = 0
+    count = 0
+    while True:
+        total += mip_bytes(width, height, pixel_format)
+        count += 1
+        if (width == 1 and height == 1) or (mips != None and count >= mips):
+            return total, count
+        width, height = max(1, width // 2), max(1, height // 2)
+
+
+# size, format, clamp and memory of one texture from its registry tags,  None without a Dimensions tag
+def texture_cost(tags, lod_groups=LOD_GROUPS, faces=1):
+    try:
+        width, height = [int(value) for value in str(tags['Dimensions']).lower().split('x')[:2]]
+    except (KeyError, ValueError):
+        return None
+    pixel_format = texture_format(tags)
+    group = _lod_group(tags.get('LODGroup'), lod_groups)
+    has_mips = _enum_name(tags.get('MipGenSettings')) != 'TMGS_NOMIPMAPS'
+    power_of_two = _is_power_of_two(width) and _is_power_of_two(height)
+    has_mips = has_mips and power_of_two # non power of two textures get no mips
+
+    # drop top mips:  lod bias first,  then the group's and the texture's max size
+    limit = lod_groups.get(group, lod_groups.get(DEFAULT_LOD_GROUP, 8192))
+    max_texture_size = int(tags.get('MaxTextureSize') or 0)
+    if max_texture_size > 0:
+        limit = min(limit, max_texture_size)
+    top_width, top_height = width, height
+    if has_mips:
+        bias = max(0, int(tags.get('LODBias') or 0))
+        top_width, top_height = max(1, width >> bias), max(1, height >> bias)
+        while max(top_width, top_height) > limit and max(top_width, top_height) > 1:
+            top_width, top_height = max(1, top_width // 2), max(1, top_height // 2)
+    total, mips = chain_bytes(top_width, top_height, pixel_format, None if has_mips else 1)
+    streamed = has_mips and not _truthy(tags.get('NeverStream')) and group not in NON_STREAMING_GROUPS
+    return {
+        'size': [width, height],
+        'resident_size': [top_width, top_height],
+        'format': pixel_format,
+        'lod_group': group,
+        'mips': mips,
+        'bytes': total * faces,
+        'streamed': streamed,
+    }
+
+
+def oversized(asset_name, cost, rules=OVERSIZED_RULES):
+    side = max(cost['resident_size'])
+    for suffix, limit in rules:
+        if asset_name.lower().endswith(suffix.lower()):
+            if side > limit:
+                return (suffix or 'texture') + ' ' + str(side) + ' > ' + str(limit)
+            return None
+    return None
+
+
+class BudgetAudit(object):
+    # textures, the material graph and meshes of one listing
+
+    def __init__(self, records, extras, lod_groups=LOD_GROUPS, rules=OVERSIZED_RULES):
+        self.records = dict((record.object_path.split('.', 1)[0], record) for record in records) # package -> record
+        self.extras = extras
+        self.lod_groups = lod_groups
+        self.rules = rules
+        self.textures = {}
+        self._material_textures = {}
+        self.no_size = []
+        for package_name, record in sorted(self.records.items()):
+            if record.class_name in TEXTURE_CLASSES:
+                cost = texture_cost(self._extra(record)['tags'], lod_groups, TEXTURE_CLASSES[record.class_name])
+                if cost == None:
+                    self.no_size.append(record.object_path)
+                    continue
+                cost['oversized'] = oversized(record.asset_name, cost, rules)
+                self.textures[record.object_path] = cost
+
+    def _extra(self, record):
+        return self.extras.get(record.object_path, {'tags': {}, 'dependencies': []})
+
+    def _dependencies(self, record, class_names):
+        found = []
+        for package_name in self._extra(record)['dependencies']:
+            dep = self.records.get(package_name)
+            if dep != None and dep.class_name in class_names:
+                found.append(dep)
+        return found
+
+    # object paths of every texture a material binds,  through its parent chain
+    def material_textures(self, record, visiting=()):
+        if record.object_path in self._material_textures:
+            return self._material_textures[record.object_path]
+        textures = set(dep.object_path for dep in self._dependencies(record, TEXTURE_CLASSES) if dep.object_path in self.textures)
+        for parent in self._dependencies(record, MATERIAL_CLASSES):
+            if parent.object_path not in visiting:
+                textures |= self.material_textures(parent, visiting + (record.object_path,))
+        self._material_textures[record.object_path] = textures
+        return textures
+
+    def root_material(self, record):
+        seen = set()
+        while record.class_name == 'MaterialInstanceConstant' and record.object_path not in seen:
+            seen.add(record.object_path)
+            parents = self._dependencies(record, MATERIAL_CLASSES)
+            if not parents:
+                break
+            record = parents[0]
+        return record.object_path
+
+    def bytes_of(self, texture_paths):
+        return sum(self.textures[path]['bytes'] for path in texture_paths)
+
+    def _summary(self, texture_paths):
+        streamed = sum(self.textures[path]['bytes'] for path in texture_paths if self.textures[path]['streamed'])
+        total = self.bytes_of(texture_paths)
+        return {'textures': len(texture_paths), 'bytes': total, 'streamed_bytes': streamed, 'resident_bytes': total - streamed}
+
+    def report(self):
+        instances = {}
+        folders = {}
+        parents = {}
+        for package_name, record in sorted(self.records.items()):
+            if record.class_name != 'MaterialInstanceConstant':
+                continue
+            textures = self.material_textures(record)
+            root = self.root_material(record)
+            instances[record.object_path] = dict(self._summary(textures), parent=root)
+            folder = folders.setdefault(record.package_path, {'instances': 0, 'texture_paths': set()})
+            folder['instances'] += 1
+            folder['texture_paths'] |= textures
+            parent = parents.setdefault(root, {'instances': 0, 'texture_paths': set()})
+            parent['instances'] += 1
+            parent['texture_paths'] |= textures
+
+        meshes = {}
+        for package_name, record in sorted(self.records.items()):
+            if record.class_name not in MESH_CLASSES:
+                continue
+            materials = self._dependencies(record, MATERIAL_CLASSES)
+            textures = set()
+            for material in materials:
+                textures |= self.material_textures(material)
+            meshes[record.object_path] = dict(self._summary(textures), materials=sorted(material.object_path for material in materials))
+
+        def finish(groups):
+            return dict((name, dict(self._summary(group['texture_paths']), instances=group['instances']))
+                        for name, group in groups.items())
+
+        return {
+            'textures': self.textures,
+            'instances': instances,
+            'meshes': meshes,
+            'folders': finish(folders),
+            'parents': finish(parents),
+            'oversized': sorted((path, cost['oversized']) for path, cost in self.textures.items() if cost['oversized']),
+            'no_size': self.no_size,
+            'totals': self._summary(set(self.textures)),
+        }
+
+
+def audit_listing(listing_file, lod_groups=LOD_GROUPS, rules=OVERSIZED_RULES):
+    return BudgetAudit(load_listing(listing_file), load_listing_extras(listing_file), lod_groups, rules).report()
+
+
+def _mb(value):
+    return str(round(value / MB, 1)) + ' MB'
+
+
+def format_report(report, top=10):
+    totals = report['totals']
+    lines = [str(totals['textures']) + ' textures  ' + _mb(totals['bytes']) + '  (streamed ' + _mb(totals['streamed_bytes'])
+             + ',  resident ' + _mb(totals['resident_bytes']) + ')']
+    for title, key in [('folders', 'folders'), ('parent materials', 'parents')]:
+        lines.append('largest ' + title + ':')
+        for name, group in sorted(report[key].items(), key=lambda item: -item[1]['bytes'])[:top]:
+            lines.append('    ' + _mb(group['bytes']).rjust(12) + '  ' + str(group['instances']).rjust(5) + ' instances  '
+                         + str(group['textures']).rjust(5) + ' textures  ' + name)
+    for path, reason in report['oversized']:
+        lines.append('oversized:  ' + path + '  (' + reason + ')')
+    for path in report['no_size']:
+        lines.append('no Dimensions tag:  ' + path)
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='gpu memory of the textures bound by material instances and meshes')
+    parser.add_argument('listing', help='json listing exported with texture tags and dependencies')
+    parser.add_argument('--lod-groups', help='json {lod group: max size} overriding the defaults (a platform profile)')
+    parser.add_argument('--rules', help='json [[name suffix, largest side], ...] for oversized maps')
+    parser.add_argument('--out', help='write the full report here (json)')
+    parser.add_argument('--max-folder-mb', type=float, help='fail when a folder binds more than this')
+    parser.add_argument('--fail-on-oversized', action='store_true')
+    args = parser.parse_args(argv)
+
+    lod_groups = dict(LOD_GROUPS)
+    if args.lod_groups:
+        with open(args.lod_groups, 'r') as f:
+            lod_groups.update(json.load(f))
+    rules = OVERSIZED_RULES
+    if args.rules:
+        with open(args.rules, 'r') as f:
+            rules = [tuple(rule) for rule in json.load(f)]
+    report = audit_listing(args.listing, lod_groups, rules)
+    for line in format_report(report):
+        print(line)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=1, sort_keys=True)
+
+    failed = False
+    if args.max_folder_mb != None:
+        for folder, group in sorted(report['folders'].items()):
+            if group['bytes'] > args.max_folder_mb * MB:
+                print('over budget:  ' + folder + '  ' + _mb(group['bytes']) + ' > ' + str(args.max_folder_mb) + ' MB')
+                failed = True
+    if args.fail_on_oversized and report['oversized']:
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+# set sRGB (and optionally compression) on textures from their names and what their source files actually hold,
+# instead of flipping srgb by hand on a selection (mass_change_attr.py,  test/scratch/texture_attr.py).
+# the name's schema suffix decides (texture_schema.py:  base color / emissive keep srgb,  masks go linear),
+# texture_inspector.py reads the source pixels (found through the import data,  results cached in Saved/ by file time
+# and size) to pick the compression and to class textures without a known suffix,  texture_inspector.resolve().
+# pixels that disagree with the name are reported,  not applied,  and a gray or mask looking texture without a
+# known suffix is left alone.  bulk_property_editor only writes textures that differ.
+# textures whose source is gone from disk are reported and left alone.
+import os
+import sys
+import unreal
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__))) # so modules next to this script import from the unreal console
+import asset_cache
+import asset_query
+import batch_save
+import bulk_property_editor
+import run_stats
+import texture_inspector
+import texture_schema
+
+WORKERS = 4
+
+
+def default_cache_file():
+    return os.path.join(unreal.Paths.project_saved_dir(), 'texture_inspection.json')
+
+
+# source image on disk for a texture,  None when it was not imported from a file or the file is gone
+def source_file(texture):
+    try:
+        import_data = texture.get_editor_property('asset_import_data')
+    except Exception:
+        return None
+    if import_data == None:
+        return None
+    path = import_data.get_first_filename()
+    if not path or not os.path.isfile(path):
+        return None
+    return path
+
+
+def _properties(settings, set_compression):
+    properties = {'srgb': settings['srgb']}
+    if set_compression:
+        properties['compression_settings'] = getattr(unreal.TextureCompressionSettings, settings['compression_settings'])
+    return properties
+
+
+# returns {'changed': [(asset path, changes)], 'skipped': [paths], 'no_source': [paths], 'errors': [(path, message)],
+#          'kinds': {asset path: result}, 'conflicts': [(path, note)], 'left_alone': [(path, note)], 'saved': count}
+def apply_color_space(textures, set_compression=False, dry_run=False, workers=WORKERS, cache_file=None,
+                      chunk_size=batch_save.DEFAULT_CHUNK_SIZE, registry=None):
+    report = {'changed': [], 'skipped': [], 'no_source': [], 'errors': [], 'kinds': {}, 'conflicts': [], 'left_alone': [], 'saved': 0}
+    registry = registry or texture_schema.SchemaRegistry()
+    sources = {}
+    for texture in textures:
+        path = source_file(texture)
+        if path == None:
+            report['no_source'].append(texture.get_path_name())
+        else:
+            sources[texture.get_path_name()] = path
+    with run_stats.timer('inspect_sources'):
+        # threads,  numpy lets go of the gil while it sums a band
+        results = texture_inspector.inspect_files(sorted(set(sources.values())), workers, cache_file or default_cache_file(), processes=False)
+    run_stats.count('sources', len(results))
+
+    # one apply_properties call per distinct setting
+    groups = {}
+    for texture in textures:
+        asset_path = texture.get_path_name()
+        if asset_path not in sources:
+            continue
+        result = results[sources[asset_path]]
+        if 'error' in result:
+            report['errors'].append((asset_path, result['error']))
+            continue
+        report['kinds'][asset_path] = result
+        settings, note = texture_inspector.resolve(result, registry.role(texture.get_name()))
+        if settings == None:
+            report['left_alone'].append((asset_path, note))
+            continue
+        if note != None:
+            report['conflicts'].append((asset_path, note))
+        properties = _properties(settings, set_compression)
+        groups.setdefault(tuple(sorted(properties.items(), key=str)), (properties, []))[1].append(texture)
+    for key in sorted(groups, key=str):
+        properties, group = groups[key]
+        changed, skipped = bulk_property_editor.apply_properties(group, properties, dry_run)
+        report['changed'] += changed
+        report['skipped'] += skipped
+
+    if not dry_run:
+        changed_paths = set(asset_path for asset_path, changes in report['changed'])
+        report['saved'] = batch_save.save_assets_chunked([texture for texture in textures if texture.get_path_name() in changed_paths], chunk_size)
+    return report
+
+
+def format_report(report, dry_run=False):
+    lines = bulk_property_editor.format_report(report['changed'], report['skipped'], dry_run)
+    for asset_path, result in sorted(report['kinds'].items()):
+        if result['constant_channels']:
+            lines.append('constant channels ' + ', '.join(result['constant_channels']) + ':  ' + asset_path)
+    for asset_path, note in report['conflicts']:
+        lines.append('name and pixels disagree:  ' + asset_path + '  ' + note)
+    for asset_path, note in report['left_alone']:
+        lines.append('left alone:  ' + asset_path + '  ' + note)
+    for asset_path in report['no_source']:
+        lines.append('no source file:  ' + asset_path)
+    for asset_path, message in report['errors']:
+        lines.append('could not read source:  ' + asset_path + '  ' + message)
+    return lines
+
+
+if __name__ == '__main__':
+    # 'selection' uses the content browser selection,  'query' picks textures from asset registry data
+    ASSET_SOURCE = 'selection'
+    QUERY = {
+        'path_globs': ['/Game/dawnOfWar/assets'],
+        'class_names': ['Texture2D'],
+    }
+    # also set TC_NORMALMAP / TC_MASKS / TC_GRAYSCALE...,  not just srgb
+    SET_COMPRESSION = False
+    DRY_RUN = True
+
+    run_stats.new_run()
+    asset_cache.new_run()
+    if ASSET_SOURCE == 'query':
+        textures = list(asset_query.load_records(asset_query.query_assets(**QUERY)))
+    else:
+        textures = [asset for asset in unreal.EditorUtilityLibrary().get_selected_assets() if asset.get_class().get_name() == 'Texture2D']
+    report = apply_color_space(textures, SET_COMPRESSION, DRY_RUN)
+    for line in format_report(report, DRY_RUN):
+        print(line)
+    print(str(len(report['changed'])) + ' of ' + str(len(textures)) + ' textures ' + ('would change' if DRY_RUN else 'changed'))
+    print(run_stats.end_run())
@@ -0,0 +1,322 @@
+# find duplicated source textures (the same _Normal or _AO copied into several folders of a drop).
+#   exact duplicates   same sha1 of the file bytes,  read in chunks
+#   near duplicates    (opt in,  near=True / --near) same picture re-saved,  resized or re-encoded:  every file is averaged
+#                      down to a small grid (a band of rows at a time,  image_io.py),  an average hash of the grid finds
+#                      candidates and the grids have to agree within GRID_TOLERANCE.  a candidate is then confirmed
+#                      pixel by pixel against the canonical file (confirm_near,  the larger one box filtered down
+#                      when it is a power of two bigger),  every grid cell has to agree within NEAR_CELL_DIFFERENCE.
+#                      members are matched against the canonical file itself,  never through another member
+# each group gets one canonical file (largest, then shortest path),  every other file maps to it.
+# hashes are cached by file modification time and size,  so reruns only hash new or changed files,
+# and files are hashed in a process pool.  near duplicates need numpy,  exact ones do not.
+# plain python, no unreal import.  texture_redirects.py turns the groups into texture asset redirects.
+#   groups = texture_dedup.find_duplicates(texture_dedup.hash_files(paths, workers=8, cache_file='dedup_cache.json'))
+#   python texture_dedup.py C:/drops/orc C:/drops/goblin --cache dedup_cache.json --out duplicates.json
+import argparse
+import concurrent.futures
+import hashlib
+import itertools
+import json
+import os
+import sys
+import time
+
+import image_io
+from image_io import numpy
+
+CACHE_VERSION = 1
+READ_CHUNK = 1 << 20
+GRID_SIZE = 8
+HASH_BANDS = 4              # the 64 bit average hash is split into 4 x 16 bits,  files sharing one band are compared
+MAX_HAMMING = 3             # so every pair within 3 differing bits shares at least one band
+GRID_TOLERANCE = 4          # mean difference of grid cells (0..255) for a near duplicate candidate
+NEAR_MEAN_DIFFERENCE = 2.0 / 255  # confirm_near:  mean per pixel difference over the whole image
+NEAR_CELL_DIFFERENCE = 6.0 / 255  # and in every grid cell,  so a changed corner is not averaged away
+
+
+def file_sha1(path, chunk_size=READ_CHUNK):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# grid_size x grid_size x channels block averages (0..255),  summed band by band
+def image_grid(path, grid_size=GRID_SIZE, band_rows=image_io.BAND_ROWS):
+    header = image_io.read_header(path)
+    height, width, channels = header['height'], header['width'], header['channels']
+    sums = numpy.zeros((grid_size, grid_size, channels))
+    counts = numpy.zeros((grid_size, 1, 1))
+    column_starts = numpy.unique((numpy.arange(grid_size) * width) // grid_size)
+    column_counts = numpy.diff(numpy.append(column_starts, width))[None, :, None]
+    for top, band in image_io.iter_bands(path, band_rows, header):
+        band = image_io.to_float(band)
+        columns = numpy.add.reduceat(band, column_starts, axis=1) / column_counts # rows x cells x channels
+        grid_rows = ((top + numpy.arange(band.shape[0])) * grid_size) // height
+        for grid_row in numpy.unique(grid_rows):
+            rows = columns[grid_rows == grid_row]
+            sums[grid_row, :len(column_starts)] += rows.sum(axis=0)
+            counts[grid_row] += len(rows)
+    grid = sums / numpy.maximum(counts, 1)
+    if len(column_starts) < grid_size: # narrower than the grid
+        grid[:, len(column_starts):] = grid[:, len(column_starts) - 1:len(column_starts)]
+    return header, numpy.clip(numpy.round(grid * 255), 0, 255).astype(numpy.uint8)
+
+
+# 64 bit average hash of the grid's luminance,  as hex
+def average_hash(grid):
+    luminance = grid[:, :, :3].astype(numpy.float64).mean(axis=2) if grid.shape[2] >= 3 else grid[:, :, 0].astype(numpy.float64)
+    bits = (luminance > luminance.mean()).flatten()
+    return '%016x' % int(''.join('1' if bit else '0' for bit in bits), 2)
+
+
+def file_stamp(path):
+    stat = os.stat(path)
+    return [stat.st_mtime, stat.st_size]
+
+
+# sha1 of the file,  plus the grid and average hash for near matching (near=True,  reads the pixels)
+def hash_file(path, grid_size=GRID_SIZE, near=False):
+    result = {'path': path, 'stamp': file_stamp(path), 'sha1': file_sha1(path)}
+    if not near or numpy == None:
+        return result
+    try:
+        header, grid = image_grid(path, grid_size)
+    except (ValueError, ImportError, OSError) as error:
+        result['error'] = str(error)
+        return result
+    result.update({'width': header['width'], 'height': header['height'], 'channels': header['channels'],
+                   'grid': grid.flatten().tolist(), 'phash': average_hash(grid)})
+    return result
+
+
+def load_cache(cache_file):
+    if not cache_file or not os.path.isfile(cache_file):
+        return {}
+    with open(cache_file, 'r') as f:
+        data = json.load(f)
+    if data.get('version') != CACHE_VERSION:
+        return {}
+    return data['files']
+
+
+def save_cache(cache_file, results):
+    folder = os.path.dirname(cache_file)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+    tmp_path = cache_file + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': CACHE_VERSION, 'files': results}, f, sort_keys=True)
+    os.replace(tmp_path, cache_file)
+
+
+def _is_current(cached, path, near=False):
+    if cached == None or cached.get('stamp') != file_stamp(path):
+        return False
+    # hashed for exact matching (or without numpy) earlier,  near matching adds the grid now
+    return not near or 'phash' in cached or 'error' in cached or numpy == None
+
+
+# {path: hashes} for every file,  only new or changed files are read.  the pixels only with near=True.
+# workers > 1 hashes them in processes,  or threads with processes=False (inside the editor,  see texture_inspector.py)
+def hash_files(paths, workers=1, cache_file=None, processes=True, near=False):
+    cache = load_cache(cache_file)
+    results = {}
+    to_hash = []
+    for path in paths:
+        if _is_current(cache.get(path), path, near):
+            results[path] = cache[path]
+        else:
+            to_hash.append(path)
+    if workers > 1 and len(to_hash) > 1:
+        executor = concurrent.futures.ProcessPoolExecutor if processes else concurrent.futures.ThreadPoolExecutor
+        with executor(workers) as pool:
+            for result in pool.map(hash_file, to_hash, itertools.repeat(GRID_SIZE), itertools.repeat(near),
+                                   chunksize=max(1, len(to_hash) // (workers * 4))):
+                results[result['path']] = result
+    else:
+        for path in to_hash:
+            results[path] = hash_file(path, near=near)
+    if cache_file:
+        cache.update(results)
+        save_cache(cache_file, dict((path, cache[path]) for path in cache if os.path.isfile(path)))
+    return results
+
+
+def _hamming(a, b):
+    return bin(int(a, 16) ^ int(b, 16)).count('1')
+
+
+def _near(a, b, grids):
+    if a['channels'] != b['channels'] or _hamming(a['phash'], b['phash']) > MAX_HAMMING:
+        return False
+    return float(numpy.abs(grids[a['path']] - grids[b['path']]).mean()) <= GRID_TOLERANCE
+
+
+def _scale(big, small):
+    # power of two the big image is larger by on both sides,  None if it is not a clean downscale
+    for scale in [1, 2, 4, 8, 16]:
+        if big['width'] == small['width'] * scale and big['height'] == small['height'] * scale:
+            return scale
+    return None
+
+
+# pixel by pixel check of a near candidate against the canonical file,  at the smaller one's size.
+# both files are read a band at a time and rows are compared as soon as both files have given them,
+# so only rows one file is ahead by are held (a whole image when one is stored bottom up and the other top down)
+def confirm_near(canonical_path, candidate_path, band_rows=image_io.BAND_ROWS, grid_size=GRID_SIZE):
+    paths = [canonical_path, candidate_path]
+    headers = [image_io.read_header(path) for path in paths]
+    big, small = (0, 1) if headers[0]['width'] >= headers[1]['width'] else (1, 0)
+    scale = _scale(headers[big], headers[small])
+    if scale == None or headers[0]['channels'] != headers[1]['channels']:
+        return False
+    width, height = headers[small]['width'], headers[small]['height']
+    cell_columns = (numpy.arange(width) * grid_size) // width
+    sums = numpy.zeros((grid_size, grid_size))
+    counts = numpy.zeros((grid_size, grid_size))
+    pending = [{}, {}]
+    streams = [None, None]
+    streams[small] = image_io.iter_bands(paths[small], band_rows, headers[small])
+    streams[big] = image_io.iter_bands(paths[big], band_rows * scale, headers[big])
+    for bands in itertools.zip_longest(*streams):
+        for index, top_band in enumerate(bands):
+            if top_band == None:
+                continue
+            top, band = top_band
+            band = image_io.to_float(band)
+            if index == big and scale > 1: # box filter down to the small size
+                band = band.reshape(band.shape[0] // scale, scale, width, scale, -1).mean(axis=(1, 3))
+                top //= scale
+            for offset in range(band.shape[0]):
+                row = top + offset
+                other = pending[1 - index].pop(row, None)
+                if other is None:
+                    pending[index][row] = band[offset]
+                    continue
+                cell_row = (row * grid_size) // height
+                numpy.add.at(sums[cell_row], cell_columns, numpy.abs(band[offset] - other).mean(axis=1))
+                numpy.add.at(counts[cell_row], cell_columns, 1)
+    if pending[0] or pending[1]:
+        return False
+    cells = sums / numpy.maximum(counts, 1)
+    return float(sums.sum() / counts.sum()) <= NEAR_MEAN_DIFFERENCE and float(cells.max()) <= NEAR_CELL_DIFFERENCE
+
+
+def _canonical_key(result):
+    return (-result.get('width', 0) * result.get('height', 0), len(result['path']), result['path'])
+
+
+# [{'canonical': path, 'exact': [paths], 'near': [paths]}] for every group with more than one file.
+# exact members have the canonical file's bytes,  near members (only with near=True) look the same as the canonical
+# file itself:  candidates from the hash buckets are confirmed with confirm_near() against it,  so A ~ B and B ~ C
+# never put C with A unless C matches A too
+def find_duplicates(results, near=False):
+    results = dict((path, result) for path, result in results.items() if 'sha1' in result)
+    by_sha1 = {}
+    for path in results:
+        by_sha1.setdefault(results[path]['sha1'], []).append(path)
+    # one representative per exact group,  the one that would be canonical
+    copies = {}
+    for paths in by_sha1.values():
+        representative = min(paths, key=lambda path: _canonical_key(results[path]))
+        copies[representative] = sorted(path for path in paths if path != representative)
+
+    near_members = dict((path, []) for path in copies)
+    if near and numpy != None:
+        # candidates only among files sharing a band of the hash,  the biggest file of a match is the canonical one
+        buckets = {}
+        grids = {}
+        for path in copies:
+            phash = results[path].get('phash')
+            if phash == None:
+                continue
+            grids[path] = numpy.array(results[path]['grid'], dtype=numpy.int16)
+            width = len(phash) // HASH_BANDS
+            for band in range(HASH_BANDS):
+                buckets.setdefault((band, phash[band * width:(band + 1) * width]), set()).add(path)
+        assigned = set()
+        for canonical in sorted(grids, key=lambda path: _canonical_key(results[path])):
+            if canonical in assigned:
+                continue
+            phash = results[canonical]['phash']
+            width = len(phash) // HASH_BANDS
+            candidates = set()
+            for band in range(HASH_BANDS):
+                candidates.update(buckets[(band, phash[band * width:(band + 1) * width])])
+            for path in sorted(candidates, key=lambda path: _canonical_key(results[path])):
+                # bigger files came first,  they are canonical themselves or in a group already
+                if path in assigned or _canonical_key(results[path]) <= _canonical_key(results[canonical]):
+                    continue
+                if _near(results[canonical], results[path], grids) and _confirmed(canonical, path):
+                    near_members[canonical].append(path)
+                    assigned.add(path)
+            assigned.add(canonical)
+
+    duplicates = []
+    matched = set(path for members in near_members.values() for path in members)
+    for canonical in sorted(copies):
+        if canonical in matched:
+            continue
+        near_paths = []
+        for path in near_members[canonical]:
+            near_paths += [path] + copies[path]
+        if copies[canonical] or near_paths:
+            duplicates.append({'canonical': canonical, 'exact': copies[canonical], 'near': sorted(near_paths)})
+    return duplicates
+
+
+def _confirmed(canonical_path, path):
+    try:
+        return confirm_near(canonical_path, path)
+    except (ValueError, ImportError, OSError):
+        return False
+
+
+# {duplicate path: canonical path},  exact copies only unless near
+def redirect_map(groups, near=False):
+    redirects = {}
+    for group in groups:
+        for path in group['exact'] + (group['near'] if near else []):
+            redirects[path] = group['canonical']
+    return redirects
+
+
+def format_report(groups):
+    lines = []
+    for group in groups:
+        lines.append('keep:  ' + group['canonical'])
+        for path in group['exact']:
+            lines.append('    same file:  ' + path)
+        for path in group['near']:
+            lines.append('    looks the same:  ' + path)
+    lines.append(str(len(groups)) + ' groups,  ' + str(sum(len(group['exact']) + len(group['near']) for group in groups)) + ' duplicates')
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='find duplicated source textures across folders')
+    parser.add_argument('paths', nargs='+', help='image files or folders')
+    parser.add_argument('--out', help='json file with the groups and {duplicate: canonical}')
+    parser.add_argument('--cache', help='hash cache,  unchanged files are not read again')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--near', action='store_true', help='also files that look the same (re-saved, resized),  checked pixel by pixel')
+    args = parser.parse_args(argv)
+    start = time.time()
+    paths = image_io.find_images(args.paths)
+    groups = find_duplicates(hash_files(paths, args.workers, args.cache, near=args.near), args.near)
+    for line in format_report(groups):
+        print(line)
+    print(str(len(paths)) + ' files in ' + str(round(time.time() - start, 2)) + ' s')
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'groups': groups, 'redirects': redirect_map(groups)}, f, indent=1, sort_keys=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,294 @@
+# look at the pixels of source textures and say what they are,  instead of trusting names or artists' sRGB ticks.
+# every file is read a band of rows at a time (image_io.py),  so memory stays at one band whatever the size,
+# and per channel statistics are summed up band by band:  min, max, mean, spread, correlation between channels,
+# how many values sit at 0 or 1,  and how far rgb is from a unit normal.  from those a map is classed as
+#   color      albedo/emissive style,  channels move together         -> sRGB on,  TC_DEFAULT
+#   normal     rgb decodes to unit vectors pointing out of the surface -> sRGB off, TC_NORMALMAP
+#   packed     unrelated masks in r/g/b (layout 'ORM' when it looks like occlusion/roughness/metallic) -> sRGB off, TC_MASKS
+#   grayscale  one channel or r = g = b (roughness, ao, height...)     -> sRGB off, TC_GRAYSCALE
+#   hdr        float source                                            -> sRGB off, TC_HDR
+# and channels that hold one value everywhere are listed,  they could be dropped or packed with something else.
+# the pixels can not tell a gray base color from a roughness map,  so what gets applied comes from resolve():
+# the texture's role by its name (texture_schema.texture_role) first,  the pixels only pick the compression
+# within it and report when they disagree.  without a known suffix only color, normal and hdr are applied.
+# results are cached by file modification time and size,  many files are spread over worker processes.
+# needs numpy.  plain python otherwise,  no unreal import.  texture_color_space.py applies the results in the editor.
+#   result = texture_inspector.inspect_file('C:/art/orc/orc_body_OcclusionRoughnessMetallic.tga')
+#   python texture_inspector.py C:/art/orc --out orc_inspection.json --workers 8
+import argparse
+import concurrent.futures
+import json
+import os
+import sys
+import time
+
+import image_io
+from image_io import numpy
+
+CACHE_VERSION = 1
+CONSTANT_TOLERANCE = 2.0 / 255   # max - min below this is one value
+GRAYSCALE_TOLERANCE = 1.0 / 255  # mean |r - g|, |g - b| below this is a gray image
+NORMAL_LENGTH_ERROR = 0.1        # mean | |2 * rgb - 1| - 1 |
+NORMAL_MIN_BLUE = 0.6
+PACKED_CORRELATION = 0.5         # channels less related than this are separate masks
+BINARY_SHARE = 0.9               # share of values near 0 or 1 for a metallic style mask
+SAMPLE_STEP = 1                  # every n-th row and column,  2 reads a quarter of the pixels
+CHANNEL_NAMES = ['r', 'g', 'b', 'a']
+
+RECOMMENDED = {
+    'color': {'srgb': True, 'compression_settings': 'TC_DEFAULT'},
+    'normal': {'srgb': False, 'compression_settings': 'TC_NORMALMAP'},
+    'packed': {'srgb': False, 'compression_settings': 'TC_MASKS'},
+    'grayscale': {'srgb': False, 'compression_settings': 'TC_GRAYSCALE'},
+    'hdr': {'srgb': False, 'compression_settings': 'TC_HDR'},
+}
+
+
+class ChannelStats(object):
+    # running sums over bands,  enough for mean, spread and correlation without keeping any pixels
+
+    def __init__(self, channels):
+        self.channels = channels
+        self.count = 0
+        self.minimum = numpy.full(channels, numpy.inf)
+        self.maximum = numpy.full(channels, -numpy.inf)
+        self.total = numpy.zeros(channels)
+        self.products = numpy.zeros((channels, channels)) # sum of c_i * c_j
+        self.extreme = numpy.zeros(channels)               # values within 0.05 of 0 or 1
+        self.gray_difference = 0.0
+        self.normal_error = 0.0
+        self.blue_total = 0.0
+
+    def add(self, band):
+        pixels = band.reshape(-1, self.channels).astype(numpy.float64)
+        self.count += len(pixels)
+        self.minimum = numpy.minimum(self.minimum, pixels.min(axis=0))
+        self.maximum = numpy.maximum(self.maximum, pixels.max(axis=0))
+        self.total += pixels.sum(axis=0)
+        self.products += pixels.T.dot(pixels)
+        self.extreme += ((pixels < 0.05) | (pixels > 0.95)).sum(axis=0)
+        if self.channels >= 3:
+            rgb = pixels[:, :3]
+            self.gray_difference += numpy.abs(rgb[:, 0] - rgb[:, 1]).sum() + numpy.abs(rgb[:, 1] - rgb[:, 2]).sum()
+            vectors = rgb * 2.0 - 1.0
+            self.normal_error += numpy.abs(numpy.sqrt((vectors * vectors).sum(axis=1)) - 1.0).sum()
+            self.blue_total += rgb[:, 2].sum()
+
+    def summary(self):
+        count = float(max(1, self.count))
+        mean = self.total / count
+        covariance = self.products / count - numpy.outer(mean, mean)
+        spread = numpy.sqrt(numpy.maximum(numpy.diag(covariance), 0.0))
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            correlation = covariance / numpy.outer(spread, spread)
+        constant = (self.maximum - self.minimum) <= CONSTANT_TOLERANCE
+        correlation[constant, :] = numpy.nan
+        correlation[:, constant] = numpy.nan
+        return {
+            'pixels': self.count,
+            'min': _rounded(self.minimum),
+            'max': _rounded(self.maximum),
+            'mean': _rounded(mean),
+            'spread': _rounded(spread),
+            'extreme': _rounded(self.extreme / count),
+            'correlation': [_rounded(row) for row in correlation],
+            'constant': constant.tolist(),
+            'gray_difference': round(self.gray_difference / (2 * count), 4),
+            'normal_error': round(self.normal_error / count, 4),
+            'blue_mean': round(self.blue_total / count, 4),
+        }
+
+
+def _rounded(values):
+    return [None if numpy.isnan(value) else round(float(value), 4) for value in values]
+
+
+def channel_stats(path, band_rows=image_io.BAND_ROWS, sample_step=SAMPLE_STEP):
+    header = image_io.read_header(path)
+    stats = ChannelStats(header['channels'])
+    step = max(1, int(sample_step))
+    for top, band in image_io.iter_bands(path, band_rows, header):
+        if step > 1:
+            band = band[(-top) % step::step, ::step] # same rows whatever the band size
+        if band.size:
+            stats.add(image_io.to_float(band))
+    return header, stats.summary()
+
+
+def _max_correlation(summary, channels):
+    values = [abs(summary['correlation'][i][j]) for i in channels for j in channels
+              if i < j and summary['correlation'][i][j] != None]
+    return max(values) if values else None
+
+
+# what the map is,  from the summary of channel_stats()
+def classify(header, summary):
+    channels = header['channels']
+    constant = [CHANNEL_NAMES[n] for n in range(channels) if summary['constant'][n]]
+    result = {'kind': None, 'layout': None, 'constant_channels': constant}
+    if header['float'] and max(summary['max'][:min(3, channels)]) > 1.0:
+        result['kind'] = 'hdr'
+    elif channels < 3 or summary['gray_difference'] <= GRAYSCALE_TOLERANCE:
+        result['kind'] = 'grayscale'
+    elif summary['normal_error'] <= NORMAL_LENGTH_ERROR and summary['blue_mean'] >= NORMAL_MIN_BLUE:
+        result['kind'] = 'normal'
+    else:
+        varying = [n for n in range(3) if not summary['constant'][n]]
+        correlation = _max_correlation(summary, varying)
+        if len(varying) < 3 or (correlation != None and correlation < PACKED_CORRELATION):
+            # a color map keeps all three channels moving together,  masks do not
+            result['kind'] = 'packed'
+            result['layout'] = orm_layout(summary)
+        else:
+            result['kind'] = 'color'
+    result.update(RECOMMENDED[result['kind']])
+    return result
+
+
+# 'ORM' when b looks like metallic (mostly 0/1 or one value) and r like occlusion (mostly bright),  else None
+def orm_layout(summary):
+    metallic = summary['constant'][2] or summary['extreme'][2] >= BINARY_SHARE
+    occlusion = summary['mean'][0] >= 0.5 or summary['constant'][0]
+    return 'ORM' if metallic and occlusion else None
+
+
+# (settings or None, note or None) for a texture with this role (texture_schema.texture_role,  None without a known
+# suffix) and pixel result.  the role wins:  color never loses srgb,  and a kind that does not fit the role is a note,
+# not a change.  settings None means leave the texture as it is
+def resolve(result, role):
+    kind = result['kind'] if result != None and 'error' not in result else None
+    if role == None:
+        if kind in ('grayscale', 'packed'):
+            return None, 'looks ' + kind + ' but the name has no known suffix,  left alone'
+        return (dict(RECOMMENDED[kind]) if kind != None else None), None
+    if role == 'color':
+        settings = {'srgb': True, 'compression_settings': 'TC_HDR' if kind == 'hdr' else 'TC_DEFAULT'}
+        fits = kind in (None, 'color', 'hdr')
+    elif role == 'normal':
+        settings = dict(RECOMMENDED['normal'])
+        fits = kind in (None, 'normal')
+    else:
+        compression = {'grayscale': 'TC_GRAYSCALE', 'hdr': 'TC_HDR'}.get(kind, 'TC_MASKS')
+        settings = {'srgb': False, 'compression_settings': compression}
+        fits = kind in (None, 'grayscale', 'packed', 'hdr')
+    note = None if fits else 'named ' + role + ' but looks ' + kind + ',  set as ' + role
+    return settings, note
+
+
+def file_stamp(path):
+    stat = os.stat(path)
+    return [stat.st_mtime, stat.st_size]
+
+
+def inspect_file(path, band_rows=image_io.BAND_ROWS, sample_step=SAMPLE_STEP):
+    start = time.time()
+    result = {'path': path, 'stamp': file_stamp(path), 'sample_step': sample_step}
+    try:
+        header, summary = channel_stats(path, band_rows, sample_step)
+    except (ValueError, ImportError, OSError) as error:
+        result['error'] = str(error)
+        return result
+    result.update({'format': header['format'], 'width': header['width'], 'height': header['height'],
+                   'channels': header['channels'], 'stats': summary})
+    result.update(classify(header, summary))
+    result['seconds'] = round(time.time() - start, 3)
+    return result
+
+
+def _inspect_args(args):
+    return inspect_file(*args)
+
+
+def load_cache(cache_file):
+    if not cache_file or not os.path.isfile(cache_file):
+        return {}
+    with open(cache_file, 'r') as f:
+        data = json.load(f)
+    if data.get('version') != CACHE_VERSION:
+        return {}
+    return data['files']
+
+
+def save_cache(cache_file, results):
+    folder = os.path.dirname(cache_file)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+    tmp_path = cache_file + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': CACHE_VERSION, 'files': results}, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, cache_file)
+
+
+# {path: result} for every file,  files unchanged since the cache was written are not read again.
+# workers > 1 spreads the rest over processes (each holds one band at a time),  or threads with processes=False:
+# inside the editor sys.executable is the editor itself,  so worker processes can not be started from there
+def inspect_files(paths, workers=1, cache_file=None, band_rows=image_io.BAND_ROWS, sample_step=SAMPLE_STEP, processes=True):
+    cache = load_cache(cache_file)
+    results = {}
+    to_read = []
+    for path in paths:
+        cached = cache.get(path)
+        if (cached != None and os.path.isfile(path) and cached.get('stamp') == file_stamp(path) and 'error' not in cached
+                and cached.get('sample_step') == sample_step):
+            results[path] = cached
+        else:
+            to_read.append(path)
+    jobs = [(path, band_rows, sample_step) for path in to_read]
+    if workers > 1 and len(jobs) > 1:
+        executor = concurrent.futures.ProcessPoolExecutor if processes else concurrent.futures.ThreadPoolExecutor
+        with executor(workers) as pool:
+            for result in pool.map(_inspect_args, jobs, chunksize=max(1, len(jobs) // (workers * 4))):
+                results[result['path']] = result
+    else:
+        for job in jobs:
+            result = _inspect_args(job)
+            results[result['path']] = result
+    if cache_file:
+        cache.update(results)
+        save_cache(cache_file, dict((path, cache[path]) for path in cache if os.path.isfile(path)))
+    return results
+
+
+def format_report(results):
+    lines = []
+    by_kind = {}
+    for path in sorted(results):
+        result = results[path]
+        if 'error' in result:
+            lines.append('error:  ' + path + '  ' + result['error'])
+            continue
+        by_kind[result['kind']] = by_kind.get(result['kind'], 0) + 1
+        line = result['kind'] + (' ' + result['layout'] if result['layout'] else '') + '  srgb ' + str(result['srgb']).lower() + '  ' + path
+        if result['constant_channels']:
+            line += '  (constant: ' + ', '.join(result['constant_channels']) + ')'
+        lines.append(line)
+    lines.append(',  '.join(str(count) + ' ' + kind for kind, count in sorted(by_kind.items())))
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='classify source textures by their pixels (color, normal, packed masks...)')
+    parser.add_argument('paths', nargs='+', help='image files or folders')
+    parser.add_argument('--out', help='json file for the results')
+    parser.add_argument('--cache', help='results cache,  unchanged files are not read again')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--band-rows', type=int, default=image_io.BAND_ROWS)
+    parser.add_argument('--sample-step', type=int, default=SAMPLE_STEP)
+    args = parser.parse_args(argv)
+    if numpy == None:
+        print('texture_inspector needs numpy')
+        return 1
+    start = time.time()
+    paths = image_io.find_images(args.paths)
+    results = inspect_files(paths, args.workers, args.cache, args.band_rows, args.sample_step)
+    for line in format_report(results):
+        print(line)
+    print(str(len(paths)) + ' files in ' + str(round(time.time() - start, 2)) + ' s')
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,225 @@
+# texture assets whose source files are duplicates of each other (texture_dedup.py) mapped to one canonical texture.
+# the redirect plan is json:
+#   {"version": 1, "redirects": {duplicate texture path: canonical texture path},
+#    "groups": [{"canonical": path, "source": file, "near_confirmed": false, "srgb", "compression_settings",
+#                "duplicates": [{"path", "source", "match": "exact"/"near"}]}],
+#    "settings_differ": [{"path", "like": texture path, "srgb", "compression_settings"}],
+#    "no_source": [texture paths without a source file on disk]}
+# one file imported as a color texture and as a linear mask renders differently,  so only textures with the same
+# srgb and compression_settings are grouped.  the rest are listed under "settings_differ" and left alone,
+# and apply_redirects() checks the settings again before it consolidates.
+# near matches (opt in) only look the same,  so they are never redirected or consolidated on their own:  a group's
+# near duplicates count once it is confirmed,  "near_confirmed": true in the plan file or confirm_near=[canonical paths].
+# "redirects" holds the exact duplicates and the near ones of groups confirmed when the plan was written,
+# load_redirects() and apply_redirects() go by the groups' flags so a confirmation edited into the file counts.
+# the connector binds the canonical texture wherever a set holds a duplicate (texture_redirects in its config,
+# run_job.py connector --redirect-plan),  and apply_redirects() consolidates the duplicates into the canonical
+# textures so existing materials follow and the copies stop being cooked.
+# settings are at the bottom,  or run as a job:  run_job.py dedup_textures --path /Game/drops --redirect-plan C:/temp/redirects.json
+import json
+import os
+import sys
+import unreal
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__))) # so modules next to this script import from the unreal console
+import asset_cache
+import asset_query
+import run_stats
+import texture_color_space
+import texture_dedup
+
+PLAN_VERSION = 1
+WORKERS = 4
+
+
+def default_cache_file():
+    return os.path.join(unreal.Paths.project_saved_dir(), 'texture_hashes.json')
+
+
+# [srgb, compression_settings] of a texture,  json friendly
+def texture_settings(texture):
+    return [bool(texture.get_editor_property('srgb')), str(texture.get_editor_property('compression_settings'))]
+
+
+# members [(path, source, match)] with the same settings,  in the group's order.  the first one is canonical:
+# the group's own file keeps every match,  another exact copy keeps the exact ones (same bytes),
+# a near one only its own file's assets (near members were only checked against the group's file).
+# returns (members kept, members left out)
+def _same_settings_members(members, group_source):
+    anchor_source, anchor_match = members[0][1], members[0][2]
+    if anchor_source == group_source:
+        return members, []
+    kept, left = [], []
+    for path, source, match in members:
+        if source == anchor_source or (anchor_match == 'exact' and match == 'exact'):
+            kept.append((path, source, 'exact'))
+        else:
+            left.append((path, source, match))
+    return kept, left
+
+
+@run_stats.timed('build_redirects')
+def build_redirects(textures, workers=WORKERS, cache_file=None, near=False, confirm_near=()):
+    assets_by_source = {}
+    settings = {}
+    no_source = []
+    for texture in textures:
+        settings[texture.get_path_name()] = texture_settings(texture)
+        source = texture_color_space.source_file(texture)
+        if source == None:
+            no_source.append(texture.get_path_name())
+        else:
+            assets_by_source.setdefault(source, []).append(texture.get_path_name())
+    # threads,  the editor can not start worker processes (see texture_inspector.py)
+    hashes = texture_dedup.hash_files(sorted(assets_by_source), workers, cache_file or default_cache_file(), processes=False,
+                                      near=near)
+    run_stats.count('sources', len(hashes))
+
+    groups = texture_dedup.find_duplicates(hashes, near)
+    grouped = set()
+    for group in groups:
+        grouped.update([group['canonical']] + group['exact'] + group['near'])
+    # one source imported as several assets is a group of its own
+    for source, asset_paths in sorted(assets_by_source.items()):
+        if len(asset_paths) > 1 and source not in grouped:
+            groups.append({'canonical': source, 'exact': [], 'near': []})
+
+    plan = {'version': PLAN_VERSION, 'redirects': {}, 'groups': [], 'settings_differ': [], 'no_source': sorted(no_source)}
+    for group in groups:
+        members = [(path, group['canonical'], 'exact') for path in sorted(assets_by_source[group['canonical']])]
+        for match in ['exact', 'near']:
+            for source in group[match]:
+                members += [(path, source, match) for path in sorted(assets_by_source[source])]
+        by_settings = {}
+        for member in members:
+            by_settings.setdefault(tuple(settings[member[0]]), []).append(member)
+        left = []
+        for same in sorted(by_settings.values()):
+            kept, same_left = _same_settings_members(same, group['canonical'])
+            left += same_left
+            if len(kept) < 2:
+                left += kept
+                continue
+            path, source = kept[0][0], kept[0][1]
+            srgb, compression = settings[path]
+            entry = {'canonical': path, 'source': source, 'srgb': srgb, 'compression_settings': compression,
+                     'near_confirmed': path in confirm_near, 'duplicates': []}
+            for path, source, match in kept[1:]:
+                entry['duplicates'].append({'path': path, 'source': source, 'match': match})
+            plan['groups'].append(entry)
+        if len(by_settings) > 1:
+            for path, source, match in sorted(left):
+                if path == members[0][0]:
+                    continue
+                srgb, compression = settings[path]
+                plan['settings_differ'].append({'path': path, 'like': members[0][0], 'srgb': srgb, 'compression_settings': compression})
+    plan['groups'].sort(key=lambda entry: entry['canonical'])
+    plan['redirects'] = plan_redirects(plan)
+    return plan
+
+
+# duplicates a group may be replaced with:  exact ones,  near ones only once the group is confirmed
+def _replaceable(entry):
+    return [duplicate for duplicate in entry['duplicates'] if duplicate['match'] == 'exact' or entry.get('near_confirmed')]
+
+
+# {duplicate texture path: canonical texture path} of a plan,  from its groups so edited near_confirmed flags count
+def plan_redirects(plan):
+    redirects = {}
+    for entry in plan['groups']:
+        for duplicate in _replaceable(entry):
+            redirects[duplicate['path']] = entry['canonical']
+    return redirects
+
+
+def save_plan(plan, plan_file):
+    folder = os.path.dirname(plan_file)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+    tmp_path = plan_file + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(plan, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, plan_file)
+
+
+# {duplicate texture path: canonical texture path} from a plan file,  for the connector's texture_redirects
+def load_redirects(plan_file):
+    with open(plan_file, 'r') as f:
+        plan = json.load(f)
+    if plan.get('version') != PLAN_VERSION:
+        raise ValueError(plan_file + ' is not a texture redirect plan')
+    return plan_redirects(plan)
+
+
+# consolidate every group's exact duplicates (and near ones of confirmed groups) into its canonical texture
+# (references are repointed, the duplicates removed).  returns [canonical paths of the groups that were consolidated]
+def apply_redirects(plan, dry_run=False):
+    done = []
+    for entry in plan['groups']:
+        replaceable = _replaceable(entry)
+        if not replaceable:
+            continue # near matches nobody confirmed
+        canonical = asset_cache.load_asset(entry['canonical'])
+        duplicates = [asset_cache.load_asset(duplicate['path']) for duplicate in replaceable]
+        duplicates = [duplicate for duplicate in duplicates if duplicate != None]
+        if canonical != None:
+            # settings may have changed since the plan was written
+            settings = texture_settings(canonical)
+            for duplicate in [duplicate for duplicate in duplicates if texture_settings(duplicate) != settings]:
+                unreal.log_warning('texture_redirects: ' + duplicate.get_path_name() + ' has other srgb / compression than '
+                                   + entry['canonical'] + ',  left alone')
+                duplicates.remove(duplicate)
+        if canonical == None or not duplicates:
+            unreal.log_warning('texture_redirects: nothing to consolidate into ' + entry['canonical'])
+            continue
+        if not dry_run:
+            with run_stats.timer('consolidate'):
+                if not unreal.EditorAssetLibrary.consolidate_assets(canonical, duplicates):
+                    unreal.log_warning('texture_redirects: could not consolidate into ' + entry['canonical'])
+                    continue
+        done.append(entry['canonical'])
+    return done
+
+
+def format_report(plan, consolidated=None, dry_run=False):
+    lines = []
+    for entry in plan['groups']:
+        state = ''
+        if consolidated != None:
+            state = ('  (would consolidate)' if dry_run else '  (consolidated)') if entry['canonical'] in consolidated else ''
+        lines.append('keep:  ' + entry['canonical'] + state)
+        for duplicate in entry['duplicates']:
+            unconfirmed = '  (not confirmed,  left alone)' if duplicate['match'] == 'near' and not entry.get('near_confirmed') else ''
+            lines.append('    ' + duplicate['match'] + ':  ' + duplicate['path'] + unconfirmed)
+    for differ in plan.get('settings_differ', []):
+        lines.append('same source as ' + differ['like'] + ',  other srgb / compression,  left alone:  ' + differ['path']
+                     + '  (srgb ' + str(differ['srgb']) + ',  ' + differ['compression_settings'] + ')')
+    for path in plan['no_source']:
+        lines.append('no source file:  ' + path)
+    lines.append(str(len(plan['groups'])) + ' groups,  ' + str(len(plan_redirects(plan))) + ' duplicate textures to replace')
+    return lines
+
+
+if __name__ == '__main__':
+    QUERY = {
+        'path_globs': ['/Game/dawnOfWar/assets'],
+        'class_names': ['Texture2D'],
+    }
+    PLAN_FILE = os.path.join(unreal.Paths.project_saved_dir(), 'texture_redirects.json')
+    # exact copies only,  or also files that look the same (re-saved, resized)
+    NEAR_DUPLICATES = False
+    # canonical texture paths whose near duplicates were looked at and may be replaced
+    CONFIRM_NEAR = []
+    # consolidate the duplicates into the canonical textures (deletes the duplicates)
+    CONSOLIDATE = False
+
+    run_stats.new_run()
+    asset_cache.new_run()
+    textures = list(asset_query.load_records(asset_query.query_assets(**QUERY)))
+    plan = build_redirects(textures, near=NEAR_DUPLICATES, confirm_near=CONFIRM_NEAR)
+    save_plan(plan, PLAN_FILE)
+    consolidated = apply_redirects(plan, not CONSOLIDATE)
+    for line in format_report(plan, consolidated, not CONSOLIDATE):
+        print(line)
+    print('redirect plan:  ' + PLAN_FILE)
+    print(run_stats.end_run())
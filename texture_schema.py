@@ -0,0 +1,159 @@
+# texture set schemas (texture_schemas.json):  which suffixes make up a set, the material parameter each one
+# binds to, whether it must be linear (srgb off), and which maps a set can not do without.
+# each schema is compiled into one regex,  so a single pass over a folder listing sorts every texture
+# into every schema it belongs to.  plain python, no unreal import.
+#   schemas = texture_schema.load_schemas()
+#   config = texture_schema.plan_config(schemas['albedo'])       # connector_planner / connector_pipeline config
+#   groups = texture_schema.SchemaRegistry(schemas).classify(records)
+#   python texture_schema.py listing.json                        # sets per schema in an asset listing
+# (json rather than yaml so it loads with the editor's bundled python, no extra packages)
+import argparse
+import json
+import os
+import sys
+
+from asset_listing import load_listing
+from asset_naming import strip_prefix, suffix_pattern
+
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'texture_schemas.json')
+SCHEMA_VERSION = 1
+
+# schema keys copied into plan configs as they are
+PLAN_KEYS = ['parent_material', 'instance_name', 'texture_prefix', 'scalar_values', 'mesh_classes', 'mesh_prefix',
+             'mesh_folder', 'material_folder', 'texture_folder', 'mesh_slot']
+
+_loaded = {}
+
+
+def _check_schema(name, schema):
+    for key in ['parent_material', 'instance_name', 'textures']:
+        if key not in schema:
+            raise ValueError('texture schema ' + name + ' has no ' + key)
+    suffixes = [texture['suffix'] for texture in schema['textures']]
+    if len(set(suffixes)) != len(suffixes):
+        raise ValueError('texture schema ' + name + ' lists a suffix twice')
+    if len([texture for texture in schema['textures'] if texture.get('base')]) != 1:
+        raise ValueError('texture schema ' + name + ' needs exactly one base texture')
+    for texture in schema['textures']:
+        if 'suffix' not in texture or 'param' not in texture:
+            raise ValueError('texture schema ' + name + ': every texture needs a suffix and a param')
+
+
+# {schema name: schema},  each file is read once per session
+def load_schemas(path=SCHEMA_FILE):
+    if path not in _loaded:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if data.get('version') != SCHEMA_VERSION:
+            raise ValueError('unknown texture schema version in ' + path)
+        for name, schema in data['schemas'].items():
+            _check_schema(name, schema)
+        _loaded[path] = data['schemas']
+    return _loaded[path]
+
+
+def get_schema(name, path=SCHEMA_FILE):
+    schemas = load_schemas(path)
+    if name not in schemas:
+        raise ValueError('no texture schema ' + name + ' in ' + path + ',  one of ' + ', '.join(sorted(schemas)))
+    return schemas[name]
+
+
+def base_suffix(schema):
+    return [texture['suffix'] for texture in schema['textures'] if texture.get('base')][0]
+
+
+def schema_suffixes(schema):
+    return [texture['suffix'] for texture in schema['textures']]
+
+
+# what a schema texture holds:  'normal',  'linear' (srgb off: masks, roughness, ao...) or 'color' (srgb on)
+def texture_role(texture):
+    if 'normal' in texture['param'].lower():
+        return 'normal'
+    if texture.get('srgb') == False:
+        return 'linear'
+    return 'color'
+
+
+# schema -> connector_planner / connector_pipeline config keys
+def plan_config(schema):
+    if isinstance(schema, str):
+        schema = get_schema(schema)
+    textures = schema['textures']
+    config = dict((key, schema[key]) for key in PLAN_KEYS if key in schema)
+    config['scalar_values'] = dict(schema.get('scalar_values', {}))
+    config['base_suffix'] = base_suffix(schema)
+    config['texture_params'] = dict((texture['suffix'], texture['param']) for texture in textures)
+    config['linear_suffixes'] = [texture['suffix'] for texture in textures if texture.get('srgb') == False]
+    config['required_suffixes'] = [texture['suffix'] for texture in textures if texture.get('required')]
+    config['scalar_params'] = dict((texture['suffix'], texture['scalars']) for texture in textures if texture.get('scalars'))
+    return config
+
+
+class SchemaRegistry(object):
+    # one compiled suffix regex per schema,  so '_NormalDetail' in one schema does not hide '_Detail' in another
+
+    def __init__(self, schemas=None):
+        self.schemas = schemas if schemas != None else load_schemas()
+        self.patterns = {}
+        self.textures = {} # schema name -> {suffix: texture}
+        for name, schema in sorted(self.schemas.items()):
+            self.textures[name] = dict((texture['suffix'], texture) for texture in schema['textures'])
+            self.patterns[name] = suffix_pattern(sorted(self.textures[name]))
+
+    # [(schema name, base name, texture)] for every schema the texture name fits,  each schema's longest suffix
+    def match(self, asset_name):
+        matches = []
+        for name, pattern in sorted(self.patterns.items()):
+            found = pattern.match(asset_name)
+            if found == None:
+                continue
+            base_name, suffix = found.group(1), found.group(2)
+            prefix = self.schemas[name].get('texture_prefix')
+            if prefix and not base_name.startswith(prefix):
+                continue
+            matches.append((name, strip_prefix(base_name, prefix), self.textures[name][suffix]))
+        return matches
+
+    # texture_role() of a texture name,  None when no schema knows it or schemas disagree about it
+    def role(self, asset_name):
+        roles = set(texture_role(texture) for name, base_name, texture in self.match(asset_name))
+        return roles.pop() if len(roles) == 1 else None
+
+    # one pass over the records:  {schema name: {folder: {base name: {suffix: object path}}}}
+    def classify(self, records):
+        groups = dict((name, {}) for name in self.schemas)
+        for record in records:
+            if not record.class_name.startswith('Texture'):
+                continue
+            for name, base_name, texture in self.match(record.asset_name):
+                folder = record.package_path.rstrip('/') + '/'
+                groups[name].setdefault(folder, {}).setdefault(base_name, {})[texture['suffix']] = record.object_path
+        return groups
+
+    # suffixes a set is missing to be complete under the schema (required ones and the base texture)
+    def missing(self, name, tex_paths):
+        schema = self.schemas[name]
+        return [texture['suffix'] for texture in schema['textures']
+                if (texture.get('required') or texture.get('base')) and texture['suffix'] not in tex_paths]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='count texture sets per schema in an asset listing')
+    parser.add_argument('listing', help='json listing from asset_query.export_listing()')
+    parser.add_argument('--schemas', default=SCHEMA_FILE)
+    args = parser.parse_args(argv)
+
+    registry = SchemaRegistry(load_schemas(args.schemas))
+    groups = registry.classify(load_listing(args.listing))
+    for name, folders in sorted(groups.items()):
+        sets = [tex_paths for sets in folders.values() for tex_paths in sets.values()]
+        complete = len([tex_paths for tex_paths in sets if not registry.missing(name, tex_paths)])
+        print(name + ':  ' + str(complete) + ' complete sets,  ' + str(len(sets) - complete) + ' incomplete,  in '
+              + str(len(folders)) + ' folders')
+    return groups
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
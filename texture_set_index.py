@@ -0,0 +1,55 @@
+# index of texture sets per content folder.
+# each folder is listed once through the asset registry (no loading) and textures are grouped
+# by base name and suffix, so a whole pbr set is a single dict lookup.  only textures that
+# actually exist get loaded, and only when asked for.
+import unreal
+
+import asset_cache
+import run_stats
+import texture_schema
+from asset_listing import AssetRecord
+from asset_naming import group_texture_sets
+
+PBR_SUFFIXES = texture_schema.schema_suffixes(texture_schema.get_schema('pbr'))
+
+
+def asset_class_name(asset_data):
+    # asset_class was replaced by asset_class_path in ue 5.1
+    if hasattr(asset_data, 'asset_class_path'):
+        return str(asset_data.asset_class_path.asset_name)
+    return str(asset_data.asset_class)
+
+
+def object_path(asset_data):
+    # '/Game/folder/rock_Normal.rock_Normal'  (object_path is deprecated in ue 5.1)
+    return str(asset_data.package_name) + '.' + str(asset_data.asset_name)
+
+
+class TextureSetIndex(object):
+
+    def __init__(self, suffixes=PBR_SUFFIXES):
+        self.suffixes = sorted(suffixes, key=len, reverse=True)
+        self.registry = unreal.AssetRegistryHelpers.get_asset_registry()
+        self.folders = {} # folder -> {base_name: {suffix: object_path}}
+
+    # list folder once and group textures, later calls hit the in memory index
+    def folder_sets(self, folder):
+        folder = folder.rstrip('/')
+        if folder not in self.folders:
+            with run_stats.timer('list_folder'):
+                records = [AssetRecord(object_path(asset_data), folder, str(asset_data.asset_name), asset_class_name(asset_data))
+                           for asset_data in self.registry.get_assets_by_path(folder, recursive=False)]
+            self.folders[folder] = group_texture_sets(records, self.suffixes).get(folder + '/', {})
+        return self.folders[folder]
+
+    # {suffix: object_path} of every texture that exists for base_name in folder
+    def get_set(self, folder, base_name):
+        return self.folder_sets(folder).get(base_name, {})
+
+    # load the existing textures of a set,  optionally only the suffixes that will be bound
+    def load_set(self, folder, base_name, suffixes=None):
+        textures = {}
+        for suffix, tex_path in self.get_set(folder, base_name).items():
+            if suffixes is None or suffix in suffixes:
+                textures[suffix] = asset_cache.load_asset(tex_path)
+        return textures